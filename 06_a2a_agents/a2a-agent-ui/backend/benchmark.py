@@ -0,0 +1,332 @@
+"""Micro-benchmarks for the A2A backend.
+
+Runs offline against a stub A2A agent served from this process, e.g.:
+
+    uv run python benchmark.py tool_latency --requests 200
+    uv run python benchmark.py lead_agent_setup --requests 200
+    uv run python benchmark.py sse_throughput --streams 50 --tokens 2000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import statistics
+import threading
+import time
+from uuid import uuid4
+
+import httpx
+import uvicorn
+from a2a.client import A2AClient
+from a2a.types import MessageSendParams, SendMessageRequest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from strands import Agent
+from strands.types.models import Model
+
+import main
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest-rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(name, samples_ms):
+    return {
+        "name": name,
+        "count": len(samples_ms),
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "mean_ms": round(statistics.mean(samples_ms), 3),
+    }
+
+
+def create_stub_agent_app(port: int) -> FastAPI:
+    """A minimal A2A agent that answers every message/send with a fixed reply."""
+    stub = FastAPI()
+
+    @stub.get("/.well-known/agent.json")
+    async def agent_card():
+        return {
+            "name": "stub agent",
+            "description": "Replies immediately, used for benchmarking.",
+            "url": f"http://127.0.0.1:{port}/",
+            "version": "1.0.0",
+            "capabilities": {"streaming": True},
+            "defaultInputModes": ["text"],
+            "defaultOutputModes": ["text"],
+            "skills": [{
+                "id": "echo",
+                "name": "echo",
+                "description": "Echo the task back.",
+                "tags": ["echo"],
+                "examples": ["hello"],
+            }],
+        }
+
+    @stub.post("/")
+    async def rpc(request: Request):
+        payload = await request.json()
+        if payload.get("method") == "message/stream":
+            return StreamingResponse(
+                stream_reply(payload.get("id")), media_type="text/event-stream"
+            )
+        return {
+            "jsonrpc": "2.0",
+            "id": payload.get("id"),
+            "result": {
+                "kind": "message",
+                "messageId": uuid4().hex,
+                "role": "agent",
+                "parts": [{"kind": "text", "text": "pong"}],
+            },
+        }
+
+    return stub
+
+
+STUB_REPLY_CHUNKS = ["po", "ng"]
+
+
+async def stream_reply(request_id):
+    """SSE frames of a task that streams STUB_REPLY_CHUNKS and completes."""
+    task_id, context_id = uuid4().hex, uuid4().hex
+
+    def frame(result):
+        return f"data: {json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': result})}\n\n"
+
+    for text in STUB_REPLY_CHUNKS:
+        yield frame({
+            "kind": "status-update", "taskId": task_id, "contextId": context_id, "final": False,
+            "status": {"state": "working", "message": {
+                "kind": "message", "messageId": uuid4().hex, "role": "agent",
+                "parts": [{"kind": "text", "text": text}],
+            }},
+        })
+    yield frame({
+        "kind": "artifact-update", "taskId": task_id, "contextId": context_id,
+        "artifact": {"artifactId": uuid4().hex, "parts": [{"kind": "text", "text": "".join(STUB_REPLY_CHUNKS)}]},
+    })
+    yield frame({
+        "kind": "status-update", "taskId": task_id, "contextId": context_id, "final": True,
+        "status": {"state": "completed"},
+    })
+
+
+def start_stub_agent():
+    """Serve the stub agent on a free local port in a background thread."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        create_stub_agent_app(port), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def invoke_unpooled(agent_url: str, query: str) -> str:
+    """The pre-pool call path: new client and agent card fetch for every call."""
+    send_payload = main.create_send_message_payload(text=query)
+    async with httpx.AsyncClient(timeout=main.A2A_REQUEST_TIMEOUT) as httpx_client:
+        a2aclient = await A2AClient.get_client_from_agent_card_url(httpx_client, agent_url)
+        response = await a2aclient.send_message(
+            SendMessageRequest(id=str(uuid4()), params=MessageSendParams(**send_payload))
+        )
+        return main.convert_response_to_json_str(response)
+
+
+async def bench_tool_latency(args):
+    server, agent_url = start_stub_agent()
+    try:
+        manager = main.A2AClientManager()
+        await manager.add_agent_by_url(agent_url)
+        agent_name = main.name_normalize("stub agent")
+
+        results = []
+        for name, call in (
+            ("unpooled", lambda: invoke_unpooled(agent_url, "ping")),
+            ("pooled", lambda: manager.invoke_remote_agent("ping", agent_name)),
+        ):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.warmup):
+                    await call()
+            samples = []
+            # invoke_remote_agent echoes every response to stdout
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    await call()
+                    samples.append((time.perf_counter() - start) * 1000)
+            results.append(summarize(name, samples))
+        await manager.connection_pool.close()
+        return results
+    finally:
+        server.should_exit = True
+
+
+class StubModel(Model):
+    """Model that answers every request with one fixed text block, without network calls."""
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    def format_request(self, messages, tool_specs=None, system_prompt=None):
+        return {}
+
+    def format_chunk(self, event):
+        return event
+
+    def stream(self, request):
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockDelta": {"delta": {"text": "pong"}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {
+            "usage": {"inputTokens": 1, "outputTokens": 1, "totalTokens": 2},
+            "metrics": {"latencyMs": 0},
+        }}
+
+
+class LegacyLeadAgent:
+    """The previous LeadAgent: a new Agent on every get_agent() call, twice per request."""
+
+    def __init__(self, tools):
+        self.messages = []
+        self.tools = tools
+        self.conversation_manager = main.SlidingWindowConversationManager(window_size=20)
+
+    def get_agent(self):
+        return Agent(
+            model=main.MODEL,
+            messages=self.messages,
+            conversation_manager=self.conversation_manager,
+            system_prompt="You are a coordinator agent.",
+            tools=self.tools,
+        )
+
+    async def stream(self, query, session_id=None):
+        async for event in self.get_agent().stream_async(query):
+            if "data" in event:
+                yield {"data": event["data"]}
+        self.messages = self.get_agent().messages
+
+
+async def bench_lead_agent_setup(args):
+    main.MODEL = StubModel()
+    tools = [
+        main.generate_function(f"remote_agent_{i}", f"Remote agent number {i}.")
+        for i in range(args.tools)
+    ]
+
+    results = []
+    for name, lead_agent in (
+        ("agent_per_request", LegacyLeadAgent(tools)),
+        ("reused_agent", main.LeadAgent(tools)),
+    ):
+        samples = []
+        # the default callback handler prints every token
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(args.warmup + args.requests):
+                start = time.perf_counter()
+                async for _ in lead_agent.stream("ping"):
+                    pass
+                if i >= args.warmup:
+                    samples.append((time.perf_counter() - start) * 1000)
+        results.append(summarize(name, samples))
+    return results
+
+
+async def synthetic_lead_agent_stream(tokens, token_interval):
+    """Chunks shaped like LeadAgent.stream() output: one tool call, then text tokens."""
+    yield {"current_tool_use": "remote_agent_0"}
+    yield {"current_tool_use_input": {"task": "ping"}}
+    for i in range(tokens):
+        if token_interval:
+            await asyncio.sleep(token_interval)
+        yield {"data": f"token{i} "}
+
+
+async def legacy_sse_stream(chunks):
+    """The previous /invoke_stream encoder: one json.dumps frame and one INFO log per chunk."""
+    async for chunk in chunks:
+        if chunk:
+            main.logger.info(chunk)
+            if "data" in chunk:
+                yield f"data: {json.dumps({'type': 'stream', 'content': chunk['data']})}\n\n"
+            if "current_tool_use" in chunk:
+                yield f"data: {json.dumps({'type': 'current_tool_use', 'content': chunk['current_tool_use']})}\n\n"
+            if "current_tool_use_input" in chunk:
+                yield f"data: {json.dumps({'type': 'current_tool_use_input', 'content': chunk['current_tool_use_input']})}\n\n"
+
+
+async def bench_sse_throughput(args):
+    # Send the INFO log lines the legacy encoder writes somewhere cheap but real
+    devnull = open(os.devnull, "w")
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    root.handlers = [logging.StreamHandler(devnull)]
+    root.handlers[0].setFormatter(saved_handlers[0].formatter if saved_handlers else None)
+    try:
+        results = []
+        for name, encoder in (("legacy", legacy_sse_stream), ("coalescing", main.encode_sse_stream)):
+            async def consume():
+                frames = 0
+                async for _ in encoder(synthetic_lead_agent_stream(args.tokens, args.token_interval_ms / 1000)):
+                    frames += 1
+                return frames
+
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            frames = await asyncio.gather(*(consume() for _ in range(args.streams)))
+            cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+            results.append({
+                "name": name,
+                "streams": args.streams,
+                "tokens_per_stream": args.tokens,
+                "frames_per_stream": round(statistics.mean(frames), 1),
+                "frames_per_sec": round(sum(frames) / wall, 1),
+                "tokens_per_sec": round(args.streams * args.tokens / wall, 1),
+                "cpu_ms_per_stream": round(cpu * 1000 / args.streams, 3),
+            })
+        return results
+    finally:
+        root.handlers = saved_handlers
+        devnull.close()
+
+
+BENCHMARKS = {
+    "tool_latency": bench_tool_latency,
+    "lead_agent_setup": bench_lead_agent_setup,
+    "sse_throughput": bench_sse_throughput,
+}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--tools", type=int, default=20, help="remote agent tools for lead_agent_setup")
+    parser.add_argument("--streams", type=int, default=50, help="concurrent streams for sse_throughput")
+    parser.add_argument("--tokens", type=int, default=2000, help="tokens per stream for sse_throughput")
+    parser.add_argument("--token-interval-ms", type=float, default=1.0, help="delay between tokens for sse_throughput")
+    args = parser.parse_args()
+    results = asyncio.run(BENCHMARKS[args.benchmark](args))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,23 +1,29 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Response
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import asyncio
 import json
+import sqlite3
+import threading
 import uuid
 from uuid import uuid4
 
 from datetime import datetime
+import time
 import httpx
 import traceback
-from contextlib import asynccontextmanager
+import weakref
+from collections import OrderedDict, deque
+from itertools import islice
+from contextlib import asynccontextmanager, contextmanager
 # Import A2A client components and strands
-from a2a.client import A2AClient, A2ACardResolver
-from a2a.types import MessageSendParams, SendStreamingMessageRequest,  SendMessageRequest
+from a2a.client import A2AClient
+from a2a.types import AgentCard, JSONRPCErrorResponse, MessageSendParams, SendStreamingMessageRequest,  SendMessageRequest
 from strands import Agent, tool
 from strands.agent.conversation_manager import SlidingWindowConversationManager
-import nest_asyncio
+from strands.tools.registry import ToolRegistry
 import logging
 import os
 logging.basicConfig(
@@ -61,9 +67,55 @@ if public_key and secret_key:
     os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = otel_endpoint
     os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = f"Authorization=Basic {auth_token}"
 
+# A2A connection pool configuration
+A2A_REQUEST_TIMEOUT = float(os.environ.get("A2A_REQUEST_TIMEOUT", "120"))
+A2A_POOL_MAX_CONNECTIONS = int(os.environ.get("A2A_POOL_MAX_CONNECTIONS", "20"))
+A2A_POOL_MAX_KEEPALIVE = int(os.environ.get("A2A_POOL_MAX_KEEPALIVE", "10"))
+A2A_POOL_KEEPALIVE_EXPIRY = float(os.environ.get("A2A_POOL_KEEPALIVE_EXPIRY", "30"))
+A2A_POOL_IDLE_TIMEOUT = float(os.environ.get("A2A_POOL_IDLE_TIMEOUT", "300"))
+
+# Agent card cache configuration
+AGENT_CARD_TTL = float(os.environ.get("AGENT_CARD_TTL", "300"))
+AGENT_CARD_REFRESH_INTERVAL = float(os.environ.get("AGENT_CARD_REFRESH_INTERVAL", "60"))
+
+# Agent registry persistence; set AGENT_REGISTRY_DB to an empty string to keep the registry in memory only
+AGENT_REGISTRY_DB = os.environ.get("AGENT_REGISTRY_DB", "agent_registry.db")
+
+# Remote agent health probing and circuit breaker configuration
+AGENT_HEALTH_PROBE_INTERVAL = float(os.environ.get("AGENT_HEALTH_PROBE_INTERVAL", "30"))
+AGENT_HEALTH_PROBE_TIMEOUT = float(os.environ.get("AGENT_HEALTH_PROBE_TIMEOUT", "5"))
+AGENT_HEALTH_FAILURE_THRESHOLD = int(os.environ.get("AGENT_HEALTH_FAILURE_THRESHOLD", "3"))
+AGENT_HEALTH_COOLDOWN = float(os.environ.get("AGENT_HEALTH_COOLDOWN", "30"))
+AGENT_HEALTH_WINDOW = int(os.environ.get("AGENT_HEALTH_WINDOW", "100"))
+
+# Remote agent result cache configuration; caching is opt-in per agent through its cache_ttl
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_DEFAULT_TTL = float(os.environ.get("RESULT_CACHE_DEFAULT_TTL", "0"))
+
+# Remote agent call executor configuration
+A2A_CALL_TIMEOUT = float(os.environ.get("A2A_CALL_TIMEOUT", "300"))
+A2A_MAX_IN_FLIGHT_CALLS = int(os.environ.get("A2A_MAX_IN_FLIGHT_CALLS", "32"))
+A2A_CALL_QUEUE_TIMEOUT = float(os.environ.get("A2A_CALL_QUEUE_TIMEOUT", "30"))
+
+# Scatter/gather tool configuration
+SCATTER_GATHER_AGENT_TIMEOUT = float(os.environ.get("SCATTER_GATHER_AGENT_TIMEOUT", "120"))
+SCATTER_GATHER_LATENCY_BUDGET = float(os.environ.get("SCATTER_GATHER_LATENCY_BUDGET", "150"))
+
+# SSE emission configuration
+SSE_COALESCE_MS = float(os.environ.get("SSE_COALESCE_MS", "20"))
+SSE_COALESCE_BYTES = int(os.environ.get("SSE_COALESCE_BYTES", "2048"))
+SSE_HEARTBEAT_INTERVAL = float(os.environ.get("SSE_HEARTBEAT_INTERVAL", "15"))
+
+# Lead agent session configuration
+LEAD_AGENT_MAX_SESSIONS = int(os.environ.get("LEAD_AGENT_MAX_SESSIONS", "1000"))
+LEAD_AGENT_SESSION_IDLE_TIMEOUT = float(os.environ.get("LEAD_AGENT_SESSION_IDLE_TIMEOUT", "1800"))
+LEAD_AGENT_SESSION_MEMORY_MB = float(os.environ.get("LEAD_AGENT_SESSION_MEMORY_MB", "256"))
+DEFAULT_SESSION_ID = "default"
+
 # Global variables
 agent_registry: Dict[str, Dict[str, Any]] = {}
-lead_agent_instance = None
+# Lead agents currently streaming to a client, mapped to the callback that forwards remote agent progress
+remote_event_listeners: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
 
 # Pydantic models
 class AgentInfo(BaseModel):
@@ -76,15 +128,19 @@ class AgentInfo(BaseModel):
     skills: Optional[List[Dict[str, str]]] = None
     status: str
     enabled: bool
+    cache_ttl: float = 0
+    health: Optional[Dict[str, Any]] = None
 
 class AddAgentRequest(BaseModel):
     url: str
+    cache_ttl: Optional[float] = None
 
 class DeleteAgentRequest(BaseModel):
     agent_id: str
 
 class InvokeStreamRequest(BaseModel):
     query: str
+    session_id: Optional[str] = None
 
 class PreviewAgentRequest(BaseModel):
     url: str
@@ -93,6 +149,130 @@ class UpdateAgentEnabledRequest(BaseModel):
     agent_id: str
     enabled: bool
 
+class UpdateAgentCacheRequest(BaseModel):
+    agent_id: str
+    cache_ttl: float
+
+try:
+    import orjson
+
+    def dumps_json(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps_json(obj: Any) -> str:
+        return _json_encoder.encode(obj)
+
+def sse_event(payload: Dict[str, Any]) -> str:
+    return f"data: {dumps_json(payload)}\n\n"
+
+SSE_KEEP_ALIVE = ": keep-alive\n\n"
+
+async def encode_sse_stream(
+    chunks,
+    coalesce_window: float = SSE_COALESCE_MS / 1000,
+    coalesce_bytes: int = SSE_COALESCE_BYTES,
+    heartbeat_interval: float = SSE_HEARTBEAT_INTERVAL,
+):
+    """Turn lead agent chunks into SSE frames.
+
+    Consecutive text tokens are coalesced into one 'stream' frame until
+    coalesce_window seconds have passed since the first buffered token or
+    coalesce_bytes have accumulated. Any other event flushes the buffer first.
+    A keep-alive comment is written whenever nothing has been sent for
+    heartbeat_interval seconds, e.g. during long remote agent calls.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    finished = object()
+    tick = object()
+    timer = None
+    buffer: List[str] = []
+    buffered_bytes = 0
+    buffer_deadline = 0.0
+    last_write = loop.time()
+
+    async def pump_chunks():
+        try:
+            async for chunk in chunks:
+                queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(finished)
+
+    def arm_timer():
+        # One timer for the nearest deadline, instead of a timeout per chunk
+        nonlocal timer
+        if timer is not None:
+            timer.cancel()
+        deadline = buffer_deadline if buffer else last_write + heartbeat_interval
+        timer = loop.call_at(deadline, queue.put_nowait, tick)
+
+    def flush() -> str:
+        nonlocal buffer, buffered_bytes, last_write
+        frame = sse_event({"type": "stream", "content": "".join(buffer)})
+        buffer = []
+        buffered_bytes = 0
+        last_write = loop.time()
+        return frame
+
+    pump_task = asyncio.create_task(pump_chunks())
+    arm_timer()
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is finished:
+                break
+            if chunk is tick:
+                if buffer:
+                    yield flush()
+                else:
+                    yield SSE_KEEP_ALIVE
+                    last_write = loop.time()
+                arm_timer()
+                continue
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                continue
+
+            if isinstance(chunk, str):
+                frame = sse_event({"type": "error", "content": chunk})
+            elif "data" in chunk:
+                if not buffer:
+                    buffer_deadline = loop.time() + coalesce_window
+                buffer.append(chunk["data"])
+                buffered_bytes += len(chunk["data"])
+                if buffered_bytes >= coalesce_bytes:
+                    yield flush()
+                    arm_timer()
+                elif len(buffer) == 1:
+                    arm_timer()
+                continue
+            elif "current_tool_use" in chunk:
+                frame = sse_event({"type": "current_tool_use", "content": chunk["current_tool_use"]})
+            elif "current_tool_use_input" in chunk:
+                frame = sse_event({"type": "current_tool_use_input", "content": chunk["current_tool_use_input"]})
+            elif "remote_agent_event" in chunk:
+                frame = sse_event({"type": "remote_agent_event", **chunk["remote_agent_event"]})
+            else:
+                continue
+
+            if buffer:
+                yield flush()
+            yield frame
+            last_write = loop.time()
+            arm_timer()
+
+        if buffer:
+            yield flush()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        pump_task.cancel()
+
 def print_json_response(response: Any) -> None:
     """Helper function to print the JSON representation of a response."""
     if hasattr(response, "root"):
@@ -130,50 +310,135 @@ def convert_response_to_json_str(response: Any) -> str:
 def name_normalize(name: str) -> str:
     return name.replace(".", "_").replace("-", "_").replace(" ", "_").lower()
 
+def parts_text(parts: List[Dict[str, Any]]) -> str:
+    return "".join(part.get("text", "") for part in parts)
+
+def get_remote_event_listener(agent: Any):
+    """Return the progress callback of the lead agent that invoked a tool, if it is streaming."""
+    if agent is None:
+        return None
+    return remote_event_listeners.get(agent)
+
+AGENT_DESC_TEMPLATE = """
+{description}
+
+## Description of agent skills
+{skills}
+"""
+
+SKILL_DESC_TEMPLATE = """### skill[{idx}]:
+- Skill name:
+{skill_name}
+
+- Description:
+{skill_desc}
+
+- Examples:
+{skill_examples}
+"""
+
+class A2ACallExecutor:
+    """Runs remote agent calls on one long-lived event loop owned by a daemon thread.
+
+    Synchronous tools hand their coroutine to this loop instead of creating a
+    thread and an event loop per call. In-flight calls are bounded; callers wait
+    up to ``queue_timeout`` for a free slot and are rejected after that.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = A2A_MAX_IN_FLIGHT_CALLS,
+        queue_timeout: float = A2A_CALL_QUEUE_TIMEOUT,
+        call_timeout: float = A2A_CALL_TIMEOUT,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.call_timeout = call_timeout
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run_loop, name="a2a-call-executor", daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the executor loop and block until it finishes."""
+        timeout = self.call_timeout if timeout is None else timeout
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("A2ACallExecutor.run cannot be called from the executor loop")
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            coro.close()
+            raise Exception(f"Too many remote agent calls in flight ({self.max_in_flight})")
+        try:
+            loop = self._ensure_loop()
+            future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), loop)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Let pending calls finish (up to timeout) and stop the executor loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def drain():
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            if pending:
+                await asyncio.wait(pending, timeout=timeout)
+
+        try:
+            asyncio.run_coroutine_threadsafe(drain(), loop).result(timeout + 1)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+
+
 def generate_function(function_name, desc,streaming=True):
-    """Generate synchronous tool function that uses threading for async calls"""
-    
-    def dynamic_func(task: str) -> str:
-        """Synchronous function that runs async code in a separate thread"""
-        import threading
-        import queue
-        import asyncio
-        
-        result_queue = queue.Queue()
-        
-        def run_async_in_thread():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Run the async function and put the result in the queue
-            try:
-                global a2a_manager
-                if a2a_manager is None:
-                    raise Exception("a2a_manager is None")
-                
-                 # streaming remote agent
-                if streaming:
-                    result = loop.run_until_complete(
-                        a2a_manager.invoke_remote_agent_streaming(task, function_name)
-                    )
-                else:
-                    # non-streaming remote agent
-                    result = loop.run_until_complete(
-                        a2a_manager.invoke_remote_agent(task, function_name)
-                    )
-                result_queue.put(result)
-            except Exception as e:
-                result_queue.put(f"Error: {str(e)}")
-            finally:
-                loop.close()
-        
-        # Start a new thread to run the async code
-        thread = threading.Thread(target=run_async_in_thread)
-        thread.start()
-        thread.join()  # Wait for the thread to complete
-        
-        # Get the result from the queue
-        return result_queue.get()
+    """Generate a tool function that invokes a remote agent.
+
+    The synchronous tool runs the call on the shared A2ACallExecutor loop.
+    """
+
+    def remote_call(task: str, agent: Any):
+        global a2a_manager
+        if a2a_manager is None:
+            raise Exception("a2a_manager is None")
+        if streaming:
+            # streaming remote agent, forwarding progress to the lead agent's client
+            return a2a_manager.invoke_remote_agent_streaming(
+                task, function_name, on_event=get_remote_event_listener(agent)
+            )
+        # non-streaming remote agent
+        return a2a_manager.invoke_remote_agent(task, function_name)
+
+    def dynamic_func(task: str, agent: Any = None) -> str:
+        """Synchronous function that runs the async call on the shared executor loop"""
+        try:
+            return a2a_executor.run(remote_call(task, agent))
+        except TimeoutError:
+            return f"Error: remote agent call timed out after {a2a_executor.call_timeout}s"
+        except Exception as e:
+            return f"Error: {str(e)}"
     
     # Set function attributes
     dynamic_func.__name__ = function_name
@@ -189,239 +454,1222 @@ def generate_function(function_name, desc,streaming=True):
     return decorated_func
 
 
+def generate_scatter_gather_function():
+    """Generate the built-in tool that sends one task to several remote agents concurrently."""
+
+    def remote_call(task: str, agent_names: Optional[List[str]], agent: Any):
+        global a2a_manager
+        if a2a_manager is None:
+            raise Exception("a2a_manager is None")
+        return a2a_manager.scatter_gather(task, agent_names, on_event=get_remote_event_listener(agent))
+
+    def format_results(results: Dict[str, str]) -> str:
+        return "\n\n".join(f"## {name}\n{result}" for name, result in results.items())
+
+    def scatter_gather(task: str, agent_names: Optional[List[str]] = None, agent: Any = None) -> str:
+        try:
+            return format_results(a2a_executor.run(remote_call(task, agent_names, agent)))
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    scatter_gather.__doc__ = f"""Send the same task to several remote agents at once and collect their answers.
+
+Use this instead of calling remote agent tools one after another when a question
+needs input from more than one agent. Agents run concurrently; answers that do not
+arrive within {SCATTER_GATHER_AGENT_TIMEOUT:g}s per agent, or {SCATTER_GATHER_LATENCY_BUDGET:g}s
+overall, are reported as missing.
+
+Args:
+    task: str, the task message sent to every selected remote agent.
+    agent_names: list of remote agent tool names to ask. Defaults to every available remote agent.
+Returns:
+    str, one section per agent with its answer or error.
+"""
+    return tool(scatter_gather)
+
+
+class A2AConnectionPool:
+    """Per-agent keep-alive httpx clients with cached A2AClient instances."""
+
+    def __init__(
+        self,
+        timeout: float = A2A_REQUEST_TIMEOUT,
+        max_connections: int = A2A_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections: int = A2A_POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = A2A_POOL_KEEPALIVE_EXPIRY,
+        idle_timeout: float = A2A_POOL_IDLE_TIMEOUT,
+    ) -> None:
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.idle_timeout = idle_timeout
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._pending_closes = set()
+        # Tools call in from the executor loop while the API loop registers agents
+        self._lock = threading.Lock()
+
+    def register(self, agent_name: str, agent_card: Any) -> None:
+        """Remember the agent card so clients can be built without refetching it."""
+        self.remove(agent_name)
+        with self._lock:
+            self.entries[agent_name] = {
+                "agent_card": agent_card,
+                "httpx_client": None,
+                "client": None,
+                "loop": None,
+                "last_used": time.monotonic(),
+            }
+
+    def get_client(self, agent_name: str) -> A2AClient:
+        """Return the cached A2AClient for an agent, opening a pooled connection if needed."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self.entries.get(agent_name)
+            if entry is None:
+                raise Exception(f"Agent '{agent_name}' is not registered")
+
+            # httpx connections are bound to the event loop that opened them
+            if entry["client"] is None or entry["loop"] is not loop:
+                self._close_entry(entry)
+                httpx_client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+                entry["httpx_client"] = httpx_client
+                entry["client"] = A2AClient(httpx_client=httpx_client, agent_card=entry["agent_card"])
+                entry["loop"] = loop
+            entry["last_used"] = time.monotonic()
+            return entry["client"]
+
+    def remove(self, agent_name: str) -> None:
+        """Drop an agent and close its connections."""
+        with self._lock:
+            entry = self.entries.pop(agent_name, None)
+            if entry:
+                self._close_entry(entry)
+
+    def evict_idle(self) -> int:
+        """Close connections of agents that have not been used within idle_timeout."""
+        now = time.monotonic()
+        evicted = 0
+        with self._lock:
+            for entry in self.entries.values():
+                if entry["client"] is not None and now - entry["last_used"] > self.idle_timeout:
+                    self._close_entry(entry)
+                    evicted += 1
+        return evicted
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        loop = asyncio.get_running_loop()
+        local_clients = []
+        with self._lock:
+            for entry in self.entries.values():
+                httpx_client = entry["httpx_client"]
+                if httpx_client is not None and entry["loop"] is loop:
+                    self._reset_entry(entry)
+                    local_clients.append(httpx_client)
+                else:
+                    self._close_entry(entry)
+        for httpx_client in local_clients:
+            await httpx_client.aclose()
+        if self._pending_closes:
+            await asyncio.gather(*self._pending_closes, return_exceptions=True)
+
+    @staticmethod
+    def _reset_entry(entry: Dict[str, Any]) -> None:
+        entry["httpx_client"] = None
+        entry["client"] = None
+        entry["loop"] = None
+
+    def _close_entry(self, entry: Dict[str, Any]) -> None:
+        """Close an entry's httpx client on the loop that owns it."""
+        httpx_client = entry.get("httpx_client")
+        loop = entry.get("loop")
+        self._reset_entry(entry)
+        if httpx_client is None or loop is None or loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is running_loop:
+            task = loop.create_task(httpx_client.aclose())
+            self._pending_closes.add(task)
+            task.add_done_callback(self._pending_closes.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(httpx_client.aclose(), loop)
+
+
+class AgentCardCache:
+    """Agent cards keyed by agent URL.
+
+    Cached cards are served without any HTTP call until their TTL expires, then
+    revalidated with If-None-Match / If-Modified-Since. Cards of registered agents
+    are pinned and kept fresh by refresh_pinned(); unpinned cards (e.g. previews)
+    are dropped once stale.
+    """
+
+    AGENT_CARD_PATH = "/.well-known/agent.json"
+
+    def __init__(self, ttl: float = AGENT_CARD_TTL, on_change=None) -> None:
+        self.ttl = ttl
+        self.on_change = on_change
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._httpx_client = None
+
+    @staticmethod
+    def _key(agent_url: str) -> str:
+        return agent_url.rstrip("/")
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(timeout=A2A_REQUEST_TIMEOUT)
+        return self._httpx_client
+
+    async def get(self, agent_url: str) -> AgentCard:
+        """Return the agent card for agent_url, fetching or revalidating it only when stale."""
+        key = self._key(agent_url)
+        entry = self.entries.get(key)
+        if entry and time.monotonic() < entry["expires_at"]:
+            self.hits += 1
+            return entry["card"]
+        self.misses += 1
+        return await self._fetch(key)
+
+    def prime(self, agent_url: str, card: AgentCard) -> None:
+        """Seed a pinned entry from a stored card; it is revalidated when its TTL runs out."""
+        self.entries[self._key(agent_url)] = {
+            "card": card,
+            "etag": None,
+            "last_modified": None,
+            "expires_at": time.monotonic() + self.ttl,
+            "pinned": True,
+        }
+
+    def pin(self, agent_url: str) -> None:
+        entry = self.entries.get(self._key(agent_url))
+        if entry:
+            entry["pinned"] = True
+
+    def unpin(self, agent_url: str) -> None:
+        entry = self.entries.get(self._key(agent_url))
+        if entry:
+            entry["pinned"] = False
+
+    async def _fetch(self, key: str) -> AgentCard:
+        entry = self.entries.get(key)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = await self._client().get(key + self.AGENT_CARD_PATH, headers=headers)
+        if response.status_code == 304 and entry:
+            self.not_modified += 1
+            entry["expires_at"] = time.monotonic() + self.ttl
+            return entry["card"]
+        response.raise_for_status()
+
+        card = AgentCard.model_validate(response.json())
+        changed = entry is not None and entry["card"] != card
+        self.entries[key] = {
+            "card": card,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "expires_at": time.monotonic() + self.ttl,
+            "pinned": entry["pinned"] if entry else False,
+        }
+        if changed and self.on_change:
+            self.on_change(key, card)
+        return card
+
+    async def refresh_pinned(self, horizon: float = 0.0) -> bool:
+        """Revalidate pinned cards expiring within horizon seconds and drop stale unpinned ones.
+
+        Returns whether any pinned card changed.
+        """
+        now = time.monotonic()
+        changed = False
+        for key, entry in list(self.entries.items()):
+            if entry["expires_at"] - now > horizon:
+                continue
+            if not entry["pinned"]:
+                if entry["expires_at"] <= now:
+                    self.entries.pop(key, None)
+                continue
+            try:
+                if await self._fetch(key) != entry["card"]:
+                    changed = True
+            except Exception as e:
+                logger.warning(f"Failed to refresh agent card for {key}: {str(e)}")
+        return changed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+    async def close(self) -> None:
+        if self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+
+class AgentHealthMonitor:
+    """Rolling latencies and a circuit breaker per remote agent.
+
+    probe() times an agent card fetch and a JSON-RPC round trip (tasks/get for an
+    unknown task, which an A2A server answers without running its model). Real
+    calls made inside track() feed the same state. After failure_threshold
+    consecutive failures the agent is unhealthy and calls fail fast; once
+    cooldown has passed a single trial call is let through, and any success
+    closes the breaker again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = AGENT_HEALTH_FAILURE_THRESHOLD,
+        cooldown: float = AGENT_HEALTH_COOLDOWN,
+        window: int = AGENT_HEALTH_WINDOW,
+        probe_timeout: float = AGENT_HEALTH_PROBE_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.window = window
+        self.probe_timeout = probe_timeout
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._httpx_client = None
+        # Calls report from the executor loop while the API loop probes
+        self._lock = threading.Lock()
+
+    def _entry(self, agent_name: str) -> Dict[str, Any]:
+        entry = self.entries.get(agent_name)
+        if entry is None:
+            entry = {
+                "card_fetch_ms": deque(maxlen=self.window),
+                "echo_ms": deque(maxlen=self.window),
+                "call_ms": deque(maxlen=self.window),
+                "failures": 0,
+                "opened_at": None,
+                "trial": False,
+                "last_error": None,
+                "last_probe_at": None,
+            }
+            self.entries[agent_name] = entry
+        return entry
+
+    def remove(self, agent_name: str) -> None:
+        with self._lock:
+            self.entries.pop(agent_name, None)
+
+    def is_healthy(self, agent_name: str) -> bool:
+        entry = self.entries.get(agent_name)
+        return entry is None or entry["opened_at"] is None
+
+    def allow_call(self, agent_name: str) -> bool:
+        """Whether a call may go out now; claims the trial call of an open breaker."""
+        with self._lock:
+            entry = self._entry(agent_name)
+            if entry["opened_at"] is None:
+                return True
+            if entry["trial"] or time.monotonic() - entry["opened_at"] < self.cooldown:
+                return False
+            entry["trial"] = True
+            return True
+
+    def record_success(self, agent_name: str, **latencies_ms: float) -> None:
+        with self._lock:
+            entry = self._entry(agent_name)
+            for kind, latency_ms in latencies_ms.items():
+                entry[kind].append(latency_ms)
+            entry["failures"] = 0
+            entry["opened_at"] = None
+            entry["trial"] = False
+
+    def record_failure(self, agent_name: str, error: BaseException) -> None:
+        with self._lock:
+            entry = self._entry(agent_name)
+            entry["failures"] += 1
+            entry["trial"] = False
+            entry["last_error"] = str(error) or type(error).__name__
+            if entry["failures"] >= self.failure_threshold:
+                entry["opened_at"] = time.monotonic()
+
+    @contextmanager
+    def track(self, agent_name: str):
+        """Guard one remote call with the breaker and record its outcome."""
+        if not self.allow_call(agent_name):
+            raise Exception(f"Agent '{agent_name}' is unhealthy; skipped until it recovers")
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record_failure(agent_name, e)
+            raise
+        except BaseException:
+            # Cancelled by the caller (e.g. a latency budget), not the agent's fault
+            with self._lock:
+                self._entry(agent_name)["trial"] = False
+            raise
+        self.record_success(agent_name, call_ms=(time.perf_counter() - start) * 1000)
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._httpx_client is None:
+            self._httpx_client = httpx.AsyncClient(timeout=self.probe_timeout)
+        return self._httpx_client
+
+    async def probe(self, agent_name: str, agent_url: str, rpc_url: str) -> None:
+        client = self._client()
+        try:
+            start = time.perf_counter()
+            response = await client.get(agent_url.rstrip("/") + AgentCardCache.AGENT_CARD_PATH)
+            response.raise_for_status()
+            card_fetch_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            response = await client.post(rpc_url, json={
+                "jsonrpc": "2.0",
+                "id": uuid4().hex,
+                "method": "tasks/get",
+                "params": {"id": f"health-probe-{uuid4().hex}"},
+            })
+            response.raise_for_status()
+            response.json()
+            echo_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            logger.warning(f"Health probe failed for {agent_name}: {str(e) or type(e).__name__}")
+            self.record_failure(agent_name, e)
+        else:
+            self.record_success(agent_name, card_fetch_ms=card_fetch_ms, echo_ms=echo_ms)
+        with self._lock:
+            self._entry(agent_name)["last_probe_at"] = datetime.now().isoformat()
+
+    @staticmethod
+    def _percentiles(samples) -> Optional[Dict[str, float]]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+
+        def nearest_rank(pct: float) -> float:
+            return round(ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))], 3)
+
+        return {"p50": nearest_rank(50), "p95": nearest_rank(95), "p99": nearest_rank(99), "count": len(ordered)}
+
+    def snapshot(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        """Health state and rolling latency percentiles (ms) of one agent."""
+        with self._lock:
+            entry = self.entries.get(agent_name)
+            if entry is None:
+                return None
+            return {
+                "healthy": entry["opened_at"] is None,
+                "consecutive_failures": entry["failures"],
+                "last_error": entry["last_error"],
+                "last_probe_at": entry["last_probe_at"],
+                "card_fetch_ms": self._percentiles(entry["card_fetch_ms"]),
+                "echo_ms": self._percentiles(entry["echo_ms"]),
+                "call_ms": self._percentiles(entry["call_ms"]),
+            }
+
+    async def close(self) -> None:
+        if self._httpx_client is not None:
+            await self._httpx_client.aclose()
+            self._httpx_client = None
+
+
+class RemoteResultCache:
+    """LRU of remote agent answers keyed by (agent name, task text, agent card version).
+
+    Entries expire after the TTL they were stored with; once max_entries is
+    reached the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.agent_stats: Dict[str, Dict[str, int]] = {}
+        # Tools call in from the executor loop while the API loop updates agents
+        self._lock = threading.Lock()
+
+    def _count(self, agent_name: str, outcome: str) -> None:
+        stats = self.agent_stats.setdefault(agent_name, {"hits": 0, "misses": 0})
+        stats[outcome] += 1
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() >= entry["expires_at"]:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self._count(key[0], "misses")
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self._count(key[0], "hits")
+            return entry["result"]
+
+    def put(self, key: tuple, result: str, ttl: float) -> None:
+        with self._lock:
+            self.entries[key] = {"result": result, "expires_at": time.monotonic() + ttl}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, agent_name: str) -> None:
+        """Drop every cached answer of one agent."""
+        with self._lock:
+            for key in [key for key in self.entries if key[0] == agent_name]:
+                del self.entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "agents": {name: dict(stats) for name, stats in self.agent_stats.items()},
+            }
+
+
+class AgentRegistryStore:
+    """SQLite copy of agent_registry, including each agent's card.
+
+    Rows are keyed by agent id and indexed by normalized name and creation time,
+    so the registry and every agent's tool can be restored on startup without
+    fetching any agent card.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS agents (
+            id TEXT PRIMARY KEY,
+            normalized_name TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            url TEXT NOT NULL,
+            skills TEXT NOT NULL,
+            status TEXT NOT NULL,
+            enabled INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            card TEXT NOT NULL,
+            cache_ttl REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_agents_normalized_name ON agents (normalized_name);
+        CREATE INDEX IF NOT EXISTS idx_agents_created_at ON agents (created_at);
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(agents)")}
+        if "cache_ttl" not in columns:
+            self._conn.execute("ALTER TABLE agents ADD COLUMN cache_ttl REAL NOT NULL DEFAULT 0")
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Return every stored agent, oldest first, with its card under "card"."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, normalized_name, name, description, url, skills, status, enabled, created_at, card, cache_ttl "
+                "FROM agents ORDER BY created_at, id"
+            ).fetchall()
+        agents = []
+        for agent_id, normalized_name, name, description, url, skills, status, enabled, created_at, card, cache_ttl in rows:
+            agents.append({
+                "id": agent_id,
+                "name": name,
+                "description": description,
+                "url": url,
+                "skills": json.loads(skills),
+                "status": status,
+                "enabled": bool(enabled),
+                "created_at": created_at,
+                "normalized_name": normalized_name,
+                "cache_ttl": cache_ttl,
+                "card": AgentCard.model_validate_json(card),
+            })
+        return agents
+
+    def save(self, agent_id: str, agent_data: Dict[str, Any], agent_card: AgentCard) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agents "
+                "(id, normalized_name, name, description, url, skills, status, enabled, created_at, card, cache_ttl) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    agent_id,
+                    agent_data["normalized_name"],
+                    agent_data["name"],
+                    agent_data["description"],
+                    agent_data["url"],
+                    json.dumps(agent_data["skills"], ensure_ascii=False),
+                    agent_data["status"],
+                    int(agent_data["enabled"]),
+                    agent_data["created_at"],
+                    agent_card.model_dump_json(by_alias=True, exclude_none=True),
+                    agent_data.get("cache_ttl", 0),
+                ),
+            )
+
+    def set_enabled(self, agent_id: str, enabled: bool) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE agents SET enabled = ? WHERE id = ?", (int(enabled), agent_id))
+
+    def set_cache_ttl(self, agent_id: str, cache_ttl: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE agents SET cache_ttl = ? WHERE id = ?", (cache_ttl, agent_id))
+
+    def set_card(self, agent_id: str, agent_card: AgentCard) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE agents SET card = ? WHERE id = ?",
+                (agent_card.model_dump_json(by_alias=True, exclude_none=True), agent_id),
+            )
+
+    def delete(self, agent_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 # A2A Client Manager (adapted from your code)
 class A2AClientManager:
-    def __init__(self) -> None:
+    def __init__(self, registry_store: Optional[AgentRegistryStore] = None) -> None:
+        self.registry_store = registry_store
         self.a2aclient_pool = {}
-        self.agent_cards = []
+        self.connection_pool = A2AConnectionPool()
+        self.card_cache = AgentCardCache(on_change=self._on_agent_card_changed)
+        self.health = AgentHealthMonitor()
+        self.result_cache = RemoteResultCache()
+        # Indexes keyed by normalized agent name
+        self.agent_cards: Dict[str, AgentCard] = {}
+        self.agent_ids: Dict[str, str] = {}
+        # Memoized tool per agent, and the tools of enabled agents
+        self.agent_tools: Dict[str, Any] = {}
+        self.enabled_tools: Dict[str, Any] = {}
+        self.scatter_gather_tool = generate_scatter_gather_function()
         self.tools = []
         
-    async def add_agent_by_url(self, agent_url: str) -> str:
+    async def add_agent_by_url(self, agent_url: str, cache_ttl: Optional[float] = None) -> str:
         """Add a single agent by URL and return agent_id."""        
         try:
-            async with httpx.AsyncClient(timeout=120) as httpx_client:
-                agent_card_client = A2ACardResolver(httpx_client=httpx_client, base_url=agent_url)
-                agent_card = await agent_card_client.get_agent_card()
-                
-                a2aclient = await A2AClient.get_client_from_agent_card_url(
-                    httpx_client, agent_url
-                )
-                
-                agent_id = str(uuid.uuid4())
-                normalized_name = name_normalize(agent_card.name)
-                
-                # Store in global registry
-                skills_data = []
-                for skill in agent_card.skills:
-                    skills_data.append({
-                        "name": skill.name,
-                        "description": skill.description,
-                        "examples": skill.examples
-                    })
-                
-                agent_registry[agent_id] = {
-                    "name": agent_card.name,
-                    "description": agent_card.description,
-                    "url": agent_url,
-                    "skills": skills_data,
-                    "status": "active",
-                    "enabled": True,  # Default to enabled when adding new agent
-                    "created_at": datetime.now().isoformat(),
-                    "normalized_name": normalized_name
-                }
-                
-                # Store A2A agent_url
-                self.a2aclient_pool[normalized_name] = agent_url
-                self.agent_cards.append(agent_card)
-                
-                # Regenerate tools
-                self._generate_tools()
-                
-                return agent_id
+            agent_card = await self.card_cache.get(agent_url)
+            self.card_cache.pin(agent_url)
+            
+            agent_id = str(uuid.uuid4())
+            normalized_name = name_normalize(agent_card.name)
+            
+            # Store in global registry
+            skills_data = []
+            for skill in agent_card.skills:
+                skills_data.append({
+                    "name": skill.name,
+                    "description": skill.description,
+                    "examples": skill.examples
+                })
+            
+            agent_data = {
+                "name": agent_card.name,
+                "description": agent_card.description,
+                "url": agent_url,
+                "skills": skills_data,
+                "status": "active",
+                "enabled": True,  # Default to enabled when adding new agent
+                "created_at": datetime.now().isoformat(),
+                "normalized_name": normalized_name,
+                "cache_ttl": RESULT_CACHE_DEFAULT_TTL if cache_ttl is None else cache_ttl
+            }
+            if self.registry_store:
+                self.registry_store.save(agent_id, agent_data, agent_card)
+            self._register(agent_id, agent_data, agent_card)
+            
+            return agent_id
             
         except Exception as e:
             raise Exception(f"Failed to add agent: {str(e)}")
     
+    def _register(self, agent_id: str, agent_data: Dict[str, Any], agent_card: AgentCard):
+        """Index a registry entry and generate the tool for this agent only."""
+        normalized_name = agent_data["normalized_name"]
+        agent_registry[agent_id] = agent_data
+        
+        # Store A2A agent_url
+        self.a2aclient_pool[normalized_name] = agent_data["url"]
+        self.connection_pool.register(normalized_name, agent_card)
+        self.health.remove(normalized_name)
+        self.result_cache.invalidate(normalized_name)
+        self.agent_cards[normalized_name] = agent_card
+        self.agent_ids[normalized_name] = agent_id
+        self.agent_tools.pop(normalized_name, None)
+        self._update_tool(normalized_name)
+    
+    def restore(self) -> int:
+        """Warm start: rebuild the registry and tools from the store without network calls."""
+        if not self.registry_store:
+            return 0
+        agents = self.registry_store.load()
+        for agent_data in agents:
+            agent_id = agent_data.pop("id")
+            agent_card = agent_data.pop("card")
+            self.card_cache.prime(agent_data["url"], agent_card)
+            self._register(agent_id, agent_data, agent_card)
+        return len(agents)
+    
+    def _on_agent_card_changed(self, agent_url: str, agent_card: AgentCard):
+        """Point pooled clients at a refreshed agent card."""
+        normalized_name = name_normalize(agent_card.name)
+        agent_id = self.agent_ids.get(normalized_name)
+        if agent_id and agent_registry[agent_id]["url"].rstrip("/") == agent_url:
+            self.connection_pool.register(normalized_name, agent_card)
+            self.agent_cards[normalized_name] = agent_card
+            self.agent_tools.pop(normalized_name, None)
+            self.result_cache.invalidate(normalized_name)
+            self._update_tool(normalized_name)
+            if self.registry_store:
+                self.registry_store.set_card(agent_id, agent_card)
+    
     def remove_agent(self, agent_id: str):
         """Remove an agent by ID."""
         if agent_id in agent_registry:
             normalized_name = agent_registry[agent_id].get("normalized_name")
-            if normalized_name and normalized_name in self.a2aclient_pool:
-                del self.a2aclient_pool[normalized_name]
             
-            # Remove from agent_cards
-            agent_name = agent_registry[agent_id].get("name")
-            self.agent_cards = [card for card in self.agent_cards if card.name != agent_name]
+            agent_url = agent_registry[agent_id].get("url")
+            if agent_url and not any(
+                other_id != agent_id and other.get("url") == agent_url
+                for other_id, other in agent_registry.items()
+            ):
+                self.card_cache.unpin(agent_url)
             
-            # Remove from registries
+            # Remove from pools, indexes and registries, unless a newer entry took over the name
+            if normalized_name and self.agent_ids.get(normalized_name) == agent_id:
+                self.a2aclient_pool.pop(normalized_name, None)
+                self.connection_pool.remove(normalized_name)
+                del self.agent_ids[normalized_name]
+                self.agent_cards.pop(normalized_name, None)
+                self.agent_tools.pop(normalized_name, None)
+                self.health.remove(normalized_name)
+                self.result_cache.invalidate(normalized_name)
             del agent_registry[agent_id]
+            if self.registry_store:
+                self.registry_store.delete(agent_id)
             
-            # Regenerate tools
-            self._generate_tools()
+            # Drop this agent's tool
+            if normalized_name:
+                self._update_tool(normalized_name)
 
-    def _generate_tools(self):
-        """Generate tools that invoke a2a remote agents as tools, only for enabled agents."""
-        self.tools = []
-        
-        AGENT_DESC_TEMPLATE = """
-{description}
+    def set_agent_enabled(self, agent_id: str, enabled: bool):
+        """Enable or disable an agent, touching only that agent's tool."""
+        agent_registry[agent_id]["enabled"] = enabled
+        if self.registry_store:
+            self.registry_store.set_enabled(agent_id, enabled)
+        normalized_name = agent_registry[agent_id].get("normalized_name")
+        if normalized_name and self.agent_ids.get(normalized_name) == agent_id:
+            self._update_tool(normalized_name)
 
-## Description of agent skills
-{skills}
-"""
-        
-        SKILL_DESC_TEMPLATE = """### skill[{idx}]:
-- Skill name:
-{skill_name}
+    def set_agent_cache_ttl(self, agent_id: str, cache_ttl: float):
+        """Set how long an agent's answers are cached; 0 turns caching off."""
+        agent_registry[agent_id]["cache_ttl"] = cache_ttl
+        if self.registry_store:
+            self.registry_store.set_cache_ttl(agent_id, cache_ttl)
+        normalized_name = agent_registry[agent_id].get("normalized_name")
+        if normalized_name and self.agent_ids.get(normalized_name) == agent_id and cache_ttl <= 0:
+            self.result_cache.invalidate(normalized_name)
 
-- Description:
-{skill_desc}
+    def _cache_key(self, query: str, agent_name: str) -> Optional[tuple]:
+        """Result cache key for a call, or None when the agent does not cache."""
+        agent_id = self.agent_ids.get(agent_name)
+        agent_card = self.agent_cards.get(agent_name)
+        if agent_id is None or agent_card is None or agent_registry[agent_id].get("cache_ttl", 0) <= 0:
+            return None
+        return (agent_name, query.strip(), agent_card.version)
 
-- Examples:
-{skill_examples}
-"""
-        
-        # Only generate tools for enabled agents
-        for agent_card in self.agent_cards:
-            # Find the corresponding agent in the registry to check enabled status
-            agent_enabled = True  # Default to True if not found in registry
-            normalized_name = name_normalize(agent_card.name)
-            
-            # Check if this agent is enabled in the registry
-            for agent_id, agent_data in agent_registry.items():
-                if agent_data.get("normalized_name") == normalized_name:
-                    agent_enabled = agent_data.get("enabled", True)
-                    break
-            
-            # Only create tools for enabled agents
-            if agent_enabled:
-                agent_skills = []
-                for id, skill in enumerate(agent_card.skills):
-                    desc = SKILL_DESC_TEMPLATE.format(
-                        idx=id+1,
-                        skill_name=skill.name,
-                        skill_desc=skill.description,
-                        skill_examples=skill.examples,
-                    )
-                    agent_skills.append(desc)
-                
-                function_desc = AGENT_DESC_TEMPLATE.format(
-                    description=agent_card.description,
-                    skills="\n".join(agent_skills)
-                )
-                streaming = False
-                if hasattr(agent_card.capabilities,"streaming"):
-                    streaming = agent_card.capabilities.streaming 
-                self.tools.append(self._generate_function(normalized_name, function_desc,streaming))
-        
+    def _cache_store(self, cache_key: Optional[tuple], result: str) -> None:
+        agent_id = self.agent_ids.get(cache_key[0]) if cache_key else None
+        if agent_id is not None:
+            self.result_cache.put(cache_key, result, agent_registry[agent_id].get("cache_ttl", 0))
+
+    def _update_tool(self, normalized_name: str):
+        """Add or drop one agent's tool according to its registry entry."""
+        agent_id = self.agent_ids.get(normalized_name)
+        agent_card = self.agent_cards.get(normalized_name)
+        if (
+            agent_id is None
+            or agent_card is None
+            or not agent_registry[agent_id].get("enabled", True)
+            or agent_registry[agent_id].get("status") == "unhealthy"
+        ):
+            self.enabled_tools.pop(normalized_name, None)
+        else:
+            agent_tool = self.agent_tools.get(normalized_name)
+            if agent_tool is None:
+                agent_tool = self._build_tool(normalized_name, agent_card)
+                self.agent_tools[normalized_name] = agent_tool
+            self.enabled_tools[normalized_name] = agent_tool
+        self._publish_tools()
+
+    async def probe_agents(self) -> bool:
+        """Probe every registered agent concurrently; return whether the tool set changed."""
+        probes = []
+        for normalized_name, agent_card in list(self.agent_cards.items()):
+            agent_url = self.a2aclient_pool.get(normalized_name)
+            if agent_url is None:
+                # Removed while this round was being set up
+                continue
+            probes.append(self.health.probe(normalized_name, agent_url, agent_card.url))
+        await asyncio.gather(*probes)
+        return self.sync_health()
+
+    def sync_health(self) -> bool:
+        """Mirror breaker state into registry status, hiding the tools of unhealthy agents."""
+        changed = False
+        for normalized_name, agent_id in list(self.agent_ids.items()):
+            status = "active" if self.health.is_healthy(normalized_name) else "unhealthy"
+            if agent_registry[agent_id].get("status") != status:
+                logger.info(f"Agent {normalized_name} is now {status}")
+                agent_registry[agent_id]["status"] = status
+                self._update_tool(normalized_name)
+                changed = True
+        return changed
+
+    def _publish_tools(self):
+        """Expose enabled agents' tools, plus scatter_gather when there are agents to fan out to."""
+        self.tools = list(self.enabled_tools.values())
+        if self.tools:
+            self.tools.append(self.scatter_gather_tool)
+
+    def _generate_tools(self):
+        """Generate tools that invoke a2a remote agents as tools, only for enabled agents."""
+        self.agent_tools = {}
+        self.enabled_tools = {}
+        for normalized_name in self.agent_cards:
+            self._update_tool(normalized_name)
+        self._publish_tools()
         return self.tools
+
+    def _build_tool(self, normalized_name: str, agent_card: AgentCard):
+        """Format the tool description for an agent card and decorate its tool function."""
+        agent_skills = []
+        for id, skill in enumerate(agent_card.skills):
+            desc = SKILL_DESC_TEMPLATE.format(
+                idx=id+1,
+                skill_name=skill.name,
+                skill_desc=skill.description,
+                skill_examples=skill.examples,
+            )
+            agent_skills.append(desc)
+        
+        function_desc = AGENT_DESC_TEMPLATE.format(
+            description=agent_card.description,
+            skills="\n".join(agent_skills)
+        )
+        streaming = False
+        if hasattr(agent_card.capabilities,"streaming"):
+            streaming = agent_card.capabilities.streaming 
+        return self._generate_function(normalized_name, function_desc,streaming)
     
     def _generate_function(self, function_name, desc,streaming):
         """Generate a tool function for the agent."""
         agent_tool = generate_function(function_name,desc,streaming)
         return agent_tool
 
+    async def scatter_gather(
+        self,
+        query: str,
+        agent_names: Optional[List[str]] = None,
+        agent_timeout: float = SCATTER_GATHER_AGENT_TIMEOUT,
+        latency_budget: float = SCATTER_GATHER_LATENCY_BUDGET,
+        on_event=None,
+    ) -> Dict[str, str]:
+        """Send one query to several enabled agents concurrently and return what arrives in time."""
+        if agent_names:
+            targets = [name_normalize(name) for name in agent_names]
+        else:
+            targets = list(self.enabled_tools)
+        results: Dict[str, str] = {}
+        calls = {}
+        for agent_name in targets:
+            agent_card = self.agent_cards.get(agent_name)
+            if agent_card is None or agent_name not in self.enabled_tools:
+                results[agent_name] = "Error: unknown or disabled agent"
+                continue
+            if getattr(agent_card.capabilities, "streaming", False):
+                coro = self.invoke_remote_agent_streaming(query, agent_name, on_event=on_event)
+            else:
+                coro = self.invoke_remote_agent(query, agent_name)
+            calls[asyncio.ensure_future(asyncio.wait_for(coro, agent_timeout))] = agent_name
+        if not calls:
+            return results
+
+        try:
+            done, _ = await asyncio.wait(calls, timeout=latency_budget)
+        finally:
+            for call in calls:
+                call.cancel()
+        for call, agent_name in calls.items():
+            if call not in done:
+                results[agent_name] = f"Error: no answer within the {latency_budget:g}s latency budget"
+            elif call.cancelled() or isinstance(call.exception(), asyncio.TimeoutError):
+                results[agent_name] = f"Error: remote agent call timed out after {agent_timeout:g}s"
+            elif call.exception() is not None:
+                results[agent_name] = f"Error: {str(call.exception())}"
+            else:
+                results[agent_name] = call.result()
+        return results
+
     def invoke_remote_agent_sync(self, query: str, agent_name: str) -> str:
         """A fully synchronous method to invoke remote agents."""
-        nest_asyncio.apply()
-        return asyncio.run(self.invoke_remote_agent(query, agent_name))
+        return a2a_executor.run(self.invoke_remote_agent(query, agent_name))
     
     async def invoke_remote_agent(self, query: str, agent_name: str) -> str:
         """A single-turn request to remote agent."""
+        cache_key = self._cache_key(query, agent_name)
+        if cache_key:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
         send_payload = create_send_message_payload(text=query)
-        agent_url = self.a2aclient_pool.get(agent_name)
-        async with httpx.AsyncClient(timeout=120) as httpx_client:
-            a2aclient = await A2AClient.get_client_from_agent_card_url(
-                httpx_client, agent_url
-            )
+        with self.health.track(agent_name):
+            a2aclient = self.connection_pool.get_client(agent_name)
             response = await a2aclient.send_message(
                 SendMessageRequest(id=str(uuid4()),params=MessageSendParams(**send_payload))
             )
-            return print_json_response(response)
+        result = print_json_response(response)
+        if not isinstance(response.root, JSONRPCErrorResponse):
+            self._cache_store(cache_key, result)
+        return result
     
     def invoke_remote_agent_streaming_sync(self, query: str, agent_name: str) -> str:
         """A fully synchronous method to invoke remote agents in streaming mode."""
-        nest_asyncio.apply()
-        return asyncio.run(self.invoke_remote_agent_streaming(query, agent_name))
+        return a2a_executor.run(self.invoke_remote_agent_streaming(query, agent_name))
+
+    async def invoke_remote_agent_streaming(self, query: str, agent_name: str, on_event=None) -> str:
+        """A single-turn streaming request to remote agent in streaming mode.
 
-    async def invoke_remote_agent_streaming(self, query: str, agent_name: str) -> str:
-        """A single-turn streaming request to remote agent in streaming mode."""
+        on_event, when given, receives each task status update and artifact as it arrives.
+        """
+        cache_key = self._cache_key(query, agent_name)
+        if cache_key:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                if on_event:
+                    on_event({"agent": agent_name, "event": "artifact", "content": cached, "cached": True})
+                return cached
         send_payload = create_send_message_payload(text=query)
+        with self.health.track(agent_name):
+            artifact = await self._stream_remote_agent(send_payload, agent_name, on_event)
+        if artifact:
+            self._cache_store(cache_key, artifact)
+        return artifact
+
+    async def _stream_remote_agent(self, send_payload: Dict[str, Any], agent_name: str, on_event=None) -> str:
+        a2aclient = self.connection_pool.get_client(agent_name)
+        artifact = ""
+        stream_response = a2aclient.send_message_streaming(
+            SendStreamingMessageRequest(id=str(uuid4()),params=MessageSendParams(**send_payload))
+        )
         
-        agent_url = self.a2aclient_pool.get(agent_name)
-        async with httpx.AsyncClient(timeout=120) as httpx_client:
-            a2aclient = await A2AClient.get_client_from_agent_card_url(
-                httpx_client, agent_url
-            )
-            artifact = ""
-            stream_response = a2aclient.send_message_streaming(
-                SendStreamingMessageRequest(id=str(uuid4()),params=MessageSendParams(**send_payload))
-            )
-            
-            async for chunk in stream_response:
-                chunk = json.loads(convert_response_to_json_str(chunk))
-                if "final" in chunk["result"] and chunk["result"].get("final") == False:
-                    pass  # Intermediate streaming
-                elif "artifact" in chunk["result"]:
-                    artifact = chunk["result"]["artifact"]["parts"][0]["text"]
-                    
-            return artifact
+        async for chunk in stream_response:
+            chunk = json.loads(convert_response_to_json_str(chunk))
+            result = chunk["result"]
+            if "final" in result and result.get("final") == False:
+                # Intermediate streaming
+                if on_event:
+                    status = result.get("status", {})
+                    on_event({
+                        "agent": agent_name,
+                        "event": "status",
+                        "state": status.get("state"),
+                        "content": parts_text(status.get("message", {}).get("parts", [])),
+                    })
+            elif "artifact" in result:
+                artifact = result["artifact"]["parts"][0]["text"]
+                if on_event:
+                    on_event({
+                        "agent": agent_name,
+                        "event": "artifact",
+                        "content": parts_text(result["artifact"]["parts"]),
+                    })
+                
+        return artifact
 
 # Lead Agent (adapted from your code)
 class LeadAgent:
     def __init__(self, tools: List[Any]):
-        self.messages = []
-        self.tools = tools
+        self.tools = list(tools)
         self.conversation_manager = SlidingWindowConversationManager(
             window_size=20,
         )
-        
-    def get_agent(self):
-        agent = Agent(
+        self.agent = Agent(
             model=MODEL,
-            messages=self.messages,
+            messages=[],
             conversation_manager=self.conversation_manager,
             system_prompt="""You are a coordinator agent, you can communicate with other remote agents to resolve problems.""",
-            tools=self.tools
+            tools=self.tools,
+            # Each directory watcher stays registered for the life of the process,
+            # which would pin every evicted session agent in memory
+            load_tools_from_directory=False
         )
-        return agent
+
+    @property
+    def messages(self):
+        return self.agent.messages
+        
+    def get_agent(self):
+        return self.agent
+
+    def set_tools(self, tools: List[Any]):
+        """Hot-swap the tool set of the long-lived agent, keeping its conversation."""
+        tools = list(tools)
+        if len(tools) == len(self.tools) and all(new is old for new, old in zip(tools, self.tools)):
+            return
+        # Build the new registry aside and swap it in whole, so an in-flight
+        # event loop cycle never sees a half-updated registry
+        registry = ToolRegistry()
+        registry.process_tools(tools)
+        self.agent.tool_registry.registry = registry.registry
+        self.agent.tool_registry.dynamic_tools = registry.dynamic_tools
+        self.tools = tools
         
     async def stream(self, query: str, session_id: str = None):      
-        """Stream responses from the lead agent."""
+        """Stream responses from the lead agent, interleaved with remote agent progress."""
         tool_use_buffer_start = False
         tool_use_name_buffer = ""
         tool_use_input_buffer = ""
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        finished = object()
+
+        def on_remote_event(remote_event):
+            # Called from whichever thread runs the remote agent call
+            loop.call_soon_threadsafe(events.put_nowait, {"remote_agent_event": remote_event})
+
+        async def pump_agent_events():
+            try:
+                async for event in self.agent.stream_async(query):
+                    events.put_nowait(event)
+            except Exception as e:
+                events.put_nowait(e)
+            finally:
+                events.put_nowait(finished)
+
+        remote_event_listeners[self.agent] = on_remote_event
+        pump_task = asyncio.create_task(pump_agent_events())
         try:
-            async for event in self.get_agent().stream_async(query):
-                if "data" in event:
+            while True:
+                event = await events.get()
+                if event is finished:
+                    break
+                if isinstance(event, Exception):
+                    raise event
+                if "data" in event or "remote_agent_event" in event:
                     if tool_use_buffer_start:
                         yield {"current_tool_use":tool_use_name_buffer}
                         yield {"current_tool_use_input":tool_use_input_buffer}
                         tool_use_buffer_start = False
                         tool_use_name_buffer = ""
                         tool_use_input_buffer = ""
-                    yield {"data":event["data"]}
+                    if "data" in event:
+                        yield {"data":event["data"]}
+                    else:
+                        yield event
                         
                 elif "current_tool_use" in event and event["current_tool_use"].get("name"):
                     # logger.info(f"{event['current_tool_use']}")
                     tool_use_name_buffer = event["current_tool_use"]["name"]
                     tool_use_input_buffer = event["current_tool_use"]["input"]
                     tool_use_buffer_start = True
-            
-                    
-            self.messages = self.get_agent().messages
         except Exception as e:
             yield f"Error: {str(e)}"
+        finally:
+            remote_event_listeners.pop(self.agent, None)
+            pump_task.cancel()
+
+class LeadAgentSessions:
+    """Lead agents keyed by session id in a bounded LRU.
+
+    Requests within one session are serialized. Sessions idle for longer than
+    idle_timeout are evicted, as are the least recently used ones once
+    max_sessions or the memory budget is exceeded. Memory is approximated by the
+    serialized size of each conversation. Sessions with requests in flight are
+    never evicted.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = LEAD_AGENT_MAX_SESSIONS,
+        idle_timeout: float = LEAD_AGENT_SESSION_IDLE_TIMEOUT,
+        memory_budget: int = int(LEAD_AGENT_SESSION_MEMORY_MB * 1024 * 1024),
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.tools: List[Any] = []
+        self.tools_version = 0
+        self.memory_used = 0
+        self.evictions = 0
+
+    def set_tools(self, tools: List[Any]) -> None:
+        """Publish a new tool set; each session picks it up on its next request."""
+        self.tools = list(tools)
+        self.tools_version += 1
+
+    @asynccontextmanager
+    async def session(self, session_id: str):
+        """Hold a session's lead agent for the duration of one request."""
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            entry = {
+                "agent": LeadAgent(tools=self.tools),
+                "lock": asyncio.Lock(),
+                "tools_version": self.tools_version,
+                "active": 0,
+                "size": 0,
+                "last_used": time.monotonic(),
+            }
+            self.sessions[session_id] = entry
+        else:
+            self.sessions.move_to_end(session_id)
+        entry["active"] += 1
+        self._enforce_limits()
+        try:
+            async with entry["lock"]:
+                if entry["tools_version"] != self.tools_version:
+                    entry["agent"].set_tools(self.tools)
+                    entry["tools_version"] = self.tools_version
+                yield entry["agent"]
+        finally:
+            entry["active"] -= 1
+            entry["last_used"] = time.monotonic()
+            if self.sessions.get(session_id) is entry:
+                size = len(json.dumps(entry["agent"].messages, default=str))
+                self.memory_used += size - entry["size"]
+                entry["size"] = size
+            self._enforce_limits()
+
+    def evict_idle(self) -> int:
+        """Drop sessions that have been idle for longer than idle_timeout."""
+        deadline = time.monotonic() - self.idle_timeout
+        idle = [
+            session_id for session_id, entry in self.sessions.items()
+            if entry["active"] == 0 and entry["last_used"] < deadline
+        ]
+        for session_id in idle:
+            self._evict(session_id)
+        return len(idle)
+
+    def _enforce_limits(self) -> None:
+        for session_id in list(self.sessions):
+            if len(self.sessions) <= self.max_sessions and self.memory_used <= self.memory_budget:
+                break
+            if self.sessions[session_id]["active"] == 0:
+                self._evict(session_id)
+
+    def _evict(self, session_id: str) -> None:
+        entry = self.sessions.pop(session_id)
+        self.memory_used -= entry["size"]
+        self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self.sessions),
+            "memory_bytes": self.memory_used,
+            "evictions": self.evictions,
+        }
 
 # Global instances
-a2a_manager = A2AClientManager()
+a2a_executor = A2ACallExecutor()
+a2a_manager = A2AClientManager(
+    registry_store=AgentRegistryStore(AGENT_REGISTRY_DB) if AGENT_REGISTRY_DB else None
+)
+lead_agent_sessions = LeadAgentSessions()
+
+async def evict_idle_connections():
+    """Periodically close pooled A2A connections that have gone idle."""
+    interval = max(1.0, min(60.0, A2A_POOL_IDLE_TIMEOUT / 2))
+    while True:
+        await asyncio.sleep(interval)
+        evicted = a2a_manager.connection_pool.evict_idle()
+        if evicted:
+            logger.info(f"Evicted {evicted} idle A2A connection(s)")
+
+async def refresh_agent_cards():
+    """Periodically revalidate the agent cards of registered agents."""
+    while True:
+        await asyncio.sleep(AGENT_CARD_REFRESH_INTERVAL)
+        try:
+            if await a2a_manager.card_cache.refresh_pinned(horizon=AGENT_CARD_REFRESH_INTERVAL):
+                # Cached lead agents still hold the tools built from the old cards
+                lead_agent_sessions.set_tools(a2a_manager.tools)
+        except Exception:
+            logger.exception("Error refreshing agent cards")
+
+async def probe_agent_health():
+    """Periodically probe registered agents and hot-swap tools when one changes health."""
+    while True:
+        await asyncio.sleep(AGENT_HEALTH_PROBE_INTERVAL)
+        try:
+            if await a2a_manager.probe_agents():
+                lead_agent_sessions.set_tools(a2a_manager.tools)
+        except Exception:
+            # Keep probing; a failed round must not stop breaker recovery for good
+            logger.exception("Error probing agent health")
+
+async def evict_idle_sessions():
+    """Periodically drop lead agent sessions that have gone idle."""
+    interval = max(1.0, min(60.0, LEAD_AGENT_SESSION_IDLE_TIMEOUT / 2))
+    while True:
+        await asyncio.sleep(interval)
+        evicted = lead_agent_sessions.evict_idle()
+        if evicted:
+            logger.info(f"Evicted {evicted} idle lead agent session(s)")
 
 # Lifespan manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global  lead_agent_instance
+    restored = a2a_manager.restore()
+    if restored:
+        lead_agent_sessions.set_tools(a2a_manager.tools)
+        logger.info(f"Restored {restored} agent(s) from {AGENT_REGISTRY_DB}")
+    eviction_task = asyncio.create_task(evict_idle_connections())
+    card_refresh_task = asyncio.create_task(refresh_agent_cards())
+    session_eviction_task = asyncio.create_task(evict_idle_sessions())
+    health_probe_task = asyncio.create_task(probe_agent_health())
     yield
+    # Shutdown
+    eviction_task.cancel()
+    card_refresh_task.cancel()
+    session_eviction_task.cancel()
+    health_probe_task.cancel()
+    await a2a_manager.card_cache.close()
+    await a2a_manager.health.close()
+    await a2a_manager.connection_pool.close()
+    await asyncio.to_thread(a2a_executor.shutdown)
+    if a2a_manager.registry_store:
+        a2a_manager.registry_store.close()
 
 # FastAPI app
 app = FastAPI(
@@ -441,10 +1689,21 @@ app.add_middleware(
 )
 
 @app.get("/list_agents", response_model=List[AgentInfo])
-async def list_agents():
-    """Get all registered remote agents information."""
+async def list_agents(
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+):
+    """Get registered remote agents information, oldest first.
+
+    Pass offset/limit to page through large registries; the total number of
+    agents is returned in the X-Total-Count header. Each agent carries its
+    breaker state and rolling latency percentiles under "health".
+    """
+    response.headers["X-Total-Count"] = str(len(agent_registry))
+    stop = offset + limit if limit is not None else None
     agents_list = []
-    for agent_id, agent_data in agent_registry.items():
+    for agent_id, agent_data in islice(agent_registry.items(), offset, stop):
         # Get the first skill for backward compatibility
         skill_name = ""
         skill_description = ""
@@ -464,6 +1723,11 @@ async def list_agents():
                     "description": skill.get("description", "")
                 })
         
+        normalized_name = agent_data.get("normalized_name")
+        health = None
+        if a2a_manager.agent_ids.get(normalized_name) == agent_id:
+            health = a2a_manager.health.snapshot(normalized_name)
+        
         agents_list.append(AgentInfo(
             id=agent_id,
             name=agent_data.get("name", ""),
@@ -473,7 +1737,9 @@ async def list_agents():
             skill_description=skill_description,
             skills=skills if skills else None,  # Include all skills
             status=agent_data.get("status", "unknown"),
-            enabled=agent_data.get("enabled", True)
+            enabled=agent_data.get("enabled", True),
+            cache_ttl=agent_data.get("cache_ttl", 0),
+            health=health
         ))
     
     return agents_list
@@ -482,25 +1748,21 @@ async def list_agents():
 async def preview_agent(request: PreviewAgentRequest):
     """Preview agent information before adding."""
     try:        
-        agent_url = request.url
-        async with httpx.AsyncClient(timeout=120) as httpx_client:
-            # Get agent card
-            agent_card_client = A2ACardResolver(httpx_client=httpx_client, base_url=agent_url)
-            agent_card = await agent_card_client.get_agent_card()
-            
-            # Format skills data
-            skills_data = []
-            for skill in agent_card.skills:
-                skills_data.append({
-                    "name": skill.name,
-                    "description": skill.description
-                })
-            
-            return {
-                "name": agent_card.name,
-                "description": agent_card.description,
-                "skills": skills_data
-            }
+        agent_card = await a2a_manager.card_cache.get(request.url)
+        
+        # Format skills data
+        skills_data = []
+        for skill in agent_card.skills:
+            skills_data.append({
+                "name": skill.name,
+                "description": skill.description
+            })
+        
+        return {
+            "name": agent_card.name,
+            "description": agent_card.description,
+            "skills": skills_data
+        }
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to preview agent: {str(e)}")
@@ -509,12 +1771,12 @@ async def preview_agent(request: PreviewAgentRequest):
 async def add_agent(request: AddAgentRequest):
     """Register a new remote agent by URL."""
     try:
-        global a2a_manager, lead_agent_instance
+        global a2a_manager
         
-        agent_id = await a2a_manager.add_agent_by_url(request.url)
+        agent_id = await a2a_manager.add_agent_by_url(request.url, cache_ttl=request.cache_ttl)
         
-        # Recreate lead agent with updated tools
-        lead_agent_instance = LeadAgent(tools=a2a_manager.tools)
+        # Hot-swap the lead agents' tools
+        lead_agent_sessions.set_tools(a2a_manager.tools)
         
         agent_name = agent_registry[agent_id].get("name", "Unknown")
         
@@ -531,7 +1793,7 @@ async def add_agent(request: AddAgentRequest):
 @app.delete("/delete_agent")
 async def delete_agent(request: DeleteAgentRequest):
     """Delete a registered remote agent."""
-    global a2a_manager, lead_agent_instance
+    global a2a_manager
     
     agent_id = request.agent_id
     
@@ -541,8 +1803,8 @@ async def delete_agent(request: DeleteAgentRequest):
     agent_name = agent_registry[agent_id].get("name", "Unknown")
     a2a_manager.remove_agent(agent_id)
     
-    # Recreate lead agent with updated tools
-    lead_agent_instance = LeadAgent(tools=a2a_manager.tools)
+    # Hot-swap the lead agents' tools
+    lead_agent_sessions.set_tools(a2a_manager.tools)
     
     return {
         "message": f"Agent '{agent_name}' deleted successfully",
@@ -552,22 +1814,19 @@ async def delete_agent(request: DeleteAgentRequest):
 @app.put("/update_agent_enabled")
 async def update_agent_enabled(request: UpdateAgentEnabledRequest):
     """Update the enabled status of a remote agent."""
-    global a2a_manager, lead_agent_instance
+    global a2a_manager
     
     agent_id = request.agent_id
     
     if agent_id not in agent_registry:
         raise HTTPException(status_code=404, detail="Agent not found")
     
-    # Update the enabled status
-    agent_registry[agent_id]["enabled"] = request.enabled
+    # Update the enabled status and the agent's tool
+    a2a_manager.set_agent_enabled(agent_id, request.enabled)
     agent_name = agent_registry[agent_id].get("name", "Unknown")
     
-    # Regenerate tools to reflect the enabled/disabled status
-    a2a_manager._generate_tools()
-    
-    # Recreate lead agent with updated tools
-    lead_agent_instance = LeadAgent(tools=a2a_manager.tools)
+    # Hot-swap the lead agents' tools
+    lead_agent_sessions.set_tools(a2a_manager.tools)
     
     return {
         "message": f"Agent '{agent_name}' {'enabled' if request.enabled else 'disabled'} successfully",
@@ -576,38 +1835,48 @@ async def update_agent_enabled(request: UpdateAgentEnabledRequest):
         "active_tools_count": len(a2a_manager.tools)
     }
 
+@app.put("/update_agent_cache")
+async def update_agent_cache(request: UpdateAgentCacheRequest):
+    """Opt a remote agent in or out of result caching."""
+    agent_id = request.agent_id
+    
+    if agent_id not in agent_registry:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    if request.cache_ttl < 0:
+        raise HTTPException(status_code=400, detail="cache_ttl must not be negative")
+    
+    a2a_manager.set_agent_cache_ttl(agent_id, request.cache_ttl)
+    agent_name = agent_registry[agent_id].get("name", "Unknown")
+    
+    return {
+        "message": f"Result caching for agent '{agent_name}' {'set to ' + format(request.cache_ttl, 'g') + 's' if request.cache_ttl > 0 else 'disabled'}",
+        "agent_id": agent_id,
+        "cache_ttl": request.cache_ttl
+    }
+
 @app.post("/invoke_stream")
 async def invoke_stream(request: InvokeStreamRequest):
     """Invoke the lead agent with streaming response using SSE."""
     
     async def generate_stream():
         try:
-            global lead_agent_instance
-            
-            # Filter enabled agents (for now, we use all available agents as tools)
-            if not lead_agent_instance:
-                lead_agent_instance = LeadAgent(tools=a2a_manager.tools)
+            session_id = request.session_id or DEFAULT_SESSION_ID
             
             logger.info("Starting stream generation...")
             yield "data: {\"type\": \"start\", \"message\": \"Starting lead agent...\"}\n\n"
             
-            # Stream from lead agent
-            async for chunk in lead_agent_instance.stream(request.query):
-                if chunk:
-                    logger.info(chunk)
-                    if "data" in chunk:
-                        yield f"data: {json.dumps({'type': 'stream', 'content': chunk['data']})}\n\n"
-                    if "current_tool_use" in chunk:
-                        yield f"data: {json.dumps({'type': 'current_tool_use', 'content': chunk['current_tool_use']})}\n\n"
-                    if "current_tool_use_input" in chunk:
-                        yield f"data: {json.dumps({'type': 'current_tool_use_input', 'content': chunk['current_tool_use_input']})}\n\n"
+            # Stream from this session's lead agent
+            async with lead_agent_sessions.session(session_id) as lead_agent:
+                async for frame in encode_sse_stream(lead_agent.stream(request.query, session_id)):
+                    yield frame
             
+            logger.info("Stream generation completed")
             yield "data: {\"type\": \"complete\", \"message\": \"Lead agent completed\"}\n\n"
             
         except Exception as e:
             error_msg = f"Error in stream processing: {str(e)}\n{traceback.format_exc()}"
             logger.error(error_msg)
-            yield f"data: {json.dumps({'type': 'error', 'content': error_msg})}\n\n"
+            yield sse_event({"type": "error", "content": error_msg})
     
     return StreamingResponse(
         generate_stream(),
@@ -627,7 +1896,10 @@ async def health_check():
     return {
         "status": "healthy",
         "registered_agents": len(agent_registry),
-        "available_tools": len(a2a_manager.tools) if a2a_manager else 0
+        "available_tools": len(a2a_manager.tools) if a2a_manager else 0,
+        "agent_card_cache": a2a_manager.card_cache.stats() if a2a_manager else None,
+        "result_cache": a2a_manager.result_cache.stats() if a2a_manager else None,
+        "lead_agent_sessions": lead_agent_sessions.stats()
     }
 
 if __name__ == "__main__":
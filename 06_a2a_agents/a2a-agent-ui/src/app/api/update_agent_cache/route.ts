@@ -0,0 +1,29 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+export async function PUT(request: NextRequest) {
+  try {
+    const body = await request.json();
+    const backendUrl = process.env.BACKEND_URL || 'http://localhost:8000';
+    
+    const response = await fetch(`${backendUrl}/update_agent_cache`, {
+      method: 'PUT',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(body),
+    });
+    
+    if (!response.ok) {
+      throw new Error(`Backend error: ${response.status}`);
+    }
+    
+    const data = await response.json();
+    return NextResponse.json(data);
+  } catch (error) {
+    console.error('Error updating agent cache:', error);
+    return NextResponse.json(
+      { error: 'Failed to update agent cache' },
+      { status: 500 }
+    );
+  }
+}
\ No newline at end of file
@@ -21,6 +21,7 @@ interface Message {
   timestamp: Date;
   remoteAgent?: string;
   task?: string;
+  remoteProgress?: string;
 }
 
 export default function ChatInterface() {
@@ -32,6 +33,8 @@ export default function ChatInterface() {
   const [currentTask, setCurrentTask] = useState<string>('');
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const cancelStreamRef = useRef<(() => void) | null>(null);
+  // One lead agent conversation per chat window
+  const sessionIdRef = useRef(`${Date.now()}-${Math.random().toString(36).substr(2, 9)}`);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -93,7 +96,7 @@ export default function ChatInterface() {
 
     try {
       const cancelStream = await apiService.invokeStream(
-        { query: userMessage },
+        { query: userMessage, session_id: sessionIdRef.current },
         (data) => {
           if (data.type === 'stream' && data.content) {
             updateLastMessage(data.content);
@@ -127,6 +130,20 @@ export default function ChatInterface() {
               }
               return newMessages;
             });
+          } else if (data.type === 'remote_agent_event' && data.event === 'status' && data.content) {
+            // Partial output of a remote agent while it is still working
+            setMessages(prev => {
+              const newMessages = [...prev];
+              if (newMessages.length > 0 && newMessages[newMessages.length - 1].type === 'assistant') {
+                const lastMessage = newMessages[newMessages.length - 1];
+                newMessages[newMessages.length - 1] = {
+                  ...lastMessage,
+                  remoteAgent: lastMessage.remoteAgent || data.agent,
+                  remoteProgress: (lastMessage.remoteProgress || '') + data.content,
+                };
+              }
+              return newMessages;
+            });
           } else if (data.type === 'error') {
             setError(data.content || 'An error occurred during streaming');
           } else if (data.type === 'complete') {
@@ -272,6 +289,11 @@ export default function ChatInterface() {
                             <Box padding="s" color="text-status-info">
                               remote_agent: {message.remoteAgent || 'N/A'}, input: {JSON.stringify(message.task) || 'N/A'}
                             </Box>
+                            {message.remoteProgress && (
+                              <Box padding="s" color="text-body-secondary">
+                                <div style={{ whiteSpace: 'pre-wrap' }}>{message.remoteProgress}</div>
+                              </Box>
+                            )}
                           </ExpandableSection>
                         )}
                       </SpaceBetween>
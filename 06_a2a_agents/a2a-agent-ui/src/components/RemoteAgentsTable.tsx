@@ -13,11 +13,46 @@ import {
   Alert,
   Toggle,
   Modal,
+  Input,
 } from '@cloudscape-design/components';
 import { RemoteAgent } from '@/types';
 import { apiService } from '@/services/api';
 import AddAgentModal from './AddAgentModal';
 
+function CacheTtlInput({ agent, onCommit }: { agent: RemoteAgent; onCommit: (agentId: string, cacheTtl: number) => void }) {
+  const [value, setValue] = useState(String(agent.cache_ttl ?? 0));
+
+  useEffect(() => {
+    setValue(String(agent.cache_ttl ?? 0));
+  }, [agent.cache_ttl]);
+
+  const commit = () => {
+    const cacheTtl = Number(value);
+    if (value.trim() === '' || !Number.isFinite(cacheTtl) || cacheTtl < 0) {
+      // Reject invalid input and show the current TTL again
+      setValue(String(agent.cache_ttl ?? 0));
+      return;
+    }
+    if (cacheTtl !== (agent.cache_ttl ?? 0)) {
+      onCommit(agent.id, cacheTtl);
+    }
+  };
+
+  return (
+    <Input
+      type="number"
+      inputMode="decimal"
+      value={value}
+      onChange={({ detail }) => setValue(detail.value)}
+      onBlur={commit}
+      onKeyDown={({ detail }) => {
+        if (detail.key === 'Enter') commit();
+      }}
+      ariaLabel={`Result cache TTL in seconds for ${agent.name}, 0 disables caching`}
+    />
+  );
+}
+
 export default function RemoteAgentsTable() {
   const [agents, setAgents] = useState<RemoteAgent[]>([]);
   const [loading, setLoading] = useState(true);
@@ -31,7 +66,7 @@ export default function RemoteAgentsTable() {
   const [preferences, setPreferences] = useState({
     pageSize: 10,
     wrapLines: false,
-    visibleContent: ['id', 'name', 'description', 'url', 'skillName', 'skillDescription', 'enabled'],
+    visibleContent: ['id', 'name', 'description', 'url', 'skillName', 'skillDescription', 'enabled', 'cacheTtl'],
   });
 
   useEffect(() => {
@@ -112,6 +147,31 @@ export default function RemoteAgentsTable() {
     }
   };
 
+  const handleCacheTtlChange = async (agentId: string, cacheTtl: number) => {
+    const previousTtl = agents.find(agent => agent.id === agentId)?.cache_ttl;
+    try {
+      // Update local state immediately for better UX
+      setAgents(prevAgents =>
+        prevAgents.map(agent =>
+          agent.id === agentId ? { ...agent, cache_ttl: cacheTtl } : agent
+        )
+      );
+
+      // Call backend API to update the agent's result cache TTL
+      await apiService.updateAgentCache(agentId, cacheTtl);
+
+    } catch (error) {
+      // Revert the change if API call fails
+      setAgents(prevAgents =>
+        prevAgents.map(agent =>
+          agent.id === agentId ? { ...agent, cache_ttl: previousTtl } : agent
+        )
+      );
+      console.error('Failed to update agent result caching:', error);
+      setError(error instanceof Error ? error.message : 'Failed to update agent result caching');
+    }
+  };
+
   const handleDeleteClick = () => {
     if (selectedItems.length === 0) return;
     setShowDeleteModal(true);
@@ -227,6 +287,14 @@ export default function RemoteAgentsTable() {
       ),
       sortingField: 'enabled',
     },
+    {
+      id: 'cacheTtl',
+      header: 'Result Cache TTL (s)',
+      cell: (item: RemoteAgent) => (
+        <CacheTtlInput agent={item} onCommit={handleCacheTtlChange} />
+      ),
+      sortingField: 'cache_ttl',
+    },
   ];
 
   return (
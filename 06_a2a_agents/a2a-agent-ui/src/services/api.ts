@@ -73,6 +73,25 @@ export class ApiService {
     }
   }
 
+  async updateAgentCache(agentId: string, cacheTtl: number): Promise<any> {
+    try {
+      const response = await fetch(`${this.baseUrl}/update_agent_cache`, {
+        method: 'PUT',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ agent_id: agentId, cache_ttl: cacheTtl }),
+      });
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      return await response.json();
+    } catch (error) {
+      console.error('Failed to update agent result caching:', error);
+      throw error;
+    }
+  }
+
   async previewAgent(request: PreviewAgentRequest): Promise<PreviewAgentResponse> {
     try {
       const response = await fetch(`${this.baseUrl}/preview_agent`, {
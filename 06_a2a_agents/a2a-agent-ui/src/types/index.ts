@@ -11,10 +11,28 @@ export interface RemoteAgent {
   }>;
   status: string;
   enabled: boolean;
+  cache_ttl?: number;
+  health?: {
+    healthy: boolean;
+    consecutive_failures: number;
+    last_error: string | null;
+    last_probe_at: string | null;
+    card_fetch_ms: LatencyPercentiles | null;
+    echo_ms: LatencyPercentiles | null;
+    call_ms: LatencyPercentiles | null;
+  };
+}
+
+export interface LatencyPercentiles {
+  p50: number;
+  p95: number;
+  p99: number;
+  count: number;
 }
 
 export interface AddAgentRequest {
   url: string;
+  cache_ttl?: number;
 }
 
 export interface DeleteAgentRequest {
@@ -23,6 +41,7 @@ export interface DeleteAgentRequest {
 
 export interface InvokeStreamRequest {
   query: string;
+  session_id?: string;
 }
 
 export interface PreviewAgentRequest {
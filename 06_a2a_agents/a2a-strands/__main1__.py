@@ -1,9 +1,9 @@
 import click
+from contextlib import asynccontextmanager
 from doc_agent import DocAgent
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import (
     # AgentAuthentication,
     AgentCapabilities,
@@ -12,23 +12,36 @@ from a2a.types import (
 )
 
 from agent_executor import StrandsAgentExecutor
+from mcp_pool import MCP_SERVERS
+from task_store import SQLiteTaskStore
 
 
 @click.command()
 @click.option("--host", "host", default="localhost")
 @click.option("--port", "port", default=10000)
 def main(host: str, port: int):
+    task_store = SQLiteTaskStore(f"tasks_{port}.db")
+    agent_executor = StrandsAgentExecutor(DocAgent)
     request_handler = DefaultRequestHandler(
-        agent_executor=StrandsAgentExecutor(DocAgent()),
-        task_store=InMemoryTaskStore(),
+        agent_executor=agent_executor,
+        task_store=task_store,
     )
 
     server = A2AStarletteApplication(
         agent_card=get_agent_card(host, port), http_handler=request_handler
     )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with task_store.lifespan(app), DocAgent.sessions.lifespan(app), MCP_SERVERS.lifespan(app):
+            yield
+
+    app = server.build(lifespan=lifespan)
+    app.add_route("/metrics", agent_executor.metrics_endpoint, methods=["GET"])
+    app.add_route("/mcp", MCP_SERVERS.stats_endpoint, methods=["GET"])
     import uvicorn
 
-    uvicorn.run(server.build(), host=host, port=port)
+    uvicorn.run(app, host=host, port=port)
     
 
 def get_agent_card(host: str, port: int):
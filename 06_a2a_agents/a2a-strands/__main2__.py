@@ -3,7 +3,6 @@ from utils_agent import WeatherAgent
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import (
     # AgentAuthentication,
     AgentCapabilities,
@@ -12,23 +11,28 @@ from a2a.types import (
 )
 
 from agent_executor import StrandsAgentExecutor
+from task_store import SQLiteTaskStore
 
 
 @click.command()
 @click.option("--host", "host", default="localhost")
 @click.option("--port", "port", default=10001)
 def main(host: str, port: int):
+    task_store = SQLiteTaskStore(f"tasks_{port}.db")
+    agent_executor = StrandsAgentExecutor(WeatherAgent)
     request_handler = DefaultRequestHandler(
-        agent_executor=StrandsAgentExecutor(WeatherAgent()),
-        task_store=InMemoryTaskStore(),
+        agent_executor=agent_executor,
+        task_store=task_store,
     )
 
     server = A2AStarletteApplication(
         agent_card=get_agent_card(host, port), http_handler=request_handler
     )
+    app = server.build(lifespan=task_store.lifespan)
+    app.add_route("/metrics", agent_executor.metrics_endpoint, methods=["GET"])
     import uvicorn
 
-    uvicorn.run(server.build(), host=host, port=port)
+    uvicorn.run(app, host=host, port=port)
 
 def get_agent_card(host: str, port: int):
     """Returns the Agent Card for the Currency Agent."""
@@ -13,7 +13,7 @@ import traceback
 from strands import tool
 from strands.agent.conversation_manager import SlidingWindowConversationManager
 import asyncio
-import nest_asyncio
+import concurrent.futures
 from dotenv import load_dotenv
 import os
 import base64
@@ -39,6 +39,9 @@ MODEL = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
 httpx_client = None
 a2a_manager = None
 
+# Upper bound for one delegated remote agent call, waited on by a tool thread
+A2A_REMOTE_AGENT_TIMEOUT = float(os.environ.get("A2A_REMOTE_AGENT_TIMEOUT", "120"))
+
 
 public_key = os.environ.get("LANGFUSE_PUBLIC_KEY")
 secret_key = os.environ.get("LANGFUSE_SECRET_KEY")
@@ -96,122 +99,68 @@ def print_json_response(response: Any, description: str) -> None:
         print(f"{response.model_dump(mode='json', exclude_none=True)}\n")
 
 
-def generate_function_2(function_name, desc):
-    """Generate a tool function that properly handles async/sync boundaries."""
-    
-    async def async_dynamic_func(task: str) -> str:
-        """Async implementation of the function."""
-        global a2a_manager
-        if a2a_manager is None:
+def generate_function(function_name, desc, manager=None):
+    """Build a tool that delegates a task to the remote agent function_name."""
+    def remote_agent(task: str) -> str:
+        client_manager = manager or a2a_manager
+        if client_manager is None:
             raise Exception("a2a_manager is None")
-        
-        try:
-            # 直接调用异步方法
-            return await a2a_manager.invoke_remote_agent_streaming(task, function_name)
-        except Exception as e:
-            return f"Error invoking {function_name}: {str(e)}"
-    
-    def dynamic_func(task: str) -> str:
-        """Synchronous wrapper that properly handles the event loop."""
-        import asyncio
-        
-        # 获取当前事件循环或创建新循环
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        # 执行异步函数
-        if loop.is_running():
-            # 如果循环已运行(使用nest_asyncio的场景)
-            return asyncio.run_coroutine_threadsafe(async_dynamic_func(task), loop).result()
-        else:
-            # 标准执行方式
-            return loop.run_until_complete(async_dynamic_func(task))
-    
-    # 设置函数属性
-    dynamic_func.__name__ = function_name
-    dynamic_func.__qualname__ = function_name
-    dynamic_func.__doc__ = desc
-    
-    # 应用工具装饰器
-    decorated_func = tool(dynamic_func)
-    globals()[function_name] = decorated_func
-    
-    return decorated_func
+        return client_manager.invoke_remote_agent_streaming_sync(task, function_name)
 
-
-def generate_function(function_name, desc):
-    code = f"""
-@tool
-def {function_name}(task: str) -> str:
-    \"""{desc}
+    remote_agent.__name__ = function_name
+    remote_agent.__qualname__ = function_name
+    remote_agent.__doc__ = f"""{desc}
     Args:
         task: str, the task message send to remote agent.
     Returns:
         str, the result of the task.
-    \"""
-    from __main__ import a2a_manager
-    if a2a_manager is None:
-        raise Exception("a2a_manager is None")
-    
-    result = a2a_manager.invoke_remote_agent_streaming_sync(task, "{function_name}") 
-    print(f"result:{{result}}")
-    return result
-"""
-    # Execute code, adding function to local namespace
-    local_vars = {}
-    exec(code, {"tool": tool}, local_vars)
-    
-    # Add function to global namespace
-    globals()[function_name] = local_vars[function_name]
-    return local_vars[function_name]
+    """
+    return tool(remote_agent)
 
 
 class LeadAgent:
     def __init__(self,tools:List[Any]):
-        self.messages = []
         self.tools = tools
         self.conversation_manager = SlidingWindowConversationManager(
             window_size=10,  # Maximum number of messages to keep
         )
-    
-    @property
-    def get_agent(self):
-        agent = Agent(model=MODEL,
-                    messages=self.messages,
+        # One agent for the whole conversation, it keeps its own messages
+        self.agent = Agent(model=MODEL,
                     conversation_manager=self.conversation_manager,
                     system_prompt="""You are a coodinator agent, you can communicate with other remote agents to resolve problems.
                     """,
                     tools=self.tools)
-        return agent
+
+    @property
+    def get_agent(self):
+        return self.agent
+
+    @property
+    def messages(self):
+        return self.agent.messages
         
     async def invoke(self, prompt) -> str:
         try:
-            response = self.get_agent(prompt)
-            self.messages = self.get_agent.messages
+            # Off the event loop, which the remote agent tools run their requests on
+            response = await asyncio.to_thread(self.agent, prompt)
             print(colored(response,"blue"),end="",flush=True)
             return response
         except Exception as e:
-            raise f"Error invoking agent: {e}"
+            raise Exception(f"Error invoking agent: {e}")
 
         
     async def stream(self, query: str, session_id: str = None):      
         response = str()
         try:
-            async for event in self.get_agent.stream_async(query):
+            async for event in self.agent.stream_async(query):
                 if "data" in event:
                     # Only stream text chunks to the client
                     response += event["data"]
                     print(colored(event["data"],"blue"),end="",flush=True)
-            self.messages = self.get_agent.messages
 
         except Exception as e:
             print(colored(str(e),"red"),flush=True)
+        return response
 
 AGENT_DESC_TEMPLATE = """
 {description}
@@ -236,10 +185,12 @@ class A2AClientManager:
     
     def __init__(self, agent_urls:List[str]) -> None:
         self.agent_urls = agent_urls
+        # normalized agent name -> A2AClient, sharing one httpx connection pool
         self.a2aclient_pool = {}
         self.agent_cards = []
         self.messages = []
         self.tools = []
+        self.loop = None
         
     def name_normalize(self, name: str) -> str:
         return name.replace(".", "_").replace("-", "_").replace(" ", "_").lower()
@@ -247,17 +198,18 @@ class A2AClientManager:
     async def init_a2aclients(self) -> []:
         """initialize a2a clients from agent urls."""
         global httpx_client
-        httpx_client = get_httpx_client()
+        # Remote agent calls are run on this loop, where the shared httpx client lives
+        self.loop = asyncio.get_running_loop()
+        httpx_client = get_httpx_client(timeout=120)
         for agent_url in self.agent_urls:
             try:
                 agent_card_client = A2ACardResolver(httpx_client=httpx_client,base_url=agent_url)
                 agent_card = await agent_card_client.get_agent_card()
                 print(f"Found agent card: {agent_card}")
                 self.agent_cards.append(agent_card)
-                # a2aclient = await A2AClient.get_client_from_agent_card_url(
-                #     httpx_client, agent_url
-                # )
-                self.a2aclient_pool[self.name_normalize(agent_card.name)] = agent_url
+                self.a2aclient_pool[self.name_normalize(agent_card.name)] = A2AClient(
+                    httpx_client, agent_card=agent_card
+                )
             except Exception as e:
                 print(f"Error initializing A2AClient: {e}")
         # generate tools
@@ -280,41 +232,52 @@ class A2AClientManager:
             function_desc = AGENT_DESC_TEMPLATE.format(description=agent_card.description,
                                                        skills="\n".join(agent_skills))
             print(f"function_desc: {function_desc}")
-            self.tools.append(generate_function(self.name_normalize(agent_card.name), function_desc))
+            self.tools.append(generate_function(self.name_normalize(agent_card.name), function_desc, self))
         return self.tools
     
-    def invoke_remote_agent_streaming_sync(self, query: str, agent_name: str) -> str:
-        """A fully synchronous method to invoke remote agents."""
-        nest_asyncio.apply()
-        return asyncio.run(self.invoke_remote_agent_streaming(query, agent_name))
+    def invoke_remote_agent_streaming_sync(self, query: str, agent_name: str, timeout: float = A2A_REMOTE_AGENT_TIMEOUT) -> str:
+        """Invoke a remote agent from a tool thread, on the loop the clients were initialized on.
+
+        Strands runs tools synchronously on worker threads, so the tool waits for
+        the call on that loop, for at most timeout seconds.
+        """
+        if self.loop is None:
+            raise Exception("a2a clients are not initialized")
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            raise Exception("invoke_remote_agent_streaming_sync would block its own event loop, await invoke_remote_agent_streaming instead")
+        future = asyncio.run_coroutine_threadsafe(
+            self.invoke_remote_agent_streaming(query, agent_name), self.loop
+        )
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise Exception(f"Remote agent {agent_name} did not answer within {timeout}s")
 
         
     async def invoke_remote_agent_streaming(self, query:str, agent_name: str) -> str:
         """a single-turn streaming request to remote agent."""
         send_payload = create_send_message_payload(text=query)
 
-        agent_url = self.a2aclient_pool.get(agent_name)
-        async with httpx.AsyncClient(timeout=120) as httpx_client:
-            a2aclient = await A2AClient.get_client_from_agent_card_url(
-                httpx_client, agent_url
-            )
-            artifact = ""
-            stream_response = a2aclient.send_message_streaming(SendStreamingMessageRequest(params=MessageSendParams(**send_payload)))
-            async for chunk in stream_response:
-                chunk = json.loads(conver_response_to_json_str(chunk))
-                if "final" in chunk["result"] and chunk["result"].get("final") == False:
-                    print(colored(chunk["result"]["status"]["message"]["parts"][0]["text"],"green"),end="",flush=True)
-                elif "artifact" in chunk["result"]:
-                    artifact= chunk["result"]["artifact"]["parts"][0]["text"]
+        a2aclient = self.a2aclient_pool.get(agent_name)
+        if a2aclient is None:
+            return f"Error invoking {agent_name}: unknown agent"
+        artifact = ""
+        stream_response = a2aclient.send_message_streaming(SendStreamingMessageRequest(id=str(uuid4()), params=MessageSendParams(**send_payload)))
+        async for chunk in stream_response:
+            chunk = json.loads(conver_response_to_json_str(chunk))
+            if "final" in chunk["result"] and chunk["result"].get("final") == False:
+                print(colored(chunk["result"]["status"]["message"]["parts"][0]["text"],"green"),end="",flush=True)
+            elif "artifact" in chunk["result"]:
+                artifact= chunk["result"]["artifact"]["parts"][0]["text"]
                 
         return artifact
 
 
-def test_generate_function():
-    tool = generate_function("test_function", "test function description")
-    
-    tool("hello")
-    
 async def main() -> None:
     import time
     global a2a_manager
@@ -337,11 +300,11 @@ async def main() -> None:
     tools = await a2a_manager.init_a2aclients()
 
     # 创建agent
-    lead_agent = LeadAgent(tools=tools).get_agent
+    lead_agent = LeadAgent(tools=tools)
     
     # 测试remote agent
-    lead_agent(user_queries[0])
-    lead_agent(user_queries[1])
+    await lead_agent.stream(user_queries[0])
+    await lead_agent.stream(user_queries[1])
     
     # a2a_manager.invoke_remote_agent_streaming_sync(user_queries[0], "calculator")
 
@@ -1,4 +1,12 @@
 # from agent import StrandAgent
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
 from typing_extensions import override
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
@@ -7,18 +15,120 @@ from a2a.types import (
     TaskArtifactUpdateEvent,
     TaskState,
     TaskStatus,
+    TaskNotCancelableError,
     TaskStatusUpdateEvent,
-    UnsupportedOperationError
 )
 from a2a.utils import new_agent_text_message, new_task, new_text_artifact
 from a2a.utils.errors import ServerError
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Worker pool configuration, shared by every server started from this directory
+A2A_AGENT_WORKERS = int(os.environ.get("A2A_AGENT_WORKERS", "4"))
+A2A_AGENT_MAX_QUEUE = int(os.environ.get("A2A_AGENT_MAX_QUEUE", "16"))
+A2A_AGENT_METRICS_WINDOW = int(os.environ.get("A2A_AGENT_METRICS_WINDOW", "1000"))
+
+# Text tokens are merged into one working status update per window; 0 sends one per token
+A2A_STATUS_COALESCE_MS = float(os.environ.get("A2A_STATUS_COALESCE_MS", "50"))
+A2A_STATUS_COALESCE_BYTES = int(os.environ.get("A2A_STATUS_COALESCE_BYTES", "2048"))
+
+
+TERMINAL_TASK_STATES = (TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected)
+
+
+class AgentPoolFull(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class TaskCanceled(Exception):
+    """Raised inside an agent's event loop thread to stop a canceled task."""
+
+
+def cancellation_callback_handler(cancel_event: threading.Event = None):
+    """Strands callback handler that aborts the agent's event loop once cancel_event is set.
+
+    Strands runs the event loop in its own thread and calls the handler for every
+    streamed chunk, so the loop stops at the next chunk; a tool call that is
+    already running finishes, but its result is never sent back to the model.
+    """
+    def handler(**kwargs):
+        if cancel_event is not None and cancel_event.is_set():
+            raise TaskCanceled()
+    return handler
 
 
 class StrandsAgentExecutor(AgentExecutor):
-    """Currency AgentExecutor Example."""
+    """Runs A2A tasks on a bounded pool of agent instances.
+
+    agent_factory builds one agent per worker, lazily, so concurrent tasks never
+    share an agent's message history. At most `workers` tasks run at once and at
+    most `max_queue` more wait for a free worker; anything beyond that is
+    answered with a rejected task right away instead of piling up.
+
+    Canceling a task publishes its canceled status at once. A queued task gives
+    up its place; a running one has its agent stopped through cancel_event
+    (see cancellation_callback_handler), and its worker is freed as soon as the
+    agent's thread returns.
 
-    def __init__(self,agent):
-        self.agent = agent
+    Streamed text is published as working status updates, each covering the
+    tokens of up to coalesce_window seconds or coalesce_bytes bytes.
+    """
+
+    def __init__(
+        self,
+        agent_factory,
+        workers: int = A2A_AGENT_WORKERS,
+        max_queue: int = A2A_AGENT_MAX_QUEUE,
+        coalesce_window: float = A2A_STATUS_COALESCE_MS / 1000,
+        coalesce_bytes: int = A2A_STATUS_COALESCE_BYTES,
+    ):
+        if not callable(agent_factory):
+            # A ready-made agent instance can only serve one task at a time
+            agent = agent_factory
+            agent_factory = lambda: agent
+            workers = 1
+        self.agent_factory = agent_factory
+        self.workers = workers
+        self.max_queue = max_queue
+        self.coalesce_window = coalesce_window
+        self.coalesce_bytes = coalesce_bytes
+        self._slots = asyncio.Semaphore(workers)
+        self._idle_agents = []
+        self._waiting = 0
+        self._running = 0
+        self._queue_wait_ms = deque(maxlen=A2A_AGENT_METRICS_WINDOW)
+        self._active_tasks = {}
+        self.completed = 0
+        self.rejected = 0
+        self.canceled = 0
+
+    @asynccontextmanager
+    async def _worker(self):
+        """Hold a worker slot and its agent instance for the duration of one task."""
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            raise AgentPoolFull(f"All {self.workers} workers are busy and {self._waiting} tasks are queued")
+        start = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._queue_wait_ms.append((time.perf_counter() - start) * 1000)
+        self._running += 1
+        try:
+            if self._idle_agents:
+                agent = self._idle_agents.pop()
+            else:
+                agent = await asyncio.to_thread(self.agent_factory)
+            try:
+                yield agent
+            finally:
+                self._idle_agents.append(agent)
+        finally:
+            self._running -= 1
+            self._slots.release()
 
     @override
     async def execute(
@@ -36,8 +146,121 @@ class StrandsAgentExecutor(AgentExecutor):
             task = new_task(context.message)
             await event_queue.enqueue_event(task)
 
-        async for event in self.agent.stream(query, task.contextId):
-            if event["is_task_complete"]:
+        entry = {
+            "task": task,
+            "event_queue": event_queue,
+            "cancel_event": threading.Event(),
+            "started": False,
+        }
+        entry["run"] = asyncio.ensure_future(self._run(entry, query))
+        self._active_tasks[task.id] = entry
+        try:
+            # Shielded: the request handler cancels execute() after cancel(), but the
+            # agent's thread can only be stopped cooperatively, so _run() drains it
+            await asyncio.shield(entry["run"])
+        except asyncio.CancelledError:
+            if not entry["cancel_event"].is_set():
+                raise
+
+    async def _run(self, entry, query: str) -> None:
+        task, event_queue, cancel_event = entry["task"], entry["event_queue"], entry["cancel_event"]
+        try:
+            async with self._worker() as agent:
+                entry["started"] = True
+                await self._stream_agent(agent, query, task, event_queue, cancel_event)
+            if not cancel_event.is_set():
+                self.completed += 1
+        except AgentPoolFull as e:
+            self.rejected += 1
+            logger.warning(f"Rejected task {task.id}: {e}")
+            await event_queue.enqueue_event(
+                TaskStatusUpdateEvent(
+                    status=TaskStatus(
+                        state=TaskState.rejected,
+                        message=new_agent_text_message(
+                            "The agent is at capacity, please retry later.",
+                            task.contextId,
+                            task.id,
+                        ),
+                    ),
+                    final=True,
+                    contextId=task.contextId,
+                    taskId=task.id,
+                )
+            )
+        finally:
+            self._active_tasks.pop(task.id, None)
+
+    async def _stream_agent(self, agent, query: str, task, event_queue: EventQueue, cancel_event: threading.Event) -> None:
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        finished = object()
+        tick = object()
+        timer = None
+        buffer = []
+        buffered_bytes = 0
+
+        async def pump_events():
+            try:
+                async for event in agent.stream(query, task.contextId, cancel_event=cancel_event):
+                    events.put_nowait(event)
+            except Exception as e:
+                events.put_nowait(e)
+            finally:
+                events.put_nowait(finished)
+
+        async def flush():
+            nonlocal buffer, buffered_bytes, timer
+            if timer is not None:
+                timer.cancel()
+                timer = None
+            text = "".join(buffer)
+            buffer = []
+            buffered_bytes = 0
+            await event_queue.enqueue_event(
+                TaskStatusUpdateEvent(
+                    status=TaskStatus(
+                        state=TaskState.working,
+                        message=new_agent_text_message(
+                            text,
+                            task.contextId,
+                            task.id,
+                        ),
+                    ),
+                    final=False,
+                    contextId=task.contextId,
+                    taskId=task.id,
+                )
+            )
+
+        pump_task = asyncio.create_task(pump_events())
+        try:
+            while True:
+                event = await events.get()
+                if event is finished:
+                    break
+                if isinstance(event, Exception):
+                    raise event
+                if cancel_event.is_set():
+                    # Canceled: keep draining until the agent's thread stops, publishing nothing
+                    continue
+                if event is tick:
+                    if buffer:
+                        await flush()
+                    continue
+
+                if not event["is_task_complete"]:
+                    buffer.append(event["content"])
+                    buffered_bytes += len(event["content"])
+                    if self.coalesce_window <= 0 or buffered_bytes >= self.coalesce_bytes:
+                        await flush()
+                    elif timer is None:
+                        # One timer per batch, started by its first token
+                        timer = loop.call_later(self.coalesce_window, events.put_nowait, tick)
+                    continue
+
+                if buffer:
+                    await flush()
                 await event_queue.enqueue_event(
                     TaskArtifactUpdateEvent(
                         append=False,
@@ -59,23 +282,69 @@ class StrandsAgentExecutor(AgentExecutor):
                         taskId=task.id,
                     )
                 )
-            else:
-                await event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        status=TaskStatus(
-                            state=TaskState.working,
-                            message=new_agent_text_message(
-                                event["content"],
-                                task.contextId,
-                                task.id,
-                            ),
-                        ),
-                        final=False,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                    )
-                )
+        finally:
+            if timer is not None:
+                timer.cancel()
+            pump_task.cancel()
 
     @override
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
-        raise ServerError(error=UnsupportedOperationError())
+        task = context.current_task
+        entry = self._active_tasks.get(context.task_id)
+        if entry is None:
+            if task and task.status.state in TERMINAL_TASK_STATES:
+                raise ServerError(error=TaskNotCancelableError())
+            # Not running in this process, e.g. left over from before a restart
+            await event_queue.enqueue_event(self._canceled_event(context.task_id, context.context_id))
+            return
+
+        if entry["cancel_event"].is_set():
+            # Already canceled; the canceled status went to the task's queue before this tap
+            await event_queue.enqueue_event(self._canceled_event(context.task_id, context.context_id))
+            return
+        entry["cancel_event"].set()
+        self.canceled += 1
+        if not entry["started"]:
+            entry["run"].cancel()
+        logger.info(f"Canceled task {context.task_id}")
+        # The task's own queue reaches both its stream and the canceling request's tap
+        await entry["event_queue"].enqueue_event(self._canceled_event(context.task_id, context.context_id))
+
+    @staticmethod
+    def _canceled_event(task_id: str, context_id: str) -> TaskStatusUpdateEvent:
+        return TaskStatusUpdateEvent(
+            status=TaskStatus(state=TaskState.canceled),
+            final=True,
+            contextId=context_id,
+            taskId=task_id,
+        )
+
+    def metrics(self) -> dict:
+        """Worker pool occupancy and queue-wait percentiles (ms) over the recent tasks."""
+        waits = sorted(self._queue_wait_ms)
+
+        def nearest_rank(pct: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[max(0, min(len(waits) - 1, round(pct / 100 * len(waits)) - 1))], 3)
+
+        return {
+            "workers": self.workers,
+            "agents": len(self._idle_agents) + self._running,
+            "running": self._running,
+            "queued": self._waiting,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "canceled": self.canceled,
+            "queue_wait_ms": {
+                "p50": nearest_rank(50),
+                "p95": nearest_rank(95),
+                "p99": nearest_rank(99),
+                "max": round(waits[-1], 3) if waits else 0.0,
+                "count": len(waits),
+            },
+        }
+
+    async def metrics_endpoint(self, request: Request) -> JSONResponse:
+        return JSONResponse(self.metrics())
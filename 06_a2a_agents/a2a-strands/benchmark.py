@@ -0,0 +1,179 @@
+"""Micro-benchmarks for the A2A servers in this directory.
+
+Runs offline against synthetic agents, without any model calls, e.g.:
+
+    uv run python benchmark.py status_coalescing --answers 50 --tokens 2000
+    uv run python benchmark.py mcp_startup --agents 8
+"""
+import argparse
+import asyncio
+import json
+import shlex
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+from mcp import StdioServerParameters, stdio_client
+from strands.tools.mcp import MCPClient
+
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Message, MessageSendParams, Part, Role, TextPart
+
+from agent_executor import StrandsAgentExecutor
+from mcp_pool import MCPServerPool
+
+
+# A minimal stdio MCP server, so mcp_startup runs offline
+ECHO_MCP_SERVER = """
+from mcp.server.fastmcp import FastMCP
+mcp = FastMCP("echo", log_level="WARNING")
+
+@mcp.tool()
+def echo(text: str) -> str:
+    return text
+
+mcp.run()
+"""
+
+
+class SyntheticAgent:
+    """Streams a fixed number of short text tokens, shaped like CalcAgent.stream() output."""
+
+    tokens = 2000
+    token_interval = 0.0
+
+    async def stream(self, query: str, session_id: str, cancel_event=None):
+        response = str()
+        for i in range(self.tokens):
+            if self.token_interval:
+                await asyncio.sleep(self.token_interval)
+            else:
+                await asyncio.sleep(0)
+            response += f"token{i} "
+            yield {
+                "is_task_complete": False,
+                "require_user_input": False,
+                "content": f"token{i} ",
+            }
+        yield {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": response,
+        }
+
+
+async def stream_answer(request_handler: DefaultRequestHandler) -> int:
+    """Send one message/stream request and serialize every event as the SSE layer would."""
+    params = MessageSendParams(message=Message(
+        role=Role.user,
+        parts=[Part(root=TextPart(text="ping"))],
+        messageId=uuid4().hex,
+    ))
+    events = 0
+    async for event in request_handler.on_message_send_stream(params):
+        event.model_dump_json(exclude_none=True)
+        events += 1
+    return events
+
+
+async def bench_status_coalescing(args):
+    SyntheticAgent.tokens = args.tokens
+    SyntheticAgent.token_interval = args.token_interval_ms / 1000
+
+    results = []
+    for name, coalesce_window in (("per_token", 0.0), ("coalesced", args.coalesce_ms / 1000)):
+        request_handler = DefaultRequestHandler(
+            agent_executor=StrandsAgentExecutor(
+                SyntheticAgent, workers=args.answers, coalesce_window=coalesce_window
+            ),
+            task_store=InMemoryTaskStore(),
+        )
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        events = await asyncio.gather(*(stream_answer(request_handler) for _ in range(args.answers)))
+        cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+        results.append({
+            "name": name,
+            "answers": args.answers,
+            "tokens_per_answer": args.tokens,
+            "events_per_answer": round(statistics.mean(events), 1),
+            "tokens_per_sec": round(args.answers * args.tokens / wall, 1),
+            "cpu_ms_per_answer": round(cpu * 1000 / args.answers, 3),
+        })
+    return results
+
+
+def bench_mcp_startup_sync(args):
+    if args.mcp_command:
+        command, *command_args = shlex.split(args.mcp_command)
+    else:
+        command, command_args = sys.executable, ["-c", ECHO_MCP_SERVER]
+    transport = lambda: stdio_client(StdioServerParameters(command=command, args=command_args))
+
+    def summarize(name, startup_ms):
+        return {
+            "name": name,
+            "agents": args.agents,
+            "first_agent_ms": round(startup_ms[0], 1),
+            "next_agent_ms_mean": round(statistics.mean(startup_ms[1:]), 3) if len(startup_ms) > 1 else None,
+            "total_ms": round(sum(startup_ms), 1),
+        }
+
+    # Before: every agent starts its own server
+    startup_ms = []
+    clients = []
+    for _ in range(args.agents):
+        start = time.perf_counter()
+        client = MCPClient(transport)
+        client.start()
+        client.list_tools_sync()
+        startup_ms.append((time.perf_counter() - start) * 1000)
+        clients.append(client)
+    for client in clients:
+        client.stop(None, None, None)
+    results = [summarize("per_agent", startup_ms)]
+
+    # After: agents share one server started by the first of them
+    pool = MCPServerPool()
+    pool.register("bench", transport)
+    startup_ms = []
+    for _ in range(args.agents):
+        start = time.perf_counter()
+        pool.tools("bench")
+        startup_ms.append((time.perf_counter() - start) * 1000)
+    results.append(summarize("shared", startup_ms))
+    return results
+
+
+async def bench_mcp_startup(args):
+    return await asyncio.to_thread(bench_mcp_startup_sync, args)
+
+
+BENCHMARKS = {
+    "status_coalescing": bench_status_coalescing,
+    "mcp_startup": bench_mcp_startup,
+}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--answers", type=int, default=50, help="concurrent answers for status_coalescing")
+    parser.add_argument("--tokens", type=int, default=2000, help="tokens per answer for status_coalescing")
+    parser.add_argument("--token-interval-ms", type=float, default=1.0, help="delay between tokens for status_coalescing")
+    parser.add_argument("--coalesce-ms", type=float, default=50.0, help="coalescing window for status_coalescing")
+    parser.add_argument("--agents", type=int, default=8, help="agent instances for mcp_startup")
+    parser.add_argument(
+        "--mcp-command",
+        default=None,
+        help="MCP server command for mcp_startup, e.g. 'uvx awslabs.aws-documentation-mcp-server@latest'; "
+        "defaults to a local echo server",
+    )
+    args = parser.parse_args()
+    results = asyncio.run(BENCHMARKS[args.benchmark](args))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main_cli()
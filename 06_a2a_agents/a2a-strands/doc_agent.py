@@ -1,16 +1,20 @@
 from mcp import StdioServerParameters, stdio_client
 from strands import Agent
-from strands.tools.mcp import MCPClient
 from strands_tools import file_write
 import os
-import json
 import asyncio
-import os
+import threading
+from collections import OrderedDict
+from typing import Optional
 from dotenv import load_dotenv
 load_dotenv()
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
 from strands.models.openai import OpenAIModel
 
+from agent_executor import cancellation_callback_handler
+from mcp_pool import MCP_SERVERS
+from session_store import SessionStore
+
 
 MODEL = "us.amazon.nova-pro-v1:0"
 # MODEL = OpenAIModel(
@@ -25,48 +29,18 @@ MODEL = "us.amazon.nova-pro-v1:0"
 #     }
 # )
 
-class DocAgent:
-    SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
-
-    def __init__(self):
-        self.agent = None
-
-        try:
-            os.makedirs("sessions", exist_ok=True)
-            self.documentation_mcp_server = MCPClient(
-                lambda: stdio_client(
-                    StdioServerParameters(
-                        command="uvx",
-                        args=["awslabs.aws-documentation-mcp-server@latest"],
-                    )
-                )
-            )
-            self.documentation_mcp_server.start()
-            self.tools = self.documentation_mcp_server.list_tools_sync() + [file_write]
-
-        except Exception as e:
-            return f"Error initializing agent: {str(e)}"
-
-    def _load_agent_from_memory(self, session_id: str) -> str:
-        session_path = os.path.join("sessions", f"{session_id}.json")
-        agent = None
-
-        try:
-            if os.path.isfile(session_path):
-                with open(session_path, "r") as f:
-                    state = json.load(f)
-
-                agent = Agent(
-                    model=MODEL,
-                    messages=state["messages"],
-                    system_prompt=state["system_prompt"],
-                    tools=self.tools,
-                    callback_handler=None,
-                )
-            else:
-                agent = Agent(
-                    model="us.amazon.nova-pro-v1:0",
-                    system_prompt="""You are a thorough AWS researcher specialized in finding accurate 
+# Started once per process and shared by every DocAgent
+MCP_SERVERS.register(
+    "aws-documentation",
+    lambda: stdio_client(
+        StdioServerParameters(
+            command="uvx",
+            args=["awslabs.aws-documentation-mcp-server@latest"],
+        )
+    ),
+)
+
+SYSTEM_PROMPT = """You are a thorough AWS researcher specialized in finding accurate 
                     information online. For each question:
                     
                     1. Determine what information you need
@@ -79,23 +53,61 @@ class DocAgent:
                     for the information you find.
                     
                     Finally output your response to a file in current directory.
-                    """,
-                    tools=self.tools,
-                    callback_handler=None,
-                )
-            return agent
+                    """
+
+
+class DocAgent:
+    SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+
+    # Shared by every DocAgent of the server, so any worker can continue a session
+    sessions = SessionStore("sessions")
+
+    def __init__(self):
+        self.agent = None
+        # Agents of recently active sessions, reused across turns
+        self._agents: "OrderedDict[str, Agent]" = OrderedDict()
+
+        try:
+            self.documentation_mcp_server = MCP_SERVERS.get("aws-documentation")
+            self.tools = MCP_SERVERS.tools("aws-documentation") + [file_write]
+
         except Exception as e:
-            raise f"Error Loading agent from memory: {e}"
+            return f"Error initializing agent: {str(e)}"
+
+    async def _load_agent_from_memory(self, session_id: str) -> Agent:
+        return self._session_agent(session_id, await self.sessions.load(session_id))
+
+    def _session_agent(self, session_id: str, session: Optional[dict]) -> Agent:
+        agent = self._agents.get(session_id)
+        if agent is None:
+            agent = Agent(
+                model=MODEL,
+                messages=session["messages"] if session else None,
+                system_prompt=session["system_prompt"] if session else SYSTEM_PROMPT,
+                tools=self.tools,
+                callback_handler=None,
+            )
+            self._agents[session_id] = agent
+            while len(self._agents) > self.sessions.cache_size:
+                self._agents.popitem(last=False)
+        else:
+            self._agents.move_to_end(session_id)
+            if session and (
+                len(agent.messages) != len(session["messages"])
+                or (agent.messages and agent.messages[-1] is not session["messages"][-1])
+            ):
+                # Another worker continued this session since
+                agent.messages = session["messages"]
+        return agent
 
     def _store_agent_into_memory(self, agent: Agent, session_id: str) -> bool:
-        session_path = os.path.join("sessions", f"{session_id}.json")
-        state = {"messages": agent.messages, "system_prompt": agent.system_prompt}
-        with open(session_path, "w") as f:
-            json.dump(state, f)
+        self.sessions.record(session_id, agent.system_prompt, agent.messages)
         return True
 
-    async def stream(self, query: str, session_id: str):
-        agent = self._load_agent_from_memory(session_id=session_id)
+    async def stream(self, query: str, session_id: str, cancel_event: Optional[threading.Event] = None):
+        agent = await self._load_agent_from_memory(session_id=session_id)
+        agent.callback_handler = cancellation_callback_handler(cancel_event)
+        turn_start = len(agent.messages)
         response = str()
         try:
             async for event in agent.stream_async(query):
@@ -115,7 +127,11 @@ class DocAgent:
                 "content": f"We are unable to process your request at the moment. Error: {e}",
             }
         finally:
-            self._store_agent_into_memory(agent, session_id)
+            if cancel_event is not None and cancel_event.is_set():
+                # A canceled turn is left out of the session
+                del agent.messages[turn_start:]
+            else:
+                self._store_agent_into_memory(agent, session_id)
             yield {
                 "is_task_complete": True,
                 "require_user_input": False,
@@ -123,7 +139,7 @@ class DocAgent:
             }
 
     def invoke(self, query: str, session_id: str):
-        agent = self._load_agent_from_memory(session_id=session_id)
+        agent = self._session_agent(session_id, self.sessions.load_sync(session_id))
         try:
             response = str(agent(query))
 
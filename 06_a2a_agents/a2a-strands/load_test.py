@@ -0,0 +1,269 @@
+"""Load generator and latency benchmark for any A2A server.
+
+Runs `--concurrency` clients for `--duration` seconds, optionally paced to a
+total of `--rps` requests per second, and prints throughput, time to first
+chunk, latency percentiles and error rates as JSON, e.g.:
+
+    uv run python load_test.py --url http://localhost:10002 --concurrency 8 --duration 30 --rps 4
+    uv run python load_test.py --stub --concurrency 16 --duration 10 --max-p95-ms 500
+
+`--stub` starts stub_server.py in-process first, so the run needs no model
+access. `--max-p95-ms` and `--max-error-rate` make the command exit with 1
+when they are exceeded, to gate performance regressions.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import traceback
+from uuid import uuid4
+
+import httpx
+from a2a.client import A2ACardResolver, A2AClient, A2AClientHTTPError
+from a2a.types import (
+    JSONRPCErrorResponse,
+    MessageSendParams,
+    SendMessageRequest,
+    SendStreamingMessageRequest,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+
+from test_client import create_send_message_payload
+
+FAILED_TASK_STATES = (TaskState.failed, TaskState.rejected, TaskState.canceled, TaskState.input_required)
+
+
+def percentiles(values: list[float]) -> dict:
+    """Nearest-rank percentiles (ms) of the given samples."""
+    values = sorted(values)
+
+    def nearest_rank(pct: float) -> float | None:
+        if not values:
+            return None
+        return round(values[max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))], 3)
+
+    return {
+        "p50": nearest_rank(50),
+        "p90": nearest_rank(90),
+        "p95": nearest_rank(95),
+        "p99": nearest_rank(99),
+        "max": round(values[-1], 3) if values else None,
+        "mean": round(sum(values) / len(values), 3) if values else None,
+    }
+
+
+def has_text(event) -> bool:
+    if isinstance(event, TaskStatusUpdateEvent):
+        return bool(event.status.message and event.status.message.parts)
+    if isinstance(event, TaskArtifactUpdateEvent):
+        return bool(event.artifact.parts)
+    return False
+
+
+async def send_streaming(client: A2AClient, query: str) -> dict:
+    request = SendStreamingMessageRequest(
+        id=str(uuid4()), params=MessageSendParams(**create_send_message_payload(text=query))
+    )
+    start = time.perf_counter()
+    first_chunk_ms = None
+    state = None
+    async for chunk in client.send_message_streaming(request):
+        if isinstance(chunk.root, JSONRPCErrorResponse):
+            return {"error": f"jsonrpc_{chunk.root.error.code}"}
+        event = chunk.root.result
+        if first_chunk_ms is None and has_text(event):
+            first_chunk_ms = (time.perf_counter() - start) * 1000
+        if isinstance(event, TaskStatusUpdateEvent):
+            state = event.status.state
+        elif isinstance(event, Task):
+            state = event.status.state
+    latency_ms = (time.perf_counter() - start) * 1000
+    if state != TaskState.completed:
+        return {"error": f"task_{state.value}" if state is not None else "incomplete"}
+    return {"first_chunk_ms": first_chunk_ms if first_chunk_ms is not None else latency_ms, "latency_ms": latency_ms}
+
+
+async def send_blocking(client: A2AClient, query: str) -> dict:
+    request = SendMessageRequest(
+        id=str(uuid4()), params=MessageSendParams(**create_send_message_payload(text=query))
+    )
+    start = time.perf_counter()
+    response = await client.send_message(request)
+    latency_ms = (time.perf_counter() - start) * 1000
+    if isinstance(response.root, JSONRPCErrorResponse):
+        return {"error": f"jsonrpc_{response.root.error.code}"}
+    result = response.root.result
+    if isinstance(result, Task) and result.status.state in FAILED_TASK_STATES:
+        return {"error": f"task_{result.status.state.value}"}
+    # Nothing arrives before the whole answer
+    return {"first_chunk_ms": latency_ms, "latency_ms": latency_ms}
+
+
+async def send_one(client: A2AClient, query: str, streaming: bool, timeout: float) -> dict:
+    send = send_streaming if streaming else send_blocking
+    try:
+        # A timeout for the whole request; the client's streaming requests have none
+        return await asyncio.wait_for(send(client, query), timeout=timeout)
+    except asyncio.TimeoutError:
+        return {"error": "timeout"}
+    except A2AClientHTTPError as e:
+        if isinstance(e.__cause__, httpx.TimeoutException):
+            return {"error": "timeout"}
+        return {"error": f"http_{e.status_code}"}
+    except Exception as e:
+        return {"error": type(e).__name__}
+
+
+async def run_load(
+    url: str,
+    concurrency: int,
+    duration: float,
+    rps: float | None,
+    query: str,
+    streaming: bool,
+    timeout: float,
+) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as httpx_client:
+        agent_card = await A2ACardResolver(httpx_client=httpx_client, base_url=url).get_agent_card()
+        client = A2AClient(httpx_client, agent_card=agent_card)
+        streaming = streaming and bool(agent_card.capabilities.streaming)
+
+        results = []
+        late_starts = 0
+        next_slot = 0
+        start = time.perf_counter()
+        deadline = start + duration
+
+        async def worker():
+            nonlocal next_slot, late_starts
+            while True:
+                if rps:
+                    # Open loop: request i is due at start + i / rps, whichever worker is free
+                    due = start + next_slot / rps
+                    next_slot += 1
+                    if due >= deadline:
+                        return
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    elif delay < -0.01:
+                        late_starts += 1
+                elif time.perf_counter() >= deadline:
+                    return
+                results.append(await send_one(client, query, streaming, timeout))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    succeeded = [result for result in results if "error" not in result]
+    errors = {}
+    for result in results:
+        if "error" in result:
+            errors[result["error"]] = errors.get(result["error"], 0) + 1
+    return {
+        "url": url,
+        "agent": agent_card.name,
+        "streaming": streaming,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "target_rps": rps,
+        "requests": len(results),
+        "succeeded": len(succeeded),
+        "throughput_rps": round(len(succeeded) / elapsed, 3) if elapsed else 0.0,
+        "error_rate": round((len(results) - len(succeeded)) / len(results), 4) if results else 0.0,
+        "errors": errors,
+        "late_starts": late_starts,
+        "first_chunk_ms": percentiles([result["first_chunk_ms"] for result in succeeded]),
+        "latency_ms": percentiles([result["latency_ms"] for result in succeeded]),
+    }
+
+
+async def serve_stub(port: int, tokens: int, token_delay_ms: float):
+    """Start stub_server.py's app on this loop; returns its uvicorn server and serving task."""
+    import uvicorn
+    from stub_server import StubAgent, build_app
+
+    StubAgent.tokens = tokens
+    StubAgent.token_delay = token_delay_ms / 1000
+    server = uvicorn.Server(uvicorn.Config(build_app("127.0.0.1", port), host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+            raise RuntimeError(f"Stub server did not start on port {port}")
+        await asyncio.sleep(0.05)
+    return server, serving
+
+
+async def main(args) -> dict:
+    stub = None
+    url = args.url
+    if args.stub:
+        stub = await serve_stub(args.stub_port, args.stub_tokens, args.stub_token_delay_ms)
+        url = f"http://127.0.0.1:{args.stub_port}"
+    try:
+        return await run_load(
+            url,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            rps=args.rps,
+            query=args.query,
+            streaming=not args.no_streaming,
+            timeout=args.timeout,
+        )
+    finally:
+        if stub is not None:
+            server, serving = stub
+            server.should_exit = True
+            await serving
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:10002", help="A2A server to load")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--rps", type=float, default=None, help="total requests per second; unpaced if unset")
+    parser.add_argument("--query", default="what is 2 + 2?", help="message sent with every request")
+    parser.add_argument("--no-streaming", action="store_true", help="use message/send instead of message/stream")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--output", default=None, help="also write the JSON report to this file")
+    parser.add_argument("--stub", action="store_true", help="load a stub-model server started in-process")
+    parser.add_argument("--stub-port", type=int, default=10009)
+    parser.add_argument("--stub-tokens", type=int, default=50, help="tokens per stub answer")
+    parser.add_argument("--stub-token-delay-ms", type=float, default=0.0, help="delay between stub tokens")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="fail if p95 latency exceeds this")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="fail if the error rate exceeds this")
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(main(args))
+    except Exception as e:
+        traceback.print_exc()
+        print(f"An error occurred: {e}", file=sys.stderr)
+        print("Ensure the agent server is running.", file=sys.stderr)
+        sys.exit(2)
+
+    failures = []
+    if args.max_p95_ms is not None and (report["latency_ms"]["p95"] is None or report["latency_ms"]["p95"] > args.max_p95_ms):
+        failures.append(f"p95 latency {report['latency_ms']['p95']} ms exceeds {args.max_p95_ms} ms")
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {report['error_rate']} exceeds {args.max_error_rate}")
+    report["failures"] = failures
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
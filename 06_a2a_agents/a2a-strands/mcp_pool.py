@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from strands.tools.mcp import MCPClient
+from strands.types.exceptions import MCPClientInitializationError
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# MCP server pool configuration, shared by every server started from this directory
+A2A_MCP_HEALTH_INTERVAL = float(os.environ.get("A2A_MCP_HEALTH_INTERVAL", "30"))
+A2A_MCP_HEALTH_TIMEOUT = float(os.environ.get("A2A_MCP_HEALTH_TIMEOUT", "10"))
+
+
+class MCPServerPool:
+    """Starts each registered MCP server once per process and shares its client.
+
+    Agents get the running client and its tool list from get() and tools(); the
+    first call starts the server, later ones return at once, so pre-warming a
+    server at startup takes its cold start off the first request. A health
+    check lists the tools of every started server and restarts the ones that
+    died or stopped answering. A restarted server gets a new client, and the
+    tools handed out earlier are pointed at it, so agents keep working.
+    """
+
+    def __init__(
+        self,
+        health_interval: float = A2A_MCP_HEALTH_INTERVAL,
+        health_timeout: float = A2A_MCP_HEALTH_TIMEOUT,
+    ) -> None:
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._servers = {}
+
+    def register(self, name: str, transport_callable) -> None:
+        """Register an MCP server by name; it is started on first use."""
+        if name in self._servers:
+            return
+        self._servers[name] = {
+            "transport_callable": transport_callable,
+            "client": None,
+            # Whether the client's session may still be running, so stopping it can return
+            "session_alive": False,
+            "lock": threading.Lock(),
+            "started": False,
+            "tools": None,
+            "startup_ms": None,
+            "restarts": 0,
+            "healthy": None,
+            "last_check": None,
+        }
+
+    def get(self, name: str) -> MCPClient:
+        """The running client of a server, started first if needed. Blocks while starting."""
+        server = self._servers[name]
+        if server["started"]:
+            return server["client"]
+        with server["lock"]:
+            if not server["started"]:
+                self._start(name, server)
+        return server["client"]
+
+    def tools(self, name: str) -> list:
+        """The tools of a server, listed once when it started."""
+        self.get(name)
+        return list(self._servers[name]["tools"])
+
+    async def prewarm(self, *names: str) -> None:
+        """Start the given servers, or all registered ones, off the event loop."""
+        names = names or tuple(self._servers)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.get, name) for name in names), return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error starting MCP server {name}: {result}")
+
+    async def check(self, name: str) -> bool:
+        """List the tools of a started server; restart it if that fails or times out."""
+        server = self._servers[name]
+        if not server["started"]:
+            if server["healthy"] is False:
+                # Its last restart failed
+                await asyncio.to_thread(self._restart, name, server)
+            return server["started"]
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(server["client"].list_tools_sync), timeout=self.health_timeout
+            )
+            healthy = True
+        except MCPClientInitializationError as e:
+            # The client reports its session is no longer running
+            logger.warning(f"MCP server {name} failed its health check: {e!r}")
+            server["session_alive"] = False
+            healthy = False
+        except Exception as e:
+            logger.warning(f"MCP server {name} failed its health check: {e!r}")
+            healthy = False
+        server["healthy"] = healthy
+        server["last_check"] = time.time()
+        if not healthy:
+            await asyncio.to_thread(self._restart, name, server)
+        return healthy
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "started": server["started"],
+                "healthy": server["healthy"],
+                "startup_ms": server["startup_ms"],
+                "restarts": server["restarts"],
+                "tools": len(server["tools"] or []),
+                "last_check": server["last_check"],
+            }
+            for name, server in self._servers.items()
+        }
+
+    async def stats_endpoint(self, request: Request) -> JSONResponse:
+        return JSONResponse(self.stats())
+
+    async def close(self) -> None:
+        for name, server in self._servers.items():
+            stopping = self._stop(name, server)
+            if stopping is not None:
+                await asyncio.to_thread(stopping.join, self.health_timeout)
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan that pre-warms every server, health checks them and stops them on shutdown."""
+        tasks = [asyncio.create_task(self.prewarm()), asyncio.create_task(self._check_periodically())]
+        try:
+            yield
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.close()
+
+    async def _check_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for name in list(self._servers):
+                try:
+                    await self.check(name)
+                except Exception as e:
+                    logger.error(f"Error checking MCP server {name}: {e}")
+
+    def _start(self, name: str, server: dict) -> None:
+        start = time.perf_counter()
+        client = MCPClient(server["transport_callable"])
+        client.start()
+        tools = client.list_tools_sync()
+        if server["tools"] is None:
+            server["tools"] = tools
+        else:
+            for tool in server["tools"]:
+                tool.mcp_client = client
+        server["client"] = client
+        server["session_alive"] = True
+        server["startup_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        server["started"] = True
+        server["healthy"] = True
+        logger.info(f"Started MCP server {name} with {len(server['tools'])} tools in {server['startup_ms']} ms")
+
+    def _restart(self, name: str, server: dict) -> None:
+        with server["lock"]:
+            self._stop(name, server)
+            try:
+                self._start(name, server)
+            except Exception as e:
+                # Retried on first use or by the next health check
+                logger.error(f"Error restarting MCP server {name}: {e}")
+                server["healthy"] = False
+                return
+            server["restarts"] += 1
+
+    def _stop(self, name: str, server: dict) -> threading.Thread | None:
+        server["started"] = False
+        client = server["client"]
+        if client is None or not server["session_alive"]:
+            # Stopping a client whose session already ended, or a stopped one, would wait forever
+            return None
+        server["session_alive"] = False
+
+        def stop():
+            try:
+                client.stop(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error stopping MCP server {name}: {e}")
+
+        # A server that stopped answering may never shut down; don't wait for it
+        thread = threading.Thread(target=stop, daemon=True)
+        thread.start()
+        return thread
+
+
+# Shared by every agent of the process
+MCP_SERVERS = MCPServerPool()
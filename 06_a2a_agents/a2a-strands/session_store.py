@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# Session store configuration, shared by every server started from this directory
+A2A_SESSION_CACHE_SIZE = int(os.environ.get("A2A_SESSION_CACHE_SIZE", "128"))
+A2A_SESSION_FLUSH_MS = float(os.environ.get("A2A_SESSION_FLUSH_MS", "500"))
+
+
+class SessionStore:
+    """Conversation history of agent sessions, kept in `<directory>/<session_id>.jsonl`.
+
+    The first line of a session file holds the system prompt and every further
+    line one message, so a turn only appends its new messages. A file is
+    rewritten only when the agent changed earlier messages, e.g. when its
+    conversation manager dropped the oldest ones or truncated a tool result. Writes are batched and done
+    off the event loop every flush_interval seconds; the most recently used
+    sessions are kept in memory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        cache_size: int = A2A_SESSION_CACHE_SIZE,
+        flush_interval: float = A2A_SESSION_FLUSH_MS / 1000,
+    ) -> None:
+        self.directory = directory
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+        # session_id -> {"system_prompt", "messages", "lines"}, the messages as last
+        # recorded and their serialized lines
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        # session_id -> {"rewrite": bool, "system_prompt", "lines"} not yet on disk
+        self._pending = {}
+        self._write_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flusher = None
+
+    async def load(self, session_id: str) -> dict | None:
+        """The session's system prompt and messages, or None for a new session."""
+        session = self._cache.get(session_id)
+        if session is None:
+            session = await asyncio.to_thread(self._read, session_id)
+            if session is None:
+                return None
+            self._remember(session_id, session)
+        else:
+            self._cache.move_to_end(session_id)
+        return {"system_prompt": session["system_prompt"], "messages": list(session["messages"])}
+
+    def load_sync(self, session_id: str) -> dict | None:
+        """Blocking variant of load() for callers without an event loop."""
+        session = self._cache.get(session_id)
+        if session is None:
+            session = self._read(session_id)
+            if session is None:
+                return None
+            self._remember(session_id, session)
+        return {"system_prompt": session["system_prompt"], "messages": list(session["messages"])}
+
+    def record(self, session_id: str, system_prompt: str, messages: list) -> None:
+        """Record the session's messages after a turn; only new messages are written."""
+        try:
+            lines = [json.dumps(message) + "\n" for message in messages]
+        except (TypeError, ValueError) as e:
+            logger.error(f"Error recording session {session_id}: {e}")
+            return
+        known = self._cache.get(session_id)
+        rewrite = (
+            known is None
+            or known.get("legacy", False)
+            or known["system_prompt"] != system_prompt
+            # Compared by content, so messages changed in place are caught too,
+            # e.g. tool results truncated by the conversation manager
+            or lines[:len(known["lines"])] != known["lines"]
+        )
+        new_lines = lines if rewrite else lines[len(known["lines"]):]
+        self._remember(session_id, {"system_prompt": system_prompt, "messages": list(messages), "lines": lines})
+
+        pending = self._pending.get(session_id)
+        if rewrite or pending is None:
+            self._pending[session_id] = {
+                "rewrite": rewrite,
+                "system_prompt": system_prompt,
+                "lines": list(new_lines),
+            }
+        else:
+            pending["lines"].extend(new_lines)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_sync()
+            return
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Write every pending session update in order, off the event loop."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            await asyncio.to_thread(self._write, pending)
+        self._evict()
+
+    def flush_sync(self) -> None:
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            self._write(pending)
+        self._evict()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+        await self.flush()
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan that writes pending updates on shutdown."""
+        try:
+            yield
+        finally:
+            await self.close()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def _remember(self, session_id: str, session: dict) -> None:
+        self._cache[session_id] = session
+        self._cache.move_to_end(session_id)
+        self._evict()
+
+    def _evict(self) -> None:
+        # Sessions with unwritten updates stay until the next flush
+        for cached_id in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if cached_id not in self._pending:
+                del self._cache[cached_id]
+
+    def _path(self, session_id: str, suffix: str = ".jsonl") -> str:
+        return os.path.join(self.directory, f"{session_id}{suffix}")
+
+    def _read(self, session_id: str) -> dict | None:
+        path = self._path(session_id)
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                lines = [line for line in f if line.strip()]
+            if not lines:
+                return None
+            messages = []
+            for line in lines[1:]:
+                try:
+                    messages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A write interrupted mid-line loses that message only
+                    logger.warning(f"Skipping unreadable message in {path}")
+            return {
+                "system_prompt": json.loads(lines[0])["system_prompt"],
+                "messages": messages,
+                "lines": [json.dumps(message) + "\n" for message in messages],
+            }
+
+        legacy_path = self._path(session_id, ".json")
+        if os.path.isfile(legacy_path):
+            # Whole-file sessions from earlier versions are converted on the next write
+            with open(legacy_path, "r") as f:
+                state = json.load(f)
+            return {
+                "system_prompt": state["system_prompt"],
+                "messages": state["messages"],
+                "lines": [json.dumps(message) + "\n" for message in state["messages"]],
+                "legacy": True,
+            }
+        return None
+
+    def _write(self, pending: dict) -> None:
+        with self._write_lock:
+            for session_id, update in pending.items():
+                try:
+                    lines = update["lines"]
+                    path = self._path(session_id)
+                    if update["rewrite"]:
+                        tmp_path = path + ".tmp"
+                        with open(tmp_path, "w") as f:
+                            f.write(json.dumps({"system_prompt": update["system_prompt"]}) + "\n")
+                            f.writelines(lines)
+                        os.replace(tmp_path, path)
+                        legacy_path = self._path(session_id, ".json")
+                        if os.path.isfile(legacy_path):
+                            os.remove(legacy_path)
+                    elif lines:
+                        with open(path, "a") as f:
+                            f.writelines(lines)
+                except Exception as e:
+                    logger.error(f"Error writing session {session_id}: {e}")
@@ -0,0 +1,182 @@
+"""An A2A server whose agent runs on a stub model, for offline load tests.
+
+The agent goes through the same Strands event loop, executor and task store
+as the real servers, but its model streams canned tokens instead of calling
+Bedrock, so results only depend on this code.
+"""
+import enum
+import threading
+import time
+import types
+import typing
+from typing import Optional
+
+import click
+from pydantic import BaseModel
+from strands import Agent
+from strands.types.models import Model
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+)
+
+from agent_executor import StrandsAgentExecutor, cancellation_callback_handler
+from task_store import SQLiteTaskStore
+
+
+class StubModel(Model):
+    """Streams `tokens` text tokens, `token_delay` seconds apart, for any request."""
+
+    def __init__(self, tokens: int = 50, token_delay: float = 0.0) -> None:
+        self.config = {"tokens": tokens, "token_delay": token_delay}
+
+    def update_config(self, **model_config) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> dict:
+        return self.config
+
+    def structured_output(self, output_model, prompt, callback_handler=None):
+        """A canned instance of output_model: defaults where set, placeholder values otherwise."""
+        return _canned_instance(output_model)
+
+    def format_request(self, messages, tool_specs=None, system_prompt=None) -> dict:
+        return {"messages": messages}
+
+    def format_chunk(self, event: dict) -> dict:
+        return event
+
+    def stream(self, request: dict):
+        yield {"messageStart": {"role": "assistant"}}
+        for i in range(self.config["tokens"]):
+            if self.config["token_delay"]:
+                time.sleep(self.config["token_delay"])
+            yield {"contentBlockDelta": {"delta": {"text": f"token{i} "}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+
+def _canned_value(annotation):
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is types.UnionType:
+        # Optional[X] and other unions: the first non-None member
+        return _canned_value(next(arg for arg in typing.get_args(annotation) if arg is not type(None)))
+    if origin is typing.Literal:
+        return typing.get_args(annotation)[0]
+    annotation = origin or annotation
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _canned_instance(annotation)
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return next(iter(annotation))
+    for kind, value in ((bool, False), (int, 0), (float, 0.0), (str, "stub"), (list, []), (dict, {}), (tuple, ()), (set, set())):
+        if isinstance(annotation, type) and issubclass(annotation, kind):
+            return value
+    return None
+
+
+def _canned_instance(output_model):
+    values = {
+        name: _canned_value(field.annotation)
+        for name, field in output_model.model_fields.items()
+        if field.is_required()
+    }
+    return output_model(**values)
+
+
+class StubAgent:
+    SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+
+    tokens = 50
+    token_delay = 0.0
+
+    def __init__(self):
+        self.agent = Agent(
+            model=StubModel(self.tokens, self.token_delay),
+            callback_handler=None,
+        )
+
+    async def stream(self, query: str, session_id: str, cancel_event: Optional[threading.Event] = None):
+        response = str()
+        # Every task starts from an empty history, so results don't drift over a run
+        self.agent.messages.clear()
+        self.agent.callback_handler = cancellation_callback_handler(cancel_event)
+        try:
+            async for event in self.agent.stream_async(query):
+                if "data" in event:
+                    response += event["data"]
+                    yield {
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": event["data"],
+                    }
+        except Exception as e:
+            yield {
+                "is_task_complete": False,
+                "require_user_input": True,
+                "content": f"We are unable to process your request at the moment. Error: {e}",
+            }
+        finally:
+            yield {
+                "is_task_complete": True,
+                "require_user_input": False,
+                "content": response,
+            }
+
+
+def build_app(host: str, port: int, task_db: str = ":memory:"):
+    task_store = SQLiteTaskStore(task_db)
+    agent_executor = StrandsAgentExecutor(StubAgent)
+    request_handler = DefaultRequestHandler(
+        agent_executor=agent_executor,
+        task_store=task_store,
+    )
+    server = A2AStarletteApplication(
+        agent_card=get_agent_card(host, port), http_handler=request_handler
+    )
+    app = server.build(lifespan=task_store.lifespan)
+    app.add_route("/metrics", agent_executor.metrics_endpoint, methods=["GET"])
+    return app
+
+
+@click.command()
+@click.option("--host", "host", default="localhost")
+@click.option("--port", "port", default=10009)
+@click.option("--tokens", "tokens", default=50, help="Tokens streamed per answer")
+@click.option("--token-delay-ms", "token_delay_ms", default=0.0, help="Delay between tokens")
+@click.option("--task-db", "task_db", default=":memory:", help="SQLite task store file")
+def main(host: str, port: int, tokens: int, token_delay_ms: float, task_db: str):
+    StubAgent.tokens = tokens
+    StubAgent.token_delay = token_delay_ms / 1000
+    import uvicorn
+
+    uvicorn.run(build_app(host, port, task_db), host=host, port=port, log_level="warning")
+
+
+def get_agent_card(host: str, port: int):
+    """Returns the Agent Card for the stub agent."""
+    capabilities = AgentCapabilities(streaming=True, pushNotifications=False)
+    skill = AgentSkill(
+        id="stub_answer",
+        name="Stub answer",
+        description="Streams a canned answer without calling a model.",
+        tags=["stub", "load test"],
+        examples=["ping"],
+    )
+    return AgentCard(
+        name="Stub Agent",
+        description="Answers every request with canned tokens, for load tests.",
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        defaultInputModes=StubAgent.SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=StubAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+
+if __name__ == "__main__":
+    main()
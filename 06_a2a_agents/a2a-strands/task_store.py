@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+from typing_extensions import override
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Role, Task
+
+from agent_executor import TERMINAL_TASK_STATES
+
+logger = logging.getLogger(__name__)
+
+# Task store configuration, shared by every server started from this directory
+A2A_TASK_CACHE_SIZE = int(os.environ.get("A2A_TASK_CACHE_SIZE", "256"))
+A2A_TASK_FLUSH_MS = float(os.environ.get("A2A_TASK_FLUSH_MS", "200"))
+A2A_TASK_HISTORY_LIMIT = int(os.environ.get("A2A_TASK_HISTORY_LIMIT", "20"))
+A2A_TASK_RETENTION = float(os.environ.get("A2A_TASK_RETENTION", str(7 * 24 * 3600)))
+A2A_TASK_COMPACT_INTERVAL = float(os.environ.get("A2A_TASK_COMPACT_INTERVAL", "600"))
+
+
+class SQLiteTaskStore(TaskStore):
+    """TaskStore backed by a local SQLite file, indexed by task id and context id.
+
+    Recently used tasks are kept in a bounded LRU. Updates are written behind in
+    one transaction every flush_interval seconds, and a task is written through
+    as soon as it reaches a terminal state. Terminal tasks keep their user
+    messages and only the last history_limit agent messages; compact() deletes
+    them retention seconds after their last update.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            context_id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            task TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_context_id ON tasks (context_id, updated_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at);
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = A2A_TASK_CACHE_SIZE,
+        flush_interval: float = A2A_TASK_FLUSH_MS / 1000,
+        history_limit: int = A2A_TASK_HISTORY_LIMIT,
+        retention: float = A2A_TASK_RETENTION,
+        compact_interval: float = A2A_TASK_COMPACT_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.history_limit = history_limit
+        self.retention = retention
+        self.compact_interval = compact_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._db_lock = threading.Lock()
+        self._cache: "OrderedDict[str, Task]" = OrderedDict()
+        self._dirty = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher = None
+        self._last_compaction = time.monotonic()
+
+    @override
+    async def save(self, task: Task) -> None:
+        terminal = task.status.state in TERMINAL_TASK_STATES
+        if terminal and self.history_limit and task.history and len(task.history) > self.history_limit:
+            # Streamed chunks are in the artifact already; keep only the recent ones
+            keep_from = len(task.history) - self.history_limit
+            history = [
+                message for i, message in enumerate(task.history)
+                if i >= keep_from or message.role == Role.user
+            ]
+            task = task.model_copy(update={"history": history})
+        self._remember(task)
+        self._dirty[task.id] = task
+        if terminal:
+            await self.flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    @override
+    async def get(self, task_id: str) -> Task | None:
+        task = self._cache.get(task_id)
+        if task is not None:
+            self._cache.move_to_end(task_id)
+            return task
+        row = await asyncio.to_thread(self._fetch_one, "SELECT task FROM tasks WHERE id = ?", (task_id,))
+        if row is None:
+            return None
+        task = Task.model_validate_json(row[0])
+        self._remember(task)
+        return task
+
+    @override
+    async def delete(self, task_id: str) -> None:
+        self._cache.pop(task_id, None)
+        self._dirty.pop(task_id, None)
+        # Waits for a running flush, which could otherwise write the task back
+        async with self._flush_lock:
+            self._dirty.pop(task_id, None)
+            await asyncio.to_thread(self._execute, "DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    async def list_by_context(self, context_id: str) -> list[Task]:
+        """Tasks of one conversation, oldest first, e.g. to resume it after a restart."""
+        await self.flush()
+        rows = await asyncio.to_thread(
+            self._fetch_all,
+            "SELECT task FROM tasks WHERE context_id = ? ORDER BY updated_at",
+            (context_id,),
+        )
+        return [Task.model_validate_json(row[0]) for row in rows]
+
+    async def flush(self) -> None:
+        """Write every pending update in one transaction."""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, {}
+            now = time.time()
+            rows = [
+                (task.id, task.contextId, task.status.state.value, now, task.model_dump_json(exclude_none=True))
+                for task in dirty.values()
+            ]
+            await asyncio.to_thread(self._write, rows)
+        self._evict()
+        if time.monotonic() - self._last_compaction >= self.compact_interval:
+            self._last_compaction = time.monotonic()
+            deleted = await self.compact()
+            if deleted:
+                logger.info(f"Deleted {deleted} task(s) older than the retention period")
+
+    async def compact(self) -> int:
+        """Delete terminal tasks whose last update is older than the retention period."""
+        task_ids = await asyncio.to_thread(self._delete_expired)
+        for task_id in task_ids:
+            if task_id not in self._dirty:
+                self._cache.pop(task_id, None)
+        return len(task_ids)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+        await self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan that writes pending updates on shutdown."""
+        try:
+            yield
+        finally:
+            await self.close()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def _remember(self, task: Task) -> None:
+        self._cache[task.id] = task
+        self._cache.move_to_end(task.id)
+        self._evict()
+
+    def _evict(self) -> None:
+        # Tasks with unwritten updates stay until the next flush
+        for task_id in list(self._cache):
+            if len(self._cache) <= self.cache_size:
+                break
+            if task_id not in self._dirty:
+                del self._cache[task_id]
+
+    def _write(self, rows) -> None:
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tasks (id, context_id, state, updated_at, task) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _delete_expired(self) -> list[str]:
+        states = [state.value for state in TERMINAL_TASK_STATES]
+        with self._db_lock, self._conn:
+            rows = self._conn.execute(
+                f"DELETE FROM tasks WHERE updated_at < ? AND state IN ({', '.join('?' for _ in states)}) RETURNING id",
+                (time.time() - self.retention, *states),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _execute(self, sql: str, params) -> None:
+        with self._db_lock, self._conn:
+            self._conn.execute(sql, params)
+
+    def _fetch_one(self, sql: str, params):
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _fetch_all(self, sql: str, params):
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
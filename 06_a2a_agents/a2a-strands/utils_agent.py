@@ -1,9 +1,13 @@
 from strands import Agent
 from strands_tools import calculator,current_time,http_request,shell
 import asyncio
+import threading
+from typing import Optional
 from strands.models import BedrockModel
 import os
 
+from agent_executor import cancellation_callback_handler
+
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
 
 from dotenv import load_dotenv
@@ -40,8 +44,10 @@ class CalcAgent:
                     callback_handler=None,
                 )        
         
-    async def stream(self, query: str, session_id: str):      
+    async def stream(self, query: str, session_id: str, cancel_event: Optional[threading.Event] = None):      
         response = str()
+        history_length = len(self.agent.messages)
+        self.agent.callback_handler = cancellation_callback_handler(cancel_event)
         try:
             async for event in self.agent.stream_async(query):
                 if "data" in event:
@@ -54,6 +60,9 @@ class CalcAgent:
                     }
 
         except Exception as e:
+            if cancel_event is not None and cancel_event.is_set():
+                # Drop the unfinished turn so the next task starts from a consistent history
+                del self.agent.messages[history_length:]
             yield {
                 "is_task_complete": False,
                 "require_user_input": True,
@@ -97,8 +106,10 @@ class WeatherAgent:
                     callback_handler=None,
                 )        
         
-    async def stream(self, query: str, session_id: str):      
+    async def stream(self, query: str, session_id: str, cancel_event: Optional[threading.Event] = None):      
         response = str()
+        history_length = len(self.agent.messages)
+        self.agent.callback_handler = cancellation_callback_handler(cancel_event)
         try:
             async for event in self.agent.stream_async(query):
                 if "data" in event:
@@ -111,6 +122,9 @@ class WeatherAgent:
                     }
 
         except Exception as e:
+            if cancel_event is not None and cancel_event.is_set():
+                # Drop the unfinished turn so the next task starts from a consistent history
+                del self.agent.messages[history_length:]
             yield {
                 "is_task_complete": False,
                 "require_user_input": True,
@@ -35,28 +35,12 @@ else:
 # 导入重构的模块
 from unity_agent import UnityAgent
 
-# Configure detailed logging for debugging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),  # Console output
-        # Unity will capture this via Python.NET
-    ]
-)
-
-# Enable verbose logging for all related modules
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-
-# Enable Strands SDK logging
-strands_logger = logging.getLogger("strands")
-strands_logger.setLevel(logging.DEBUG)
+# 按档位配置日志（环境变量UNITY_AGENT_LOG_PROFILE: debug/development/production，
+# UNITY_AGENT_LOG_FORMAT: text/json）；debug档位下本模块、Strands SDK和HTTP库都输出DEBUG日志
+from logging_config import configure_logging
+configure_logging()
 
-# Enable HTTP/network logging
-logging.getLogger("urllib3").setLevel(logging.DEBUG)
-logging.getLogger("botocore").setLevel(logging.DEBUG)
-logging.getLogger("boto3").setLevel(logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 # Global agent instance
 _agent_instance: Optional[UnityAgent] = None
@@ -0,0 +1,104 @@
+"""
+Unity日志配置模块
+按运行环境选择日志档位，支持结构化(JSON)日志输出和流式chunk日志采样
+"""
+
+import json
+import logging
+import os
+import time
+
+
+# 日志档位：
+#   debug       - 全部DEBUG，每个chunk都记录（默认，便于开发调试）
+#   development - 本项目INFO、第三方库WARNING，每50个chunk记录一次
+#   production  - 只记录WARNING及以上，不记录单个chunk
+LOG_PROFILES = {
+    'debug': {'level': logging.DEBUG, 'library_level': logging.DEBUG, 'chunk_log_every': 1},
+    'development': {'level': logging.INFO, 'library_level': logging.WARNING, 'chunk_log_every': 50},
+    'production': {'level': logging.WARNING, 'library_level': logging.WARNING, 'chunk_log_every': 0},
+}
+
+# 日志量大的第三方库
+LIBRARY_LOGGERS = ('strands', 'urllib3', 'botocore', 'boto3')
+
+LOG_PROFILE = os.environ.get('UNITY_AGENT_LOG_PROFILE', 'debug').lower()
+# text 或 json
+LOG_FORMAT = os.environ.get('UNITY_AGENT_LOG_FORMAT', 'text').lower()
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord自带的属性，其余属性视为通过extra传入的结构化字段
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def _profile_settings(profile: str) -> dict:
+    settings = dict(LOG_PROFILES.get(profile, LOG_PROFILES['debug']))
+    chunk_log_every = os.environ.get('UNITY_AGENT_CHUNK_LOG_EVERY')
+    if chunk_log_every is not None:
+        try:
+            settings['chunk_log_every'] = int(chunk_log_every)
+        except ValueError:
+            print(f"[Python] ⚠️ 无效的UNITY_AGENT_CHUNK_LOG_EVERY: {chunk_log_every}，使用档位默认值{settings['chunk_log_every']}")
+    return settings
+
+
+# 每隔多少个chunk记录一次单个chunk的日志，0表示不记录
+CHUNK_LOG_EVERY = _profile_settings(LOG_PROFILE)['chunk_log_every']
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行JSON，extra传入的字段作为独立的键"""
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(profile: str = None, log_format: str = None) -> dict:
+    """
+    按档位配置根日志和第三方库日志
+
+    参数:
+        profile: 日志档位，默认取环境变量UNITY_AGENT_LOG_PROFILE
+        log_format: text或json，默认取环境变量UNITY_AGENT_LOG_FORMAT
+
+    返回:
+        生效的档位设置
+    """
+    global CHUNK_LOG_EVERY
+
+    profile = (profile or LOG_PROFILE).lower()
+    if profile not in LOG_PROFILES:
+        print(f"[Python] ⚠️ 未知日志档位 {profile}，使用debug")
+        profile = 'debug'
+    settings = _profile_settings(profile)
+
+    handler = logging.StreamHandler()  # Unity通过Python.NET捕获控制台输出
+    if (log_format or LOG_FORMAT).lower() == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=settings['level'], handlers=[handler])
+    logging.getLogger().setLevel(settings['level'])
+
+    for name in LIBRARY_LOGGERS:
+        logging.getLogger(name).setLevel(settings['library_level'])
+
+    CHUNK_LOG_EVERY = settings['chunk_log_every']
+    return {'profile': profile, **settings}
+
+
+def should_log_chunk(chunk_count: int) -> bool:
+    """当前档位下是否记录第chunk_count个chunk的日志"""
+    return CHUNK_LOG_EVERY > 0 and (chunk_count == 1 or chunk_count % CHUNK_LOG_EVERY == 0)
@@ -8,7 +8,7 @@ import subprocess
 import threading
 import logging
 from datetime import timedelta
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 import weakref
 
 # 获取日志记录器
@@ -28,19 +28,75 @@ class MCPClientInitializationError(Exception):
     pass
 
 
+class MCPRuntime:
+    """所有MCP客户端共享的后台事件循环，在一个线程中承载全部服务器会话"""
+    
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+    
+    def get_loop(self):
+        """返回运行中的事件循环，首次调用时启动后台线程"""
+        if self.loop is not None and self.thread.is_alive():
+            return self.loop
+        with self._lock:
+            if self.loop is None or not self.thread.is_alive():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+                
+                self.thread = threading.Thread(target=run_loop, name="mcp-runtime", daemon=True)
+                self.thread.start()
+                ready.wait()
+                self.loop = loop
+        return self.loop
+    
+    def submit(self, coro) -> Future:
+        """把协程提交到共享事件循环，返回concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.get_loop())
+    
+    def run(self, coro, timeout=None):
+        """在共享事件循环上运行协程并等待结果（一次跨线程切换）"""
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("不能在MCP运行时线程中同步等待MCP调用")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+
+# 全局MCP运行时实例
+_mcp_runtime = MCPRuntime()
+
+def get_mcp_runtime() -> MCPRuntime:
+    """获取全局MCP运行时实例"""
+    return _mcp_runtime
+
+
 class MCPClient:
-    """基于strands实现的MCP客户端，支持stdio、http和sse传输"""
+    """基于strands实现的MCP客户端，支持stdio、http和sse传输
+    
+    所有客户端的会话都运行在共享的MCPRuntime事件循环上，不再各自创建线程和事件循环
+    """
     
     def __init__(self, client_factory, timeout_seconds=30):
         self.client_factory = client_factory
         self.timeout_seconds = timeout_seconds
         self.client = None
-        self.background_thread = None
+        self.runtime = get_mcp_runtime()
         self.loop = None
-        self.executor = ThreadPoolExecutor(max_workers=1)
         self._started = False
         self._subprocess = None  # 存储subprocess引用用于清理
-        self._client_context = None  # 存储异步上下文管理器
+        self._session = None  # 会话任务的Future
+        self._stop_event = None  # 通知会话任务退出
     
     def __enter__(self):
         self.start()
@@ -50,59 +106,43 @@ class MCPClient:
         self.stop()
         return False  # 允许异常传播
     
+    async def _run_session(self, ready: Future):
+        """会话任务：进入客户端上下文，等待停止信号后在同一任务中退出上下文"""
+        self._stop_event = asyncio.Event()
+        try:
+            async with self.client_factory() as client:
+                self.client = client
+                # 如果客户端有subprocess引用，保存它
+                if hasattr(client, '_subprocess'):
+                    self._subprocess = client._subprocess
+                elif hasattr(client, 'process'):
+                    self._subprocess = client.process
+                ready.set_result(client)
+                await self._stop_event.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP会话异常结束: {e}")
+        finally:
+            self._started = False
+    
     def start(self):
         """启动MCP客户端连接"""
         if self._started:
             return
         
         try:
-            # 在后台线程中启动异步客户端
-            future = Future()
-            
-            def background_worker():
-                try:
-                    self.loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(self.loop)
-                    
-                    async def init_client():
-                        # 对于异步上下文管理器，使用 async with
-                        client_context = self.client_factory()
-                        self.client = await client_context.__aenter__()
-                        # 保存上下文管理器以便后续清理
-                        self._client_context = client_context
-                        # 如果客户端有subprocess引用，保存它
-                        if hasattr(self.client, '_subprocess'):
-                            self._subprocess = self.client._subprocess
-                        elif hasattr(self.client, 'process'):
-                            self._subprocess = self.client.process
-                        return self.client
-                    
-                    client = self.loop.run_until_complete(init_client())
-                    future.set_result(client)
-                    
-                    # 保持事件循环运行
-                    self.loop.run_forever()
-                except Exception as e:
-                    future.set_exception(e)
-                finally:
-                    # 确保事件循环正确关闭
-                    try:
-                        if self.loop and not self.loop.is_closed():
-                            # 取消所有挂起的任务
-                            pending = asyncio.all_tasks(self.loop)
-                            for task in pending:
-                                task.cancel()
-                            if pending:
-                                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-                            self.loop.close()
-                    except Exception as e:
-                        logger.warning(f"关闭事件循环时出错: {e}")
-            
-            self.background_thread = threading.Thread(target=background_worker, daemon=True)
-            self.background_thread.start()
+            ready = Future()
+            self.loop = self.runtime.get_loop()
+            self._session = self.runtime.submit(self._run_session(ready))
             
             # 等待初始化完成
-            self.client = future.result(timeout=self.timeout_seconds)
+            try:
+                self.client = ready.result(timeout=self.timeout_seconds)
+            except BaseException:
+                self._session.cancel()
+                raise
             self._started = True
             
         except Exception as e:
@@ -114,29 +154,16 @@ class MCPClient:
             return
         
         try:
-            # 1. 关闭异步上下文管理器
-            if hasattr(self, '_client_context') and self._client_context:
+            # 1. 通知会话任务退出客户端上下文
+            if self._session and not self._session.done():
                 try:
-                    if self.loop and not self.loop.is_closed():
-                        async def cleanup_context():
-                            await self._client_context.__aexit__(None, None, None)
-                        asyncio.run_coroutine_threadsafe(cleanup_context(), self.loop).result(timeout=3)
+                    self.loop.call_soon_threadsafe(self._stop_event.set)
+                    self._session.result(timeout=3)
                 except Exception as e:
                     logger.warning(f"关闭MCP上下文管理器时出错: {e}")
+                    self._session.cancel()
             
-            # 2. 关闭MCP客户端连接
-            if self.client:
-                try:
-                    if hasattr(self.client, 'close'):
-                        if asyncio.iscoroutinefunction(self.client.close):
-                            if self.loop and not self.loop.is_closed():
-                                asyncio.run_coroutine_threadsafe(self.client.close(), self.loop)
-                        else:
-                            self.client.close()
-                except Exception as e:
-                    logger.warning(f"关闭MCP客户端时出错: {e}")
-            
-            # 3. 关闭subprocess（如果存在）
+            # 2. 关闭subprocess（如果存在）
             if self._subprocess:
                 try:
                     if self._subprocess.poll() is None:  # 进程仍在运行
@@ -160,25 +187,38 @@ class MCPClient:
                 finally:
                     self._subprocess = None
             
-            # 4. 停止事件循环
-            if self.loop and not self.loop.is_closed():
-                self.loop.call_soon_threadsafe(self.loop.stop)
-            
-            # 5. 等待后台线程结束
-            if self.background_thread and self.background_thread.is_alive():
-                self.background_thread.join(timeout=5)
-                if self.background_thread.is_alive():
-                    logger.warning("后台线程未能在5秒内结束")
-            
-            # 6. 关闭线程池
-            if self.executor:
-                self.executor.shutdown(wait=True, timeout=3)
-                
             self._started = False
             
         except Exception as e:
             logger.warning(f"MCP客户端停止时出错: {e}")
     
+    async def _list_tools(self):
+        logger.debug("调用client.list_tools()")
+        
+        # 调试：检查客户端对象类型，只在DEBUG级别下输出
+        logger.debug("客户端对象类型: %s", type(self.client))
+        
+        if hasattr(self.client, 'list_tools'):
+            result = await self.client.list_tools()
+            logger.debug("获取到结果类型: %s", type(result))
+            
+            if hasattr(result, 'tools'):
+                tools = result.tools
+                logger.info("找到 %d 个工具", len(tools))
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, tool in enumerate(tools):
+                        logger.debug("工具 %d: %s", i + 1, tool)
+                return tools
+            else:
+                logger.warning("结果对象没有tools属性")
+                return []
+        else:
+            logger.warning("客户端没有list_tools方法")
+            # 检查是否有其他可能的方法（只在出错时列出客户端方法）
+            possible_methods = [m for m in dir(self.client) if not m.startswith('_') and 'tool' in m.lower()]
+            logger.warning("包含'tool'的方法: %s", possible_methods)
+            return []
+    
     def list_tools_sync(self, timeout_seconds=30):
         """同步获取工具列表"""
         if not self._started or not self.client:
@@ -186,57 +226,9 @@ class MCPClient:
             return []
         
         try:
-            logger.info(f"开始获取MCP工具列表，超时{timeout_seconds}秒")
-            future = Future()
-            
-            def run_async():
-                try:
-                    async def get_tools():
-                        logger.info("调用client.list_tools()")
-                        
-                        # 调试：检查客户端对象类型和方法
-                        logger.info(f"客户端对象类型: {type(self.client)}")
-                        logger.info(f"客户端对象: {self.client}")
-                        
-                        # 列出所有可用方法
-                        methods = [method for method in dir(self.client) if not method.startswith('_')]
-                        logger.info(f"客户端可用方法: {methods}")
-                        
-                        if hasattr(self.client, 'list_tools'):
-                            result = await self.client.list_tools()
-                            logger.info(f"获取到结果类型: {type(result)}")
-                            logger.info(f"结果内容: {result}")
-                            
-                            if hasattr(result, 'tools'):
-                                tools = result.tools
-                                logger.info(f"找到 {len(tools)} 个工具")
-                                for i, tool in enumerate(tools):
-                                    logger.info(f"工具 {i+1}: {tool}")
-                                return tools
-                            else:
-                                logger.warning("结果对象没有tools属性")
-                                return []
-                        else:
-                            logger.warning("客户端没有list_tools方法")
-                            # 检查是否有其他可能的方法
-                            possible_methods = [m for m in methods if 'tool' in m.lower()]
-                            logger.info(f"包含'tool'的方法: {possible_methods}")
-                            return []
-                    
-                    if self.loop and not self.loop.is_closed():
-                        tools = asyncio.run_coroutine_threadsafe(get_tools(), self.loop).result(timeout=timeout_seconds)
-                        future.set_result(tools)
-                    else:
-                        logger.warning("事件循环不可用")
-                        future.set_result([])
-                        
-                except Exception as e:
-                    logger.error(f"获取工具异步操作失败: {e}")
-                    future.set_exception(e)
-            
-            self.executor.submit(run_async)
-            result = future.result(timeout=timeout_seconds)
-            logger.info(f"最终返回 {len(result)} 个工具")
+            logger.debug("开始获取MCP工具列表，超时%s秒", timeout_seconds)
+            result = self.runtime.run(self._list_tools(), timeout=timeout_seconds)
+            logger.debug("最终返回 %d 个工具", len(result))
             return result
             
         except Exception as e:
@@ -245,6 +237,18 @@ class MCPClient:
             logger.error(f"堆栈跽踪: {traceback.format_exc()}")
             return []
     
+    async def _call_tool(self, name, arguments):
+        if hasattr(self.client, 'call_tool'):
+            result = await self.client.call_tool(
+                name=name,
+                arguments=arguments
+            )
+            return {
+                "status": "success",
+                "result": result.content if hasattr(result, 'content') else result
+            }
+        return {"status": "error", "error": "工具调用方法不可用"}
+    
     def call_tool_sync(self, tool_use_id, name, arguments, read_timeout_seconds=None):
         """同步调用MCP工具"""
         if not self._started or not self.client:
@@ -255,34 +259,8 @@ class MCPClient:
             timeout = timeout.total_seconds()
         
         try:
-            future = Future()
-            
-            def run_async():
-                try:
-                    async def call_tool():
-                        if hasattr(self.client, 'call_tool'):
-                            result = await self.client.call_tool(
-                                name=name,
-                                arguments=arguments
-                            )
-                            return {
-                                "status": "success",
-                                "result": result.content if hasattr(result, 'content') else result
-                            }
-                        return {"status": "error", "error": "工具调用方法不可用"}
-                    
-                    if self.loop and not self.loop.is_closed():
-                        result = asyncio.run_coroutine_threadsafe(call_tool(), self.loop).result(timeout=timeout)
-                        future.set_result(result)
-                    else:
-                        future.set_result({"status": "error", "error": "事件循环不可用"})
-                        
-                except Exception as e:
-                    future.set_exception(e)
-            
-            self.executor.submit(run_async)
-            return future.result(timeout=timeout)
+            return self.runtime.run(self._call_tool(name, arguments), timeout=timeout)
             
         except Exception as e:
             logger.warning(f"调用MCP工具失败: {e}")
-            return {"status": "error", "error": str(e)}
\ No newline at end of file
+            return {"status": "error", "error": str(e)}
@@ -6,6 +6,10 @@ MCP（Model Context Protocol）管理器
 import json
 import logging
 import os
+import threading
+import time
+from functools import partial
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Any, Optional
 
 # 配置日志
@@ -31,6 +35,8 @@ class MCPManager:
         self._mcp_clients = []
         self._mcp_tools = []
         self._config = None
+        # 最近一次启动时每个服务器的耗时明细
+        self.startup_report = []
         
     def cleanup(self):
         """清理所有MCP资源"""
@@ -88,60 +94,47 @@ class MCPManager:
                 logger.info("没有启用的MCP服务器")
                 return []
             
-            logger.info(f"发现 {len(enabled_servers)} 个启用的MCP服务器")
+            logger.info(f"发现 {len(enabled_servers)} 个启用的MCP服务器，并行连接")
+            default_timeout = mcp_config.get('default_timeout_seconds', 30)
             
-            for server_config in enabled_servers:
+            # 所有服务器同时连接和获取工具列表，每个服务器单独计时
+            started_at = time.perf_counter()
+            futures = [self._start_connect(server_config) for server_config in enabled_servers]
+            
+            report = []
+            for server_config, future in zip(enabled_servers, futures):
+                server_name = server_config.get('name', 'unknown')
+                timeout = server_config.get('startup_timeout', default_timeout)
                 try:
-                    server_name = server_config.get('name', 'unknown')
-                    logger.info(f"连接到MCP服务器 '{server_name}'...")
-                    
-                    # 创建Strands MCPClient
-                    mcp_client = self._create_strands_mcp_client(server_config)
-                    
-                    if mcp_client:
-                        # 手动进入上下文管理器并保持连接
-                        mcp_client.__enter__()
-                        
-                        # 保存客户端引用以便后续使用和清理
-                        self._mcp_clients.append(mcp_client)
-                        
-                        try:
-                            logger.info(f"获取MCP服务器 '{server_name}' 的工具列表...")
-                            # 使用Strands MCPClient的正确方法
-                            raw_tools = mcp_client.list_tools_sync()
-                            
-                            logger.info(f"MCP客户端类型: {type(mcp_client)}")
-                            logger.info(f"返回的工具类型: {type(raw_tools)}")
-                            logger.info(f"工具内容: {raw_tools}")
-                            
-                            if raw_tools:
-                                logger.info(f"找到 {len(raw_tools)} 个工具:")
-                                for i, tool in enumerate(raw_tools):
-                                    tool_name = getattr(tool, 'name', f'tool_{i}')
-                                    tool_desc = getattr(tool, 'description', 'No description')
-                                    logger.info(f"  - {tool_name}: {tool_desc}")
-                                
-                                # 添加工具到列表 - Strands MCPClient返回的工具可以直接使用
-                                mcp_tools.extend(raw_tools)
-                                logger.info(f"从 '{server_name}' 加载了 {len(raw_tools)} 个工具")
-                            else:
-                                logger.warning(f"MCP服务器 '{server_name}' 没有可用工具")
-                        except Exception as tool_error:
-                            logger.error(f"获取工具列表失败: {tool_error}")
-                            # 如果获取工具失败，从客户端列表中移除并关闭
-                            if mcp_client in self._mcp_clients:
-                                self._mcp_clients.remove(mcp_client)
-                            try:
-                                mcp_client.__exit__(None, None, None)
-                            except:
-                                pass
-                            raise
+                    mcp_client, raw_tools, timing = future.result(
+                        timeout=max(0, started_at + timeout - time.perf_counter())
+                    )
+                except FutureTimeoutError:
+                    logger.error(f"MCP服务器 '{server_name}' 在 {timeout} 秒内未完成启动，跳过")
+                    # 超时后才完成的连接在后台关闭
+                    future.add_done_callback(partial(self._close_late_client, server_name))
+                    report.append({"name": server_name, "status": "timeout", "timeout_s": timeout})
+                    continue
                 except Exception as e:
-                    logger.error(f"加载MCP服务器 '{server_config.get('name', 'unknown')}' 失败: {e}")
-                    logger.error(f"错误类型: {type(e).__name__}")
-                    import traceback
-                    logger.error(f"堆栈跟踪:\n{traceback.format_exc()}")
+                    logger.error(f"加载MCP服务器 '{server_name}' 失败: {e}")
+                    report.append({"name": server_name, "status": "error", "error": str(e)})
                     continue
+                
+                report.append(timing)
+                if mcp_client:
+                    # 保存客户端引用以便后续使用和清理
+                    self._mcp_clients.append(mcp_client)
+                    mcp_tools.extend(raw_tools)
+            
+            wall_ms = round((time.perf_counter() - started_at) * 1000, 1)
+            self.startup_report = report
+            logger.info(f"MCP服务器启动完成，总耗时 {wall_ms}ms:")
+            for timing in report:
+                logger.info(
+                    "  - %s: %s, 连接 %sms, 工具列表 %sms, 合计 %sms, 工具 %s 个",
+                    timing["name"], timing["status"], timing.get("connect_ms"), timing.get("list_tools_ms"),
+                    timing.get("total_ms"), timing.get("tools", 0)
+                )
             
             logger.info(f"总共加载了 {len(mcp_tools)} 个MCP工具")
             self._mcp_tools = mcp_tools
@@ -151,6 +144,95 @@ class MCPManager:
         
         return mcp_tools
     
+    def _start_connect(self, server_config):
+        """
+        在守护线程中连接单个MCP服务器，卡在启动中的服务器不会阻止进程退出
+        
+        返回:
+            结果为_connect_server返回值的Future
+        """
+        future = Future()
+        
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._connect_server(server_config))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        server_name = server_config.get('name', 'unknown')
+        threading.Thread(target=run, name=f"mcp-startup-{server_name}", daemon=True).start()
+        return future
+    
+    def _connect_server(self, server_config):
+        """
+        连接单个MCP服务器并获取工具列表（在启动线程中运行）
+        
+        返回:
+            (MCP客户端或None, 工具列表, 耗时明细)，失败时客户端为None且明细中status为error
+        """
+        server_name = server_config.get('name', 'unknown')
+        start = time.perf_counter()
+        timing = {"name": server_name, "status": "ok", "tools": 0}
+        logger.info(f"连接到MCP服务器 '{server_name}'...")
+        
+        mcp_client = None
+        entered = False
+        try:
+            # 创建Strands MCPClient
+            mcp_client = self._create_strands_mcp_client(server_config)
+            if not mcp_client:
+                timing["status"] = "skipped"
+                return None, [], timing
+            
+            # 手动进入上下文管理器并保持连接
+            mcp_client.__enter__()
+            entered = True
+            connected = time.perf_counter()
+            timing["connect_ms"] = round((connected - start) * 1000, 1)
+            
+            logger.info(f"获取MCP服务器 '{server_name}' 的工具列表...")
+            raw_tools = mcp_client.list_tools_sync()
+            timing["list_tools_ms"] = round((time.perf_counter() - connected) * 1000, 1)
+        except Exception as e:
+            logger.error(f"加载MCP服务器 '{server_name}' 失败: {e}")
+            logger.error(f"错误类型: {type(e).__name__}")
+            import traceback
+            logger.error(f"堆栈跟踪:\n{traceback.format_exc()}")
+            # 如果获取工具失败，关闭客户端
+            if entered:
+                try:
+                    mcp_client.__exit__(None, None, None)
+                except:
+                    pass
+            timing.update(status="error", error=str(e), total_ms=round((time.perf_counter() - start) * 1000, 1))
+            return None, [], timing
+        timing["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        
+        if raw_tools:
+            timing["tools"] = len(raw_tools)
+            logger.info(f"从 '{server_name}' 加载了 {len(raw_tools)} 个工具:")
+            for i, tool in enumerate(raw_tools):
+                tool_name = getattr(tool, 'tool_name', getattr(tool, 'name', f'tool_{i}'))
+                logger.debug("  - %s", tool_name)
+        else:
+            logger.warning(f"MCP服务器 '{server_name}' 没有可用工具")
+        return mcp_client, raw_tools or [], timing
+    
+    def _close_late_client(self, server_name, future):
+        """关闭超时之后才启动完成的MCP客户端"""
+        if future.exception() is not None:
+            logger.warning(f"MCP服务器 '{server_name}' 超时后启动失败: {future.exception()}")
+            return
+        mcp_client, _, timing = future.result()
+        if not mcp_client:
+            return
+        logger.warning(f"MCP服务器 '{server_name}' 在超时后才启动完成（{timing['total_ms']}ms），已关闭")
+        try:
+            mcp_client.__exit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"关闭超时的MCP客户端时出错: {e}")
+    
     def _load_unity_mcp_config(self):
         """从Unity加载MCP配置"""
         try:
@@ -266,13 +348,16 @@ class MCPManager:
                         'headers': server_config.get('headers', {})
                     })
                 
+                if 'startup_timeout' in server_config:
+                    converted_server['startup_timeout'] = server_config['startup_timeout']
+                
                 converted_servers.append(converted_server)
             
             # 返回转换后的配置
             converted_config = {
                 'enable_mcp': len(converted_servers) > 0,
                 'max_concurrent_connections': 5,
-                'default_timeout_seconds': 30,
+                'default_timeout_seconds': anthropic_config.get('default_timeout_seconds', 30),
                 'servers': converted_servers
             }
             
@@ -0,0 +1,136 @@
+"""
+流式处理回放基准测试
+把记录的（或合成的）Agent流式事件回放给StreamingProcessor，测量每秒处理的chunk数
+
+用法:
+    python streaming_benchmark.py                       # 合成事件流
+    python streaming_benchmark.py --events events.jsonl # 回放记录的事件流
+
+    python streaming_benchmark.py --profile production  # 按日志档位测量每个chunk的日志开销
+
+记录事件流：运行Unity Agent前设置环境变量 UNITY_AGENT_RECORD_EVENTS=events.jsonl
+日志输出到stderr，测量时可重定向: 2>/dev/null
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from logging_config import LOG_PROFILES, configure_logging
+from streaming_processor import StreamingProcessor
+
+
+def synthetic_events(text_chunks: int = 200, tool_calls: int = 2):
+    """
+    生成一轮对话的事件流，形状与Strands Agent的stream_async输出一致
+
+    参数:
+        text_chunks: 文本增量事件数量
+        tool_calls: 工具调用次数
+    """
+    callback_kwargs = {"agent": "<Agent>", "event_loop_cycle_id": "cycle", "request_state": {}}
+    events = [{"init_event_loop": True}, {"start": True}, {"start_event_loop": True}]
+    for call in range(tool_calls):
+        tool_use_id = f"tooluse_{call}"
+        tool_input = json.dumps({"path": f"Assets/Scripts/Player{call}.cs"})
+        events += [
+            {"event": {"messageStart": {"role": "assistant"}}},
+            {"event": {"contentBlockStart": {"start": {"toolUse": {"toolUseId": tool_use_id, "name": "file_read"}}, "contentBlockIndex": 0}}},
+            {"event": {"contentBlockDelta": {"delta": {"toolUse": {"input": tool_input}}, "contentBlockIndex": 0}}},
+            {"current_tool_use": {"toolUseId": tool_use_id, "name": "file_read", "input": tool_input}, **callback_kwargs},
+            {"event": {"contentBlockStop": {"contentBlockIndex": 0}}},
+            {"event": {"messageStop": {"stopReason": "tool_use"}}},
+            {"message": {"role": "assistant", "content": [{"toolUse": {"toolUseId": tool_use_id, "name": "file_read", "input": {"path": f"Assets/Scripts/Player{call}.cs"}}}]}},
+            {"message": {"role": "user", "content": [{"toolResult": {"toolUseId": tool_use_id, "status": "success", "content": [{"text": "using UnityEngine;\n" * 40}]}}]}},
+        ]
+    events.append({"event": {"messageStart": {"role": "assistant"}}})
+    for i in range(text_chunks):
+        text = f"token{i} "
+        events.append({"event": {"contentBlockDelta": {"delta": {"text": text}, "contentBlockIndex": 0}}})
+        events.append({"data": text, "delta": {"text": text}, **callback_kwargs})
+    events += [
+        {"event": {"contentBlockStop": {"contentBlockIndex": 0}}},
+        {"event": {"messageStop": {"stopReason": "end_turn"}}},
+        {"event": {"metadata": {"usage": {"inputTokens": 100, "outputTokens": text_chunks}, "metrics": {"latencyMs": 1000}}}},
+        {"message": {"role": "assistant", "content": [{"text": "".join(f"token{i} " for i in range(text_chunks))}]}},
+        {"result": "<AgentResult>"},
+    ]
+    return events
+
+
+def load_events(path: str):
+    """读取记录的事件流，每行一个JSON事件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class _ReplayAgent:
+    """按顺序回放事件的Agent替身"""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def stream_async(self, message):
+        for event in self.events:
+            yield event
+
+
+class _ReplayAgentInstance:
+    """StreamingProcessor需要的UnityAgent替身"""
+
+    def __init__(self, events):
+        self.agent = _ReplayAgent(events)
+        self._available_tools = []
+
+    def health_check(self, wait: bool = True):
+        return {"status": "healthy", "ready": True}
+
+
+async def replay(events, repeats: int):
+    """回放事件流repeats次，返回处理的chunk数、输出数和耗时"""
+    processor = StreamingProcessor(_ReplayAgentInstance(events))
+    outputs = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        async for _ in processor.process_stream("benchmark"):
+            outputs += 1
+    return len(events) * repeats, outputs, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流式处理回放基准测试")
+    parser.add_argument("--events", default=None, help="记录的事件流文件(JSON行)，默认使用合成事件流")
+    parser.add_argument("--text-chunks", type=int, default=200, help="合成事件流中的文本增量数量")
+    parser.add_argument("--tool-calls", type=int, default=2, help="合成事件流中的工具调用次数")
+    parser.add_argument("--repeats", type=int, default=50, help="回放次数")
+    parser.add_argument("--log-level", default="WARNING", help="回放时的日志级别（未指定--profile时使用）")
+    parser.add_argument("--profile", choices=sorted(LOG_PROFILES), default=None, help="按Unity Agent的日志档位配置日志")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text", help="日志格式（配合--profile使用）")
+    args = parser.parse_args()
+
+    if args.profile:
+        configure_logging(args.profile, args.log_format)
+        log_level = f"{args.profile}/{args.log_format}"
+    else:
+        logging.basicConfig(level=getattr(logging, args.log_level.upper()))
+        log_level = args.log_level.upper()
+    events = load_events(args.events) if args.events else synthetic_events(args.text_chunks, args.tool_calls)
+
+    chunks, outputs, elapsed = asyncio.run(replay(events, args.repeats))
+    print(json.dumps({
+        "source": args.events or "synthetic",
+        "events_per_stream": len(events),
+        "repeats": args.repeats,
+        "chunks": chunks,
+        "outputs": outputs,
+        "seconds": round(elapsed, 3),
+        "chunks_per_sec": round(chunks / elapsed, 1) if elapsed else None,
+        "us_per_chunk": round(elapsed * 1e6 / chunks, 2) if chunks else None,
+        "log_level": log_level,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,39 @@
 import json
 import logging
 import asyncio
+import os
 from typing import Dict, Any, AsyncGenerator
 from tool_tracker import get_tool_tracker
+from logging_config import should_log_chunk
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 设置后把每个流式事件以JSON行追加到该文件，供streaming_benchmark.py回放
+RECORD_EVENTS_PATH = os.environ.get('UNITY_AGENT_RECORD_EVENTS')
+
+# 顶层键 -> 处理方法，按优先级排列；每个chunk只按此表分类一次，None表示无需处理
+CHUNK_HANDLERS = (
+    ('event', '_on_model_event'),
+    ('init_event_loop', None),
+    ('start', None),
+    ('start_event_loop', None),
+    ('contentBlockStart', '_on_block_event'),
+    ('contentBlockDelta', '_on_block_event'),
+    ('contentBlockStop', '_on_block_event'),
+    ('message', '_on_message'),
+)
+
+# 由工具跟踪器直接处理的顶层字段
+TRACKED_KEYS = ('contentBlockStart', 'contentBlockDelta', 'contentBlockStop', 'message')
+
+# 需要在聊天中显示工具调用信息的顶层字段，按优先级排列
+TOOL_PATTERNS = (
+    'tool_use', 'tool_call', 'function_call', 'action',
+    'contentBlockStart', 'contentBlockDelta', 'contentBlockStop',
+    'message', 'tool_result', 'input', 'output'
+)
+
 class StreamingProcessor:
     """负责处理Agent的流式响应"""
     
@@ -35,10 +62,10 @@ class StreamingProcessor:
             包含响应块的JSON字符串
         """
         try:
-            logger.info(f"============ 开始流式处理消息 ============")
-            logger.info(f"消息内容: {message}")
-            logger.info(f"Agent类型: {type(self.agent_instance.agent)}")
-            logger.info(f"可用工具数量: {len(self.agent_instance._available_tools) if hasattr(self.agent_instance, '_available_tools') else 0}")
+            logger.info("============ 开始流式处理消息 ============")
+            logger.info("消息内容: %s", message)
+            logger.info("Agent类型: %s", type(self.agent_instance.agent))
+            logger.info("可用工具数量: %d", len(getattr(self.agent_instance, '_available_tools', [])))
             
             # 获取工具跟踪器
             tool_tracker = get_tool_tracker()
@@ -53,17 +80,13 @@ class StreamingProcessor:
             
             # 使用Strands Agent的流式API
             logger.info("准备调用agent.stream_async()...")
-            logger.info(f"Agent对象: {self.agent_instance.agent}")
-            logger.info(f"Agent类型: {type(self.agent_instance.agent)}")
-            logger.info(f"Stream_async方法存在: {hasattr(self.agent_instance.agent, 'stream_async')}")
+            logger.debug("Agent对象: %s", self.agent_instance.agent)
+            logger.info("Stream_async方法存在: %s", hasattr(self.agent_instance.agent, 'stream_async'))
             
-            # 先测试agent是否正常工作
-            try:
-                logger.info("测试agent是否响应...")
-                test_response = self.agent_instance.agent("简单回答：你好")
-                logger.info(f"Agent测试响应: {test_response[:100]}...")
-            except Exception as test_error:
-                logger.error(f"Agent测试失败: {test_error}")
+            # 读取缓存的健康状态（在后台刷新，不在流式路径上调用模型）
+            health = self.agent_instance.health_check(wait=False)
+            if health.get("ready") is False:
+                logger.error("Agent健康检查未通过: %s", health)
                 logger.error("这可能是导致流式处理异常的原因")
             
             chunk_count = 0
@@ -83,127 +106,43 @@ class StreamingProcessor:
                 
                 async for chunk in self.agent_instance.agent.stream_async(message):
                     chunk_count += 1
+                    if RECORD_EVENTS_PATH:
+                        self._record_chunk(chunk)
                     current_time = asyncio.get_event_loop().time()
                     
-                    logger.info(f"========== Chunk #{chunk_count} ==========")
-                    logger.info(f"耗时: {current_time - start_time:.1f}s")
-                    logger.info(f"Chunk类型: {type(chunk)}")
-                    logger.info(f"Chunk内容: {str(chunk)[:500]}...")
+                    # 按档位采样记录，参数在日志真正输出时才格式化
+                    if should_log_chunk(chunk_count) and logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Chunk #%d 耗时: %.1fs 类型: %s", chunk_count, current_time - start_time, type(chunk).__name__,
+                            extra={'chunk': chunk_count, 'elapsed_s': round(current_time - start_time, 3)}
+                        )
+                        logger.debug("Chunk #%d 内容: %.500s", chunk_count, chunk)
                     
                     # 立即检查是否是空的或无效的chunk
                     if chunk is None:
-                        logger.warning(f"收到None chunk #{chunk_count}")
+                        logger.warning("收到None chunk #%d", chunk_count)
                         continue
                     
                     if not chunk:
-                        logger.warning(f"收到空chunk #{chunk_count}")
+                        logger.warning("收到空chunk #%d", chunk_count)
                         continue
                     
-                    # 检查chunk中是否包含工具信息并记录详细日志
-                    if isinstance(chunk, dict):
-                        self._log_chunk_details(chunk, chunk_count)
-                        
-                        # 专门检查file_read工具调用
-                        file_read_msg = self._check_file_read_tool(chunk, chunk_count)
-                        if file_read_msg:
-                            yield json.dumps({
-                                "type": "chunk",
-                                "content": file_read_msg,
-                                "done": False
-                            }, ensure_ascii=False)
-                        
-                        # 强制检查所有可能的工具调用格式并输出到聊天
-                        tool_msg = self._force_check_tool_calls(chunk, chunk_count)
-                        if tool_msg:
-                            yield json.dumps({
-                                "type": "chunk",
-                                "content": tool_msg,
-                                "done": False
-                            }, ensure_ascii=False)
-                
-                    # 提取工具调用信息
-                    tool_info_generated = False
-                    if isinstance(chunk, dict):
-                        # 检查事件字段
-                        if 'event' in chunk:
-                            tool_info = tool_tracker.process_event(chunk['event'])
-                            if tool_info:
-                                logger.info(f"生成工具信息: {tool_info}")
-                                yield json.dumps({
-                                    "type": "chunk",
-                                    "content": tool_info,
-                                    "done": False
-                                }, ensure_ascii=False)
-                                tool_info_generated = True
-                        
-                        # 也检查是否直接包含工具相关信息
-                        if any(key in chunk for key in ['contentBlockStart', 'contentBlockDelta', 'contentBlockStop', 'message']):
-                            tool_info = tool_tracker.process_event(chunk)
-                            if tool_info:
-                                logger.info(f"生成工具信息: {tool_info}")
-                                yield json.dumps({
-                                    "type": "chunk",
-                                    "content": tool_info,
-                                    "done": False
-                                }, ensure_ascii=False)
-                                tool_info_generated = True
-                        
-                        # 检查是否有工具使用但未被上面的逻辑捕获
-                        if 'type' in chunk and chunk['type'] == 'tool_use':
-                            tool_name = chunk.get('name', '未知工具')
-                            tool_input = chunk.get('input', {})
-                            logger.info(f"检测到工具使用: {tool_name}")
-                            
-                            # 更新工具执行时间
-                            last_tool_time = current_time
-                            
-                            # 特别监控shell工具
-                            if 'shell' in tool_name.lower():
-                                command = tool_input.get('command', '')
-                                logger.info(f"💻 [SHELL_MONITOR] 检测到shell工具调用: {command}")
-                                yield json.dumps({
-                                    "type": "chunk", 
-                                    "content": f"\n<details>\n<summary>Shell工具执行 - {tool_name}</summary>\n\n**命令**: `{command}`\n\n⏳ 正在执行shell命令...\n</details>\n",
-                                    "done": False
-                                }, ensure_ascii=False)
-                            elif 'file_read' in tool_name.lower():
-                                file_path = tool_input.get('path', tool_input.get('file_path', ''))
-                                logger.info(f"📖 [FILE_READ_MONITOR] 检测到file_read工具调用: {file_path}")
-                                if file_path == '.':
-                                    logger.warning(f"⚠️ [FILE_READ_MONITOR] 警告：尝试读取当前目录，这可能导致卡死！")
-                                    yield json.dumps({
-                                        "type": "chunk", 
-                                        "content": f"\n<details>\n<summary>安全提示 - 文件读取操作</summary>\n\n**工具**: {tool_name}  \n**路径**: `{file_path}`  \n\n⚠️ **注意**: 检测到尝试读取目录，建议使用shell工具进行目录浏览\n</details>\n",
-                                        "done": False
-                                    }, ensure_ascii=False)
-                                else:
-                                    yield json.dumps({
-                                        "type": "chunk", 
-                                        "content": f"\n<details>\n<summary>文件读取 - {tool_name}</summary>\n\n**文件路径**: `{file_path}`\n\n⏳ 正在读取文件...\n</details>\n",
-                                        "done": False
-                                    }, ensure_ascii=False)
-                            else:
-                                # 生成工具图标
-                                tool_icon = self._get_tool_icon(tool_name)
-                                
-                                # 格式化输入参数
-                                formatted_input = json.dumps(tool_input, ensure_ascii=False, indent=2)
-                                # 增加截断长度限制，避免过度截断
-                                if len(formatted_input) > 1000:
-                                    formatted_input = formatted_input[:1000] + "...\n}"
-                                
-                                yield json.dumps({
-                                    "type": "chunk", 
-                                    "content": f"\n<details>\n<summary>工具执行 - {tool_name}</summary>\n\n**输入参数**:\n```json\n{formatted_input}\n```\n\n⏳ 正在执行...\n</details>\n",
-                                    "done": False
-                                }, ensure_ascii=False)
-                            tool_info_generated = True
-                    
-                    # 然后提取常规文本内容
-                    text_content = self._extract_text_from_chunk(chunk)
+                    # 按顶层键单次分类并分派处理
+                    tool_messages, text_content, tool_info_generated, tool_used = self._dispatch_chunk(
+                        chunk, chunk_count, tool_tracker
+                    )
+                    for tool_message in tool_messages:
+                        yield json.dumps({
+                            "type": "chunk",
+                            "content": tool_message,
+                            "done": False
+                        }, ensure_ascii=False)
+                    if tool_used:
+                        # 更新工具执行时间
+                        last_tool_time = current_time
                     
                     if text_content:
-                        logger.debug(f"提取文本内容: {text_content}")
+                        logger.debug("提取文本内容: %s", text_content)
                         yield json.dumps({
                             "type": "chunk",
                             "content": text_content,
@@ -240,7 +179,7 @@ class StreamingProcessor:
                             # 检查工具是否执行过长时间
                             time_since_last_tool = current_time - last_tool_time
                             if time_since_last_tool > 30:  # 30秒无工具活动
-                                logger.warning(f"⚠️ [TOOL_TIMEOUT] 工具执行超过30秒无响应，可能卡死")
+                                logger.warning("⚠️ [TOOL_TIMEOUT] 工具执行超过30秒无响应，可能卡死")
                                 yield json.dumps({
                                     "type": "chunk",
                                     "content": f"\n<details>\n<summary>执行状态 - 工具超时提醒</summary>\n\n**状态**: 已超过30秒无响应  \n**可能原因**: 工具处理大文件或遇到问题  \n**建议**: 如持续无响应可停止执行\n</details>\n",
@@ -252,7 +191,7 @@ class StreamingProcessor:
                             tool_start_time = None
                             last_tool_progress_time = None
                             # 静默跳过
-                            logger.debug(f"跳过无内容chunk: {str(chunk)[:100]}")
+                            logger.debug("跳过无内容chunk: %.100s", chunk)
                             pass
                 
                 # 检查是否真的有内容输出
@@ -269,12 +208,15 @@ class StreamingProcessor:
                 
                 # 信号完成
                 total_time = asyncio.get_event_loop().time() - start_time
-                logger.info(f"=== 流式处理循环结束 ===")
-                logger.info(f"总共处理了 {chunk_count} 个chunk，耗时 {total_time:.1f}秒")
+                logger.info("=== 流式处理循环结束 ===")
+                logger.info(
+                    "总共处理了 %d 个chunk，耗时 %.1f秒", chunk_count, total_time,
+                    extra={'chunks': chunk_count, 'total_s': round(total_time, 3)}
+                )
                 
                 # 检查是否有工具还在执行中
                 if tool_tracker.current_tool:
-                    logger.warning(f"工具 {tool_tracker.current_tool} 可能仍在执行中")
+                    logger.warning("工具 %s 可能仍在执行中", tool_tracker.current_tool)
                     yield json.dumps({
                         "type": "chunk",
                         "content": f"\n⚠️ 工具 {tool_tracker.current_tool} 可能仍在执行中或已完成但未收到结果\n",
@@ -327,7 +269,7 @@ class StreamingProcessor:
                 }, ensure_ascii=False)
                 
             # 流式正常结束
-            logger.info(f"流式响应正常结束，共处理{chunk_count}个chunk")
+            logger.info("流式响应正常结束，共处理%d个chunk", chunk_count)
             
         except Exception as e:
             logger.error(f"========== 流式处理顶层异常 ==========")
@@ -382,120 +324,184 @@ class StreamingProcessor:
             except Exception as cleanup_error:
                 logger.warning(f"清理MCP资源时出错: {cleanup_error}")
     
-    def _log_chunk_details(self, chunk, chunk_count):
-        """记录chunk的详细信息，特别是工具调用相关的信息"""
+    def _record_chunk(self, chunk):
+        """把流式事件追加到RECORD_EVENTS_PATH"""
         try:
-            if 'type' in chunk:
-                logger.info(f"Chunk #{chunk_count} 类型: {chunk['type']}")
-            
-            if 'event' in chunk:
-                event = chunk['event']
-                if isinstance(event, dict):
-                    if 'contentBlockStart' in event:
-                        content_block = event['contentBlockStart'].get('contentBlock', {})
-                        if content_block.get('type') == 'tool_use':
-                            tool_name = content_block.get('name', '未知')
-                            logger.info(f"🔧 工具调用开始: {tool_name}")
-                            # 专门为file_read工具记录详细日志
-                            if 'file_read' in tool_name:
-                                logger.info(f"📖 [FILE_READ] 工具开始执行")
-                    elif 'contentBlockDelta' in event:
-                        logger.info(f"📋 工具参数更新中...")
-                    elif 'contentBlockStop' in event:
-                        logger.info(f"⏳ 工具调用准备完成")
-                    elif 'message' in event:
-                        logger.info(f"📥 收到消息事件")
-            
-            if any(key in chunk for key in ['contentBlockStart', 'contentBlockDelta', 'contentBlockStop', 'message']):
-                logger.info(f"Chunk #{chunk_count} 包含工具相关信息")
+            with open(RECORD_EVENTS_PATH, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(chunk, ensure_ascii=False, default=str) + "\n")
         except Exception as e:
-            logger.warning(f"记录chunk详情时出错: {e}")
+            logger.warning(f"记录流式事件时出错: {e}")
     
-    def _check_file_read_tool(self, chunk, chunk_count):
-        """专门检查file_read工具的调用和结果"""
-        try:
-            # 检查工具调用开始
-            if 'event' in chunk:
-                event = chunk['event']
-                if isinstance(event, dict):
-                    if 'contentBlockStart' in event:
-                        content_block = event['contentBlockStart'].get('contentBlock', {})
-                        if content_block.get('type') == 'tool_use':
-                            tool_name = content_block.get('name', '')
-                            if 'file_read' in tool_name:
-                                logger.info(f"📖 [FILE_READ] 检测到file_read工具调用开始 (Chunk #{chunk_count})")
-                                return f"\n📖 **[FILE_READ]** 工具调用开始 (Chunk #{chunk_count})\n   🔍 准备读取文件..."
-                    
-                    elif 'contentBlockDelta' in event:
-                        delta = event['contentBlockDelta']
-                        if 'delta' in delta and 'input' in delta['delta']:
-                            input_data = delta['delta']['input']
-                            if 'path' in input_data or 'file_path' in input_data:
-                                file_path = input_data.get('path') or input_data.get('file_path')
-                                logger.info(f"📖 [FILE_READ] 检测到文件路径参数: {file_path}")
-                                return f"   📂 **[FILE_READ]** 目标文件: {file_path}"
-                    
-                    elif 'contentBlockStop' in event:
-                        # 检查当前是否是file_read工具
-                        tool_tracker = get_tool_tracker()
-                        if tool_tracker.current_tool and 'file_read' in tool_tracker.current_tool:
-                            logger.info(f"📖 [FILE_READ] 工具参数准备完成，开始执行文件读取...")
-                            return f"   ⏳ **[FILE_READ]** 参数准备完成，开始读取文件..."
-            
-            # 检查工具执行结果
-            if 'message' in chunk:
-                message = chunk['message']
-                if 'content' in message:
-                    for content in message['content']:
-                        if content.get('type') == 'tool_result':
-                            # 检查是否是file_read的结果
-                            result = content.get('content', [])
-                            if result and isinstance(result, list) and len(result) > 0:
-                                result_text = result[0].get('text', '')
-                                # 简单检查是否可能是文件内容
-                                if len(result_text) > 100:  # 假设文件内容较长
-                                    logger.info(f"📖 [FILE_READ] 检测到可能的文件读取结果，长度: {len(result_text)}字符")
-                                    lines = result_text.split('\n')
-                                    return f"   ✅ **[FILE_READ]** 文件读取完成\n   📄 文件大小: {len(result_text)}字符，{len(lines)}行\n   📝 内容预览: {result_text[:100]}..."
+    def _dispatch_chunk(self, chunk, chunk_count, tool_tracker):
+        """
+        按顶层键对chunk单次分类，并交给对应的处理方法
+        
+        参数:
+            chunk: Agent流式事件
+            chunk_count: chunk序号
+            tool_tracker: 工具跟踪器
             
-            return None
-        except Exception as e:
-            logger.warning(f"检查file_read工具时出错: {e}")
-            return None
-
-    def _force_check_tool_calls(self, chunk, chunk_count):
-        """强制检查chunk中的工具调用信息，返回要输出到聊天的消息"""
+        返回:
+            (要输出的工具信息列表, 文本内容, 是否生成了工具信息, 是否检测到工具使用)
+        """
+        if not isinstance(chunk, dict):
+            return [], self._extract_text_from_chunk(chunk), False, False
+        
+        if chunk.get('type') == 'tool_use':
+            return self._on_tool_use(chunk, chunk_count, tool_tracker)
+        for key, handler_name in CHUNK_HANDLERS:
+            if key in chunk:
+                if handler_name is None:
+                    return [], None, False, False
+                return getattr(self, handler_name)(chunk, chunk_count, tool_tracker)
+        return self._on_other(chunk, chunk_count, tool_tracker)
+    
+    def _on_model_event(self, chunk, chunk_count, tool_tracker):
+        """模型流事件: {"event": {...}}"""
+        event = chunk['event']
+        if not isinstance(event, dict):
+            return [], None, False, False
+        
+        messages = []
+        file_read_msg = None
+        text_content = None
+        if 'contentBlockStart' in event:
+            content_block = event['contentBlockStart'].get('contentBlock', {})
+            if content_block.get('type') == 'tool_use':
+                tool_name = content_block.get('name', '未知')
+                logger.info("🔧 工具调用开始: %s", tool_name)
+                # 专门检查file_read工具调用
+                if 'file_read' in tool_name:
+                    logger.info("📖 [FILE_READ] 检测到file_read工具调用开始 (Chunk #%d)", chunk_count)
+                    file_read_msg = f"\n📖 **[FILE_READ]** 工具调用开始 (Chunk #{chunk_count})\n   🔍 准备读取文件..."
+        elif 'contentBlockDelta' in event:
+            delta = event['contentBlockDelta']
+            inner = delta.get('delta', {})
+            if 'input' in inner:
+                input_data = inner['input']
+                if 'path' in input_data or 'file_path' in input_data:
+                    file_path = input_data.get('path') or input_data.get('file_path')
+                    logger.info("📖 [FILE_READ] 检测到文件路径参数: %s", file_path)
+                    file_read_msg = f"   📂 **[FILE_READ]** 目标文件: {file_path}"
+            if 'text' in inner:
+                text_content = inner['text']
+        elif 'contentBlockStop' in event:
+            # 在工具跟踪器处理本事件之前检查当前工具
+            if tool_tracker.current_tool and 'file_read' in tool_tracker.current_tool:
+                logger.info("📖 [FILE_READ] 工具参数准备完成，开始执行文件读取...")
+                file_read_msg = f"   ⏳ **[FILE_READ]** 参数准备完成，开始读取文件..."
+        if file_read_msg:
+            messages.append(file_read_msg)
+        
+        tool_info = tool_tracker.process_event(event)
+        if tool_info:
+            logger.info("生成工具信息: %s", tool_info)
+            messages.append(tool_info)
+        return messages, text_content, bool(tool_info), False
+    
+    def _on_message(self, chunk, chunk_count, tool_tracker):
+        """完整消息: {"message": {...}}，可能包含工具结果"""
+        messages = []
+        file_read_msg = self._file_read_result_message(chunk['message'])
+        if file_read_msg:
+            messages.append(file_read_msg)
+        messages.append(self._force_tool_message(chunk, chunk_count, self._tool_pattern(chunk)))
+        tool_info = tool_tracker.process_event(chunk)
+        if tool_info:
+            logger.info("生成工具信息: %s", tool_info)
+            messages.append(tool_info)
+        return messages, None, bool(tool_info), False
+    
+    def _on_block_event(self, chunk, chunk_count, tool_tracker):
+        """未包装的内容块事件: {"contentBlockStart": ...} 等"""
+        messages = [self._force_tool_message(chunk, chunk_count, self._tool_pattern(chunk))]
+        tool_info = tool_tracker.process_event(chunk)
+        if tool_info:
+            logger.info("生成工具信息: %s", tool_info)
+            messages.append(tool_info)
+        return messages, self._extract_text_from_chunk(chunk), bool(tool_info), False
+    
+    def _on_tool_use(self, chunk, chunk_count, tool_tracker):
+        """工具使用: {"type": "tool_use", "name": ..., "input": ...}"""
+        messages = []
+        pattern = self._tool_pattern(chunk)
+        if pattern:
+            messages.append(self._force_tool_message(chunk, chunk_count, pattern))
+        if any(key in chunk for key in TRACKED_KEYS):
+            tool_info = tool_tracker.process_event(chunk)
+            if tool_info:
+                logger.info("生成工具信息: %s", tool_info)
+                messages.append(tool_info)
+        messages.append(self._tool_use_message(chunk))
+        return messages, self._extract_text_from_chunk(chunk), True, True
+    
+    def _on_other(self, chunk, chunk_count, tool_tracker):
+        """其他事件：文本回调、工具结果等"""
+        messages = []
+        pattern = self._tool_pattern(chunk)
+        if pattern:
+            messages.append(self._force_tool_message(chunk, chunk_count, pattern))
+        return messages, self._extract_text_from_chunk(chunk), False, False
+    
+    def _tool_pattern(self, chunk):
+        """返回chunk中第一个工具相关的顶层字段"""
+        for pattern in TOOL_PATTERNS:
+            if pattern in chunk:
+                return pattern
+        return None
+    
+    def _force_tool_message(self, chunk, chunk_count, pattern):
+        """生成输出到聊天的工具调用信息"""
+        logger.debug("🔍 在chunk #%d中发现工具相关字段: %s", chunk_count, pattern)
+        tool_details = self._parse_tool_details(chunk, pattern)
+        tool_msg = f"\n<details>\n<summary>🔧 工具调用</summary>\n\n{tool_details}\n</details>\n"
+        logger.debug("强制输出工具信息: %s", tool_msg)
+        return tool_msg
+    
+    def _file_read_result_message(self, message):
+        """检查消息中可能的file_read工具结果"""
         try:
-            # 检查所有可能包含工具信息的字段
-            found_tool_info = False
-            detected_pattern = None
-            
-            # 检查各种可能的工具调用格式
-            tool_patterns = [
-                'tool_use', 'tool_call', 'function_call', 'action',
-                'contentBlockStart', 'contentBlockDelta', 'contentBlockStop',
-                'message', 'tool_result', 'input', 'output'
-            ]
-            
-            for pattern in tool_patterns:
-                if pattern in chunk:
-                    logger.info(f"🔍 在chunk #{chunk_count}中发现工具相关字段: {pattern}")
-                    found_tool_info = True
-                    detected_pattern = pattern
-                    break
-            
-            # 如果发现工具信息，返回要输出到聊天的消息
-            if found_tool_info:
-                # 更详细地解析工具信息
-                tool_details = self._parse_tool_details(chunk, detected_pattern)
-                tool_msg = f"\n<details>\n<summary>🔧 工具调用</summary>\n\n{tool_details}\n</details>\n"
-                logger.info(f"强制输出工具信息: {tool_msg}")
-                return tool_msg
-                
+            if 'content' in message:
+                for content in message['content']:
+                    if content.get('type') == 'tool_result':
+                        result = content.get('content', [])
+                        if result and isinstance(result, list) and len(result) > 0:
+                            result_text = result[0].get('text', '')
+                            # 简单检查是否可能是文件内容
+                            if len(result_text) > 100:  # 假设文件内容较长
+                                logger.info("📖 [FILE_READ] 检测到可能的文件读取结果，长度: %d字符", len(result_text))
+                                lines = result_text.split('\n')
+                                return f"   ✅ **[FILE_READ]** 文件读取完成\n   📄 文件大小: {len(result_text)}字符，{len(lines)}行\n   📝 内容预览: {result_text[:100]}..."
             return None
         except Exception as e:
-            logger.warning(f"强制检查工具调用时出错: {e}")
+            logger.warning(f"检查file_read工具时出错: {e}")
             return None
+    
+    def _tool_use_message(self, chunk):
+        """生成工具使用的聊天信息，特别提示shell和file_read工具"""
+        tool_name = chunk.get('name', '未知工具')
+        tool_input = chunk.get('input', {})
+        logger.info("检测到工具使用: %s", tool_name)
+        
+        # 特别监控shell工具
+        if 'shell' in tool_name.lower():
+            command = tool_input.get('command', '')
+            logger.info("💻 [SHELL_MONITOR] 检测到shell工具调用: %s", command)
+            return f"\n<details>\n<summary>Shell工具执行 - {tool_name}</summary>\n\n**命令**: `{command}`\n\n⏳ 正在执行shell命令...\n</details>\n"
+        elif 'file_read' in tool_name.lower():
+            file_path = tool_input.get('path', tool_input.get('file_path', ''))
+            logger.info("📖 [FILE_READ_MONITOR] 检测到file_read工具调用: %s", file_path)
+            if file_path == '.':
+                logger.warning("⚠️ [FILE_READ_MONITOR] 警告：尝试读取当前目录，这可能导致卡死！")
+                return f"\n<details>\n<summary>安全提示 - 文件读取操作</summary>\n\n**工具**: {tool_name}  \n**路径**: `{file_path}`  \n\n⚠️ **注意**: 检测到尝试读取目录，建议使用shell工具进行目录浏览\n</details>\n"
+            return f"\n<details>\n<summary>文件读取 - {tool_name}</summary>\n\n**文件路径**: `{file_path}`\n\n⏳ 正在读取文件...\n</details>\n"
+        
+        # 格式化输入参数
+        formatted_input = json.dumps(tool_input, ensure_ascii=False, indent=2)
+        # 增加截断长度限制，避免过度截断
+        if len(formatted_input) > 1000:
+            formatted_input = formatted_input[:1000] + "...\n}"
+        return f"\n<details>\n<summary>工具执行 - {tool_name}</summary>\n\n**输入参数**:\n```json\n{formatted_input}\n```\n\n⏳ 正在执行...\n</details>\n"
 
     def _parse_tool_details(self, chunk, pattern):
         """解析工具详情"""
@@ -102,14 +102,14 @@ class ToolTracker:
             
             if clean_name == 'file_read':
                 # 增加详细的file_read日志
-                logger.info(f"📖 [TOOL_TRACKER] file_read工具输入参数: {input_data}")
+                logger.debug("📖 [TOOL_TRACKER] file_read工具输入参数: %s", input_data)
                 if 'path' in input_data:
                     file_path = input_data['path']
-                    logger.info(f"📖 [TOOL_TRACKER] file_read目标文件: {file_path}")
+                    logger.info("📖 [TOOL_TRACKER] file_read目标文件: %s", file_path)
                     return f"读取文件: {file_path}"
                 elif 'file_path' in input_data:
                     file_path = input_data['file_path']
-                    logger.info(f"📖 [TOOL_TRACKER] file_read目标文件: {file_path}")
+                    logger.info("📖 [TOOL_TRACKER] file_read目标文件: %s", file_path)
                     return f"读取文件: {file_path}"
             elif clean_name == 'file_write':
                 if 'path' in input_data:
@@ -150,15 +150,15 @@ class ToolTracker:
             
             if clean_name == 'file_read':
                 # 增加详细的file_read结果日志
-                logger.info(f"📖 [TOOL_TRACKER] file_read工具结果长度: {len(result_text)}字符")
-                logger.info(f"📖 [TOOL_TRACKER] file_read结果前100字符: {result_text[:100]}")
+                logger.info("📖 [TOOL_TRACKER] file_read工具结果长度: %d字符", len(result_text))
+                logger.debug("📖 [TOOL_TRACKER] file_read结果前100字符: %.100s", result_text)
                 
                 if result_text.startswith('Error'):
-                    logger.info(f"📖 [TOOL_TRACKER] file_read执行失败: {result_text}")
+                    logger.info("📖 [TOOL_TRACKER] file_read执行失败: %s", result_text)
                     return f"❌ 文件读取失败: {result_text}"
                 else:
                     lines = result_text.split('\n')
-                    logger.info(f"📖 [TOOL_TRACKER] file_read成功，文件有{len(lines)}行")
+                    logger.info("📖 [TOOL_TRACKER] file_read成功，文件有%d行", len(lines))
                     if len(lines) > 10:
                         return f"📖 文件内容 ({len(lines)}行): {lines[0][:50]}..."
                     else:
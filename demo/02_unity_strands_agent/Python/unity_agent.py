@@ -4,6 +4,9 @@ Unity代理核心类
 """
 
 import logging
+import os
+import threading
+import time
 from typing import Dict, Any
 from strands import Agent
 from unity_system_prompt import UNITY_SYSTEM_PROMPT
@@ -12,6 +15,9 @@ from unity_tools import get_unity_tools
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 健康状态缓存时间（秒），过期后在后台刷新
+HEALTH_CHECK_TTL = float(os.environ.get('UNITY_AGENT_HEALTH_TTL', '30'))
+
 class UnityAgent:
     """
     Unity专用的Strands Agent封装类
@@ -20,6 +26,12 @@ class UnityAgent:
     
     def __init__(self):
         """使用Unity开发工具配置初始化代理"""
+        # 缓存的健康状态，由后台线程刷新
+        self._health = None
+        self._health_checked_at = 0.0
+        self._health_lock = threading.Lock()
+        self._health_refreshing = False
+
         try:
             logger.info("========== 初始化Unity Agent ==========")
             
@@ -68,6 +80,9 @@ class UnityAgent:
             
             # 存储工具列表以供将来使用
             self._available_tools = unity_tools if unity_tools else []
+
+            # 预先在后台获取健康状态
+            self._refresh_health_in_background()
                 
         except Exception as e:
             logger.error(f"代理初始化失败: {str(e)}")
@@ -205,23 +220,108 @@ class UnityAgent:
         async for chunk in self.streaming_processor.process_stream(message):
             yield chunk
     
-    def health_check(self) -> Dict[str, Any]:
+    def health_check(self, wait: bool = True) -> Dict[str, Any]:
         """
         检查代理是否健康且就绪
         
+        返回缓存的健康状态，过期时在后台刷新，不会调用模型
+        
+        参数:
+            wait: 尚无缓存状态时是否同步检查一次；为False时返回status为unknown的状态
+            
         返回:
             状态字典
         """
+        with self._health_lock:
+            health = self._health
+            stale = time.monotonic() - self._health_checked_at >= HEALTH_CHECK_TTL
+        if health is None:
+            if wait:
+                return self._refresh_health()
+            self._refresh_health_in_background()
+            return {"status": "unknown", "ready": None}
+        if stale:
+            self._refresh_health_in_background()
+        return health
+    
+    def _refresh_health(self) -> Dict[str, Any]:
+        """同步检查并更新缓存的健康状态"""
+        health = self._probe_health()
+        with self._health_lock:
+            self._health = health
+            self._health_checked_at = time.monotonic()
+        return health
+    
+    def _refresh_health_in_background(self):
+        """在后台线程刷新健康状态，同一时间只有一个刷新"""
+        with self._health_lock:
+            if self._health_refreshing:
+                return
+            self._health_refreshing = True
+        
+        def refresh():
+            try:
+                self._refresh_health()
+            except Exception as e:
+                logger.warning(f"刷新健康状态失败: {e}")
+            finally:
+                with self._health_lock:
+                    self._health_refreshing = False
+        
+        threading.Thread(target=refresh, name="unity-agent-health", daemon=True).start()
+    
+    def _probe_health(self) -> Dict[str, Any]:
+        """
+        检查代理、模型凭证和MCP连接，不发送模型请求，也不改动对话历史
+        
+        返回:
+            状态字典
+        """
+        start = time.perf_counter()
         try:
-            # Simple health check - try to get agent info
-            return {
+            agent = getattr(self, 'agent', None)
+            if agent is None or not hasattr(agent, 'stream_async'):
+                raise RuntimeError("Agent未初始化")
+            
+            result = {
                 "status": "healthy",
-                "agent_type": type(self.agent).__name__,
-                "ready": True
+                "agent_type": type(agent).__name__,
+                "ready": True,
+                "tool_count": len(getattr(self, '_available_tools', []) or []),
+            }
+            
+            # Bedrock模型需要可用的AWS凭证
+            model = getattr(agent, 'model', None)
+            model_config = model.get_config() if hasattr(model, 'get_config') else {}
+            result["model_id"] = model_config.get("model_id") if isinstance(model_config, dict) else None
+            if type(model).__name__ == "BedrockModel":
+                import boto3
+                has_credentials = boto3.Session().get_credentials() is not None
+                result["credentials"] = has_credentials
+                if not has_credentials:
+                    result["status"] = "unhealthy"
+                    result["ready"] = False
+                    result["error"] = "未找到AWS凭证"
+            
+            # MCP服务器断开时仍可使用其他工具
+            mcp_clients = list(getattr(getattr(self, 'mcp_manager', None), '_mcp_clients', []) or [])
+            active = sum(
+                1 for client in mcp_clients
+                if not hasattr(client, '_is_session_active') or client._is_session_active()
+            )
+            result["mcp_servers"] = {
+                "total": len(mcp_clients),
+                "active": active,
+                "startup": list(getattr(getattr(self, 'mcp_manager', None), 'startup_report', []) or []),
             }
+            if result["ready"] and active < len(mcp_clients):
+                result["status"] = "degraded"
         except Exception as e:
-            return {
+            result = {
                 "status": "unhealthy",
                 "error": str(e),
                 "ready": False
-            }
\ No newline at end of file
+            }
+        result["checked_at"] = time.time()
+        result["probe_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return result